@@ -1,13 +1,24 @@
 from app.action_executor import ActionExecutor
+from app.http_executor import HttpExecutor, BrowserFallback
+from app.action_config import compile_blocks
+from app.constants import HTTP_FIRST, GENERIC_ACTION_CONFIG, SCRIPTS, RECORD_RUNS, REPLAY_DIR, ARCHIVE_DIR, LEAN_PAGES
 from app.operation_executor import OperationExecutor
+from app.ops_plan import format_timings
 from selenium.common.exceptions import TimeoutException, InvalidSessionIdException
-import time, traceback, threading, pprint, hashlib
+import os, time, traceback, threading, pprint, hashlib
 from datetime import datetime
-from app.logger import get_active_logger
+from app.logger import get_active_logger, lazy_pformat, LazyFormat
+from app.host_scheduler import get_host_scheduler
+from app.fingerprint import fingerprint
+from app.spans import span
+from app.run_archive import RunRecorder, RunArchive, archive_name
+from app.fake_driver import create_fake_driver
+from app.lean_profile import LeanProfile
 
 class BankScraper:
-    def __init__(self, bank_params, paths):
+    def __init__(self, bank_params, paths, driver_pool=None, replay_dir=REPLAY_DIR):
         self.bank_params = bank_params
+        self.driver_pool = driver_pool
         self.logger = get_active_logger()
         self.paths = paths
         self.scrape_data = {
@@ -17,8 +28,29 @@ class BankScraper:
             "scraped_data": []
         }
         self.executor = ActionExecutor(bank_params, paths) # not inherit, call here!!
+        self.plan = compile_blocks(bank_params["blocks"], GENERIC_ACTION_CONFIG) #compiled once, shared by http + browser paths
+        self.executor.lean = LeanProfile.from_params(bank_params, self.plan, LEAN_PAGES)
+        self.scheduler = get_host_scheduler()
+        if bank_params.get("host_limit"):
+            self.scheduler.configure(bank_params["base_url"], **bank_params["host_limit"])
         
         self.operator = OperationExecutor()
+        
+        #record/replay: the archive stands in for both the browser and the HTTP sessions
+        self.recorder, self.archive = None, None
+        if replay_dir:
+            self.archive = RunArchive.find(replay_dir, bank_params)
+            if self.archive is None:
+                raise FileNotFoundError(f"No recording of {archive_name(bank_params)} in {replay_dir}")
+            if not self.archive.replayable:
+                self.archive.close()
+                raise ValueError(f"{archive_name(bank_params)} has XHR/fetch data but no rendered DOMs; "
+                                 "the replay driver runs no page scripts, record it again")
+        elif RECORD_RUNS:
+            self.recorder = RunRecorder(os.path.join(ARCHIVE_DIR, archive_name(bank_params)), meta={
+                "bank_name": bank_params["bank_name"], "bank_code": bank_params["bank_type_code"],
+                "base_url": bank_params["base_url"], "via": "browser"})
+        self.executor.recorder, self.executor.archive = self.recorder, self.archive
 
     @staticmethod
     def get_final_struct():
@@ -33,6 +65,7 @@ class BankScraper:
                 "start_time":timestamp,
                 "config": "params_table.json5",
                 "cfname": f"{timestamp}_cache.json",
+                "sfname": f"{timestamp}_cache.ndjson",
                 "pfname": f"{timestamp}_process.json"
             },
             "records": [],
@@ -40,28 +73,45 @@ class BankScraper:
         }
     
     def run(self):
+        session_lost = False
         try:
-            self.executor.create_uc_driver()
-            self.logger.info("Driver Created.")
+            if self.__run_http_first():
+                return self.scrape_data
+
+            if self.archive:
+                self.executor.attach_driver(create_fake_driver(scripts=SCRIPTS.values(), fetch=self.archive.fetch))
+                self.logger.info(f"Replaying {os.path.basename(self.archive.PATH)} (recorded {self.archive.META.get('recorded')}).")
+            elif self.driver_pool:
+                with span("driver_lease"):
+                    self.executor.attach_driver(self.driver_pool.acquire())
+                self.logger.info("Driver Leased from pool.")
+            else:
+                self.executor.create_uc_driver()
+                self.logger.info("Driver Created.")
             try:
                 self.executor.driver.set_page_load_timeout(50)
-                self.executor.driver.get(self.bank_params["base_url"])
+                self.scheduler.acquire(self.bank_params["base_url"])
+                with span("page_load", url=self.bank_params["base_url"]):
+                    self.executor.driver.get(self.bank_params["base_url"])
                 self.logger.notice("Page fetched successfully.")
+                if self.recorder:
+                    self.recorder.harvest(self.executor.driver)
             except TimeoutException:
                 self.logger.error("Page load timed out. Attempting to stop...")
                 try:
                     self.executor.driver.execute_script("window.stop();")
                 except InvalidSessionIdException:
+                    session_lost = True
                     self.logger.error("Driver session lost during timeout handling.")
                     return {"error": "Driver crashed during load"}
             
             self.logger.info(f"========{self.bank_params['bank_name']}: {self.bank_params['bank_type_code']}========")
 
-            actions = self.bank_params["blocks"]
-            data = self.executor.execute_blocks(actions)
+            data = self.executor.execute_blocks(self.plan)
             self.scrape_data["scraped_data"].extend(data)
 
         except InvalidSessionIdException as e:
+            session_lost = True
             self.logger.error(f"Driver session invalid for {self.bank_params['bank_name']}. Restart required.")
             self.scrape_data["scraped_data"] = [{"error_Type": "InvalidSessionId", "error_Message": str(e)}]
         
@@ -72,13 +122,57 @@ class BankScraper:
         
         finally:
             try:
-                self.executor.driver.quit()
-            except Exception:
-                pass
+                self.executor.selector_history.save()
+            except OSError as e:
+                self.logger.warning(f"Could not save selector history: {e}")
+            if self.executor.downloader:
+                self.executor.downloader.close()
+                self.executor.downloader = None
+            if self.driver_pool and not self.archive:
+                self.driver_pool.release(self.executor.driver, recycle=session_lost)
+            else:
+                try:
+                    self.executor.driver.quit()
+                except Exception:
+                    pass
             self.executor.driver = None
+            if self.recorder:
+                self.recorder.close(result=self.scrape_data)
+            if self.archive:
+                self.archive.close()
         
         return self.scrape_data
 
+    def __run_http_first(self) -> bool:
+        """Try the static pages over plain HTTP, False means go through the browser."""
+        if not self.bank_params.get("http_first", HTTP_FIRST) or not HttpExecutor.is_eligible(self.plan):
+            return False
+        if self.archive and self.archive.META.get("via") != "http": #replay the path the recording took
+            return False
+
+        http = HttpExecutor(self.bank_params, recorder=self.recorder, archive=self.archive)
+        try:
+            data = http.execute_blocks(self.plan, self.bank_params["base_url"])
+        except BrowserFallback as e:
+            self.logger.warning(f"HTTP fast path declined, using browser: {e}")
+            return self.__forget_http()
+        except Exception as e:
+            self.logger.warning(f"HTTP fast path failed, using browser: [{type(e).__name__}] {e}")
+            return self.__forget_http()
+        finally:
+            http.close()
+
+        self.logger.info(f"========{self.bank_params['bank_name']}: {self.bank_params['bank_type_code']} (http)========")
+        if self.recorder:
+            self.recorder.meta["via"] = "http"
+        self.scrape_data["scraped_data"].extend(data)
+        return True
+
+    def __forget_http(self) -> bool:
+        if self.recorder: #the replay should see what the browser saw, not the declined static pages
+            self.recorder.forget("http")
+        return False
+
     @staticmethod
     def post_scrape(data: dict, ops_rules: dict, logger=None) -> dict:
         processed_data = {}
@@ -89,11 +183,14 @@ class BankScraper:
             return processed_data
 
         if logger:
-            logger.notice(f"Running post-scrape ops:\n{pprint.pformat(ops_rules)}")
+            logger.notice("Running post-scrape ops:\n%s", lazy_pformat(ops_rules))
 
         try:
             ops = OperationExecutor()
-            processed_data = ops.runner(data, ops_rules)
+            with span("post_scrape"):
+                processed_data = ops.runner(data, ops_rules)
+            if logger:
+                logger.info("Post-scrape op timings:\n%s", LazyFormat(format_timings, ops.op_timings))
 
         except Exception as e:
             if logger:
@@ -116,8 +213,7 @@ class BankScraper:
             unique = []
             for resp in action["response"]:
                 if "value" in resp and resp.get("type") == "pdf": #pdf specific
-                    val = resp["value"]
-                    val_hash = hashlib.sha256(val.encode("utf-8")).hexdigest()
+                    val_hash = fingerprint(resp) #capture-time hash, no re-hashing
                     if val_hash not in seen:
                         seen.add(val_hash)
                         unique.append(resp)
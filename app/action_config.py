@@ -1,12 +1,48 @@
 from dataclasses import dataclass, field
+import logging
 
-@dataclass
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from app.logger import get_active_logger
+from app.readiness import PageReady
+
+#locator + wait maps, resolved once at compile time
+BY_MAP = {
+    "css": By.CSS_SELECTOR,
+    "xpath": By.XPATH,
+    "id": By.ID,
+    "name": By.NAME,
+    "class": By.CLASS_NAME,
+    "tag": By.TAG_NAME,
+    "txt":By.LINK_TEXT,
+    "ptxt":By.PARTIAL_LINK_TEXT
+}
+
+CONDITION_MAP = {
+    "clickable": EC.element_to_be_clickable,
+    "visible": EC.visibility_of_element_located,
+    "present": EC.presence_of_element_located,
+    "invisible": EC.invisibility_of_element_located,
+    "attached": EC.element_to_be_selected
+}
+
+#page-level readiness (no locator): network_idle, dom_quiet, assets_loaded, settled
+READY_CONDITIONS = set(PageReady.CHECKS)
+
+def get_by(by_string):
+    return BY_MAP.get((by_string or "css").lower(), By.CSS_SELECTOR)
+
+
+@dataclass(frozen=True, slots=True)
 class ActionConfig:
     # --- Action Core ---
     ACTION: str                          # The type of action (click, scrape, table, etc.)
-    BY: str = "css"                      # Locator strategy
+    BY: str = By.CSS_SELECTOR            # Locator strategy (resolved selenium By)
     VALUE: str = None                    # Locator value
     URL: str = "https://tinyurl.com/nothing-borgir"  # Default URL if none provided
+    WEBLINKS: object = None              # weblist urls: list or {base_url, params}
+    WEBLINKS_HEADER: tuple = ()          # weblist titles, one per url
 
     # --- Timing / Wait Handling ---
     DEFAULT_WAIT: int = 2                # Base random wait time
@@ -14,6 +50,10 @@ class ActionConfig:
     WAIT_UNTIL: str = None               # Wait condition (clickable, visible, etc.)
     WAIT_BY: str = None                  # Locator strategy for wait
     WAIT_VALUE: str = None               # Locator value for wait
+    CONDITION: object = None             # Precomputed EC / PageReady predicate for WAIT_UNTIL
+    IDLE_MS: int = 500                   # Quiet window for readiness conditions
+    SKIP_IF_NOT_FOUND: bool = False      # Probe first, skip the action if the target is absent
+    PROBE_GRACE: float = 2               # Seconds the probe waits for the target to appear
 
     # --- Naming Conventions ---
     TABLE_NAME: str = "table"            # Name for table extraction
@@ -25,9 +65,13 @@ class ActionConfig:
 
     # --- Scraping / Extraction ---
     ATTRIBUTE: str = None                # Attribute to scrape (e.g. href, src)
-    SCRAPE_FIELDS: dict = field(default_factory=dict) # Field mapping for text scrape
-    STEPS: list = field(default_factory=list)         # Follow-up actions
-    ALLOWED_TABS: list = field(default_factory=list)  # Tabs allowed for action
+    SCRAPE_FIELDS: tuple = ()            # ((key, (By, selector)), ...) for text scrape
+    STEPS: tuple = ()                    # Follow-up actions (compiled)
+    ALLOWED_TABS: tuple = ()             # Tabs allowed for action
+    CLEAN_TABLE: bool = True             # Run _clean_raw_table_html_ on tables
+    BATCH: bool = None                   # Batched table extraction, None -> executor default
+    SNAPSHOT: bool = None                # Snapshot-once extraction, None -> bank default
+    RUN_FUNCTION: str = None
 
     # --- Saving / Persistence ---
     CONSOLIDATE_SAVE: bool = False       # Whether to consolidate multiple results
@@ -42,14 +86,106 @@ class ActionConfig:
     NEW_WINDOW: bool = False             # Open in new browser window
     RETURN_TO_BASE: bool = False         # Return to previous window after action
 
-    # --- Post Init (dependency management) ---
-    def __post_init__(self):
-        if self.WAIT_BY is None:
-            self.WAIT_BY = self.BY
-        if self.WAIT_VALUE is None:
-            self.WAIT_VALUE = self.VALUE
+    # --- Script ---
+    SCRIPT_KEY: str = None
+    SCRIPT: str = None
+
+    @classmethod
+    def from_dict(cls, _action_: dict, generic_actions: dict = None) -> "ActionConfig":
+        generic_actions = generic_actions or {}
+        by = get_by(_action_.get("by", "css"))
+        value = _action_.get("value")
+        wait_until = _action_.get("wait_until")
+        wait_by = get_by(_action_["wait_by"]) if "wait_by" in _action_ else by
+        wait_value = _action_.get("wait_value", value)
+
+        idle_ms = _action_.get("idle_ms", 500)
+        condition = None
+        if wait_until in CONDITION_MAP:
+            condition = CONDITION_MAP[wait_until]((wait_by, wait_value))
+        elif wait_until in READY_CONDITIONS:
+            condition = PageReady(wait_until, idle_ms)
+
+        fields = []
+        for key, sub_selector in (_action_.get("scrape_fields") or {}).items():
+            sub_by = "css"
+            if "|||" in sub_selector:
+                sub_selector, sub_by = sub_selector.split("|||")
+            fields.append((key, (get_by(sub_by), sub_selector)))
+
+        headers = _action_.get("web_link_headers") or ()
+        if isinstance(headers, str):
+            headers = headers.split("||")
+
+        return cls(
+            ACTION=_action_.get("action"),
+            BY=by,
+            VALUE=value,
+            URL=_action_.get("url", "https://tinyurl.com/nothing-borgir"),
+            WEBLINKS=_action_.get("web_links"),
+            WEBLINKS_HEADER=tuple(headers),
+            DEFAULT_WAIT=_action_.get("default_wait", 2),
+            TIMEOUT=_action_.get("timeout", 15),
+            WAIT_UNTIL=wait_until,
+            WAIT_BY=wait_by,
+            WAIT_VALUE=wait_value,
+            CONDITION=condition,
+            IDLE_MS=idle_ms,
+            SKIP_IF_NOT_FOUND=_action_.get("skip_if_not_found", False),
+            PROBE_GRACE=_action_.get("probe_grace", 2),
+            TABLE_NAME=_action_.get("table_name", "table"),
+            HTML_NAME=_action_.get("html_name", "html"),
+            SCREENSHOT_NAME=_action_.get("screenshot_name", "screenshot"),
+            PDF_NAME=_action_.get("pdf_name", "webpage_pdf"),
+            EXPORT_FORMAT=_action_.get("export_format"),
+            LOG_MESSAGE=_action_.get("log_message", "Log Msg For Action Not Attached."),
+            ATTRIBUTE=_action_.get("attribute"),
+            SCRAPE_FIELDS=tuple(fields),
+            STEPS=compile_blocks(_action_.get("steps") or [], generic_actions),
+            ALLOWED_TABS=tuple(_action_.get("allowed_tabs", [])),
+            CLEAN_TABLE=_action_.get("clean_table", True),
+            BATCH=_action_.get("batch_extract"),
+            SNAPSHOT=_action_.get("snapshot"),
+            RUN_FUNCTION=_action_.get("execute"),
+            CONSOLIDATE_SAVE=_action_.get("consolidate_save", False),
+            MULTIPLE=_action_.get("multiple", False),
+            FILE_SAVE=_action_.get("file_save", False),
+            LANDSCAPE=_action_.get("landscape", False),
+            PRINT_BACKGROUND=_action_.get("print_background", False),
+            NEW_WINDOW=_action_.get("new_window", False),
+            RETURN_TO_BASE=_action_.get("return_to_base", False),
+            SCRIPT_KEY=_action_.get("script_key"),
+            SCRIPT=_action_.get("script"),
+        )
+
+
+def compile_blocks(block: list, generic_actions: dict = None) -> tuple:
+    """param_table `blocks` -> tuple of ActionConfig, generic action names resolved.
+    Unknown names are logged and skipped (as execute_blocks always did)."""
+    generic_actions = generic_actions or {}
+    plan = []
+    for _action_ in block:
+        if isinstance(_action_, ActionConfig):
+            plan.append(_action_)
+        elif isinstance(_action_, str):
+            if _action_ not in generic_actions:
+                logger = get_active_logger() or logging.getLogger(__name__)
+                logger.warning(f" {_action_} not part of generic_action_keys. Skipping.")
+                continue
+            plan.append(ActionConfig.from_dict(generic_actions[_action_], generic_actions))
+        else:
+            plan.append(ActionConfig.from_dict(_action_, generic_actions))
+    return tuple(plan)
+
+
+@dataclass(slots=True)
+class ActionContext:
+    """Scratch state of one execute() call, so nested/parallel runs never share it."""
+    action: ActionConfig
+    element: object = None
+    extras: dict = field(default_factory=dict)
 
 
 @dataclass
 class GenericActions:
-    pass
\ No newline at end of file
+    pass
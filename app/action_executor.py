@@ -5,20 +5,42 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium import webdriver 
 from bs4 import BeautifulSoup
 from datetime import datetime, date
 from urllib.parse import urlencode
 # from io import StringIO
 from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 
 import re, os, time, logging ,pprint, requests, base64, traceback, random,hashlib
 import undetected_chromedriver as uc
 from app.utils import Helper
 from app.constants import *
-from app.logger import get_active_logger
+from app.logger import get_active_logger, lazy_pformat
+from app.host_scheduler import get_host_scheduler
+from app.dom_snapshot import DomSnapshot
+from app.action_config import ActionConfig, ActionContext, compile_blocks, get_by
+from app.readiness import PageReady, wait_ready, arm
+from app.selector_history import SelectorHistory
+from app.downloader import Downloader, DownloadTooLarge
+from app.blob_store import BlobStore, get_blob_store
+from app.fingerprint import digest_text, capture_hash
+from app.table_cleaner import clean_table_html
+from app.spans import span, span_tags
+from app.command_profiler import profile_driver
+from app.lean_profile import LeanProfile
 
 class ActionExecutor:
+    USER_MULTI_PROCS = False #set by fleet workers sharing one patched uc binary
+    PACING = "host" #"host": per-host token bucket on network hits, "jitter": old default_wait sleep before every action,
+                    #"ready": host pacing + wait for the page to settle (capped at default_wait) instead of sleeping
+    BATCH_EXTRACT = True #tables + labels in one injected script; action key `batch_extract` overrides
+    READ_ONLY_ACTIONS = {"table", "html", "scrape"} #may run on a DomSnapshot instead of the live page
+    DOWNLOAD_WORKERS = 4 #parallel file fetches in downloadElem; bank key `download_workers` overrides
+
     def __init__(self, params=None, paths=None):
         self.logger = get_active_logger() or logging.getLogger(__name__)
         self.PARAMS = params or {}
@@ -30,7 +52,22 @@ class ActionExecutor:
 
         self.driver = None
         self.window_stack = None
+        self.downloader = None
+        self.blobs = get_blob_store()
         self.scripts = SCRIPTS
+        self.scheduler = get_host_scheduler()
+        self.PACING = self.PARAMS.get("pacing", self.PACING)
+        self.selector_history = SelectorHistory(
+            Helper.sanitize_Win_filename(f"{self.PARAMS.get('bank_type_code', '')}_{params['bank_name']}"), SEL_HIST_DIR)
+        
+        #snapshot-once mode: bank level `snapshot` is the default, action level `snapshot` overrides
+        self.SNAPSHOT_DEFAULT = self.PARAMS.get("snapshot", False)
+        self.snapshot = None
+        
+        #record/replay (app.run_archive), set by BankScraper
+        self.recorder = None #RunRecorder: harvested after every action
+        self.archive = None #RunArchive: the Downloader fetches from it instead of the network
+        self.lean = LeanProfile() #blocked url patterns (app.lean_profile), set by BankScraper before a driver is attached
     
     def create_driver(self):
         options = Options()
@@ -40,17 +77,22 @@ class ActionExecutor:
         options.add_argument(rf"--user-data-dir={self.PATHS['profile_path']}")
         options.add_argument(rf"--profile-directory={self.PATHS['profile_name']}")
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        if RECORD_RUNS: #RunRecorder.harvest reads response bodies off the performance log
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
         driver_path = self.PATHS.get("driver_path")
         service = Service(driver_path)
         self.driver = webdriver.Chrome(service=service, options=options)
+        if PROFILE_WEBDRIVER:
+            profile_driver(self.driver)
         
         self.window_stack = [self.driver.current_window_handle]
         self.__attach_headers()
+        self.__apply_lean()
         return self.driver
     
-    def create_uc_driver(self):
-
+    @classmethod
+    def build_uc_driver(cls, download_dir, window_size=None):
         options = uc.ChromeOptions()
         # options.add_argument(f"--user-data-dir={profile_path}")
         # options.add_argument(f"--profile-directory={profile_dir}")
@@ -59,22 +101,52 @@ class ActionExecutor:
         
         #preferential download
         options.add_experimental_option("prefs", {
-            "download.default_directory": self.OUTPUT_PATH,
+            "download.default_directory": download_dir,
             "download.prompt_for_download": False,
             "plugins.always_open_pdf_externally": True,
             "download.directory_upgrade": True,
             "safebrowsing.enabled": True
         })
+        if RECORD_RUNS: #RunRecorder.harvest reads response bodies off the performance log
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         
-        self.driver = uc.Chrome(options=options)
+        driver = uc.Chrome(options=options, user_multi_procs=cls.USER_MULTI_PROCS)
+        if PROFILE_WEBDRIVER: #pooled drivers are built here too, so leased ones are covered
+            profile_driver(driver)
         
-        width,height = self.PARAMS["intial_window_size"]
-        self.driver.set_window_size(width,height)
+        if window_size:
+            width,height = window_size
+            driver.set_window_size(width,height)
         time.sleep(random.uniform(0.5, 2.5))
+        return driver
+    
+    def create_uc_driver(self):
+        with span("create_uc_driver"):
+            self.driver = ActionExecutor.build_uc_driver(self.OUTPUT_PATH, self.PARAMS["intial_window_size"])
+        self.window_stack = [self.driver.current_window_handle]
+        self.__apply_lean()
+        return self.driver
+    
+    def attach_driver(self, driver):
+        #leased (warm) driver: point downloads + window size at this bank
+        self.driver = driver
+        self.driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": self.OUTPUT_PATH})
+        width,height = self.PARAMS["intial_window_size"]
+        if self.driver.get_window_size() != {"width": width, "height": height}:
+            self.driver.set_window_size(width,height)
+        self.__apply_lean(reset=True) #the previous bank's blocking sticks to a pooled driver
         
         self.window_stack = [self.driver.current_window_handle]
         return self.driver
     
+    def __apply_lean(self, reset=False):
+        if not (self.lean.BLOCKED_URLS or reset):
+            return
+        try:
+            self.lean.apply(self.driver)
+        except WebDriverException as e: #older chromedriver / no CDP: load in full
+            self.logger.warning(f"Lean profile not applied: {e}")
+    
     def __attach_headers(self):
         self.driver.execute_cdp_cmd("Network.enable", {})
         headers = self.PARAMS.get("headers", {})
@@ -83,94 +155,79 @@ class ActionExecutor:
                 "headers": headers
             })
         
-    def execute(self, _action_: dict):
-        self.ACTION_TYPE = _action_.get("action",None)
-        #get
-        self.BY = self.__get_by(_action_.get("by", "css"))
-        self.VALUE = _action_.get("value")
-        self.URL = _action_.get("url","https://tinyurl.com/nothing-borgir")
-        
-        #weblink header
-        self.WEBLINKS = _action_.get("web_links",None)
-        self.WEBLINKS_HEADER = _action_.get("web_link_headers",[])
-        
-        #time
-        self.DEFAULT_WAIT = _action_.get("default_wait", 2)
-        self.TIMEOUT = _action_.get("timeout", 15)
-        self.WAIT_UNTIL = _action_.get("wait_until")
-        self.WAIT_BY = _action_.get("wait_by", self.BY) #dependent
-        self.WAIT_VALUE = _action_.get("wait_value", self.VALUE) #dependent
-            
-        #name 
-        self.table_name = _action_.get("table_name","table")
-        self.html_name = _action_.get('html_name', 'html')
-        self.screenshot_name = _action_.get('screenshot_name', 'screenshot')
-        self.pdf_name = _action_.get('pdf_name', 'webpage_pdf')
-        self.export_format = _action_.get("export_format", None)  # default to Excel
-        self.LOG_MESSAGE = _action_.get("log_message", "Log Msg For Action Not Attached.")
-        
-        self.CLEAN_TABLE = _action_.get("clean_table",True)
-        
-        #field
-        self.ATTRIBUTE = _action_.get("attribute")
-        self.SCRAPE_FIELDS = _action_.get("scrape_fields")
-        self.FOLLOW_UP_ACTIONS =  _action_.get("steps")
-        
-        self.RUN_FUNCTION = _action_.get("execute",None)
-        self.ALLOWED_TABS = _action_.get("allowed_tabs",[])
-        
-        #save
-        self.CONSOLIDATE_SAVE = _action_.get("consolidate_save", False)
-        self.MULTIPLE = _action_.get("multiple",False)
-        self.FILE_SAVE = _action_.get("file_save",False)
-        
-        #page pdf
-        self.LANDSCAPE = _action_.get("landscape",False)
-        self.PRINT_BACKGROUND = _action_.get("print_background",False)
-        
-        #window
-        self.NEW_WINDOW = _action_.get("new_window", False)
-        self.RETURN_TO_BASE = _action_.get("return_to_base", False)
-        
-        #script
-        self.SCRIPT_KEY = _action_.get("script_key")
-        self.SCRIPT = _action_.get("script")
+    def execute(self, _action_):
+        #compiled plan in, packet out; per-call state lives in ctx, never on self
+        act = _action_ if isinstance(_action_, ActionConfig) else ActionConfig.from_dict(_action_, GENERIC_ACTION_CONFIG)
+        slot = self.recorder.begin() if self.recorder else None
+        if self.archive: #replay: the rendered DOM this call saw when recorded
+            self.archive.enter(self.driver)
+        try:
+            with span_tags(action=act.ACTION, selector=act.VALUE), span("action"):
+                packet = self.__execute(act)
+        finally:
+            if self.archive:
+                self.archive.exit()
+        if self.recorder:
+            self.recorder.harvest(self.driver)
+            self.recorder.render(self.driver, slot)
+        return packet
+    
+    def __execute(self, act):
+        ctx = ActionContext(act)
         
-        time.sleep(random.uniform(self.DEFAULT_WAIT/2, self.DEFAULT_WAIT))
+        ctx.extras["use_snapshot"] = act.ACTION in self.READ_ONLY_ACTIONS and (self.SNAPSHOT_DEFAULT if act.SNAPSHOT is None else act.SNAPSHOT)
+        if act.ACTION not in self.READ_ONLY_ACTIONS:
+            self.snapshot = None #anything else may change the page
         
+        if self.PACING == "jitter":
+            with span("pacing_sleep"):
+                time.sleep(random.uniform(act.DEFAULT_WAIT/2, act.DEFAULT_WAIT))
+        elif self.PACING == "ready" and not act.WAIT_UNTIL: #explicit wait_until already gates the action
+            with span("pacing_ready"):
+                waited = wait_ready(self.driver, "settled", timeout=act.DEFAULT_WAIT, idle_ms=act.IDLE_MS)
+            self.logger.debug("Page settled in %.2fs", waited)
         
         #element; The Which gets loaded as default
-        self.ELEMENT = None
         try:
-            self.logger.notice(f"Performing _action_: {self.ACTION_TYPE} on {self.VALUE}")
+            self.logger.notice(f"Performing _action_: {act.ACTION} on {act.VALUE}")
+            
+            if act.SKIP_IF_NOT_FOUND:
+                with span("probe"):
+                    found = self.__probe(act)
+                if not found:
+                    return self.__generate_packet(ctx, [{"status": "skipped", "error_message": f"Not found, skipped: {act.VALUE}", "error_from":"ActionExecutor.execute"}])
             
-            if self.WAIT_UNTIL:
-                condition = self.__get_condition(self.WAIT_UNTIL, self.WAIT_BY, self.WAIT_VALUE)
-                WebDriverWait(self.driver, self.TIMEOUT).until(condition)
+            if act.WAIT_UNTIL:
+                if act.CONDITION is None:
+                    raise ValueError(f"Unknown wait condition: {act.WAIT_UNTIL}")
+                poll = PageReady.POLL if isinstance(act.CONDITION, PageReady) else 0.5
+                with span("wait"):
+                    WebDriverWait(self.driver, act.TIMEOUT, poll_frequency=poll).until(act.CONDITION)
         
-            self.ELEMENT = self.driver.find_element(self.BY, self.VALUE)
-            content = self.__perform_action(action_type = self.ACTION_TYPE)
+            with span("extract"):
+                ctx.element = self.__snapshot_element(act) if ctx.extras["use_snapshot"] else self.driver.find_element(act.BY, act.VALUE)
+                content = self.__perform_action(ctx)
         except Exception as e:
             error_type = type(e).__name__
             error_msg = str(e)
             self.logger.error(f"Error in self.execute: [{error_type}] {error_msg}")
             self.logger.debug(f"Traceback:\n{traceback.format_exc()}")
-            return self.__generate_packet([{"error_type": error_type, "error_message": error_msg, "error_from":"ActionExecutor.execute"}]) # skip further execution
+            return self.__generate_packet(ctx, [{"error_type": error_type, "error_message": error_msg, "error_from":"ActionExecutor.execute"}]) # skip further execution
 
-        if self.NEW_WINDOW:
+        if act.NEW_WINDOW:
             self.logger.info("Switching to NEW WINDOW (latest handle).")
             self.driver.switch_to.window(self.driver.window_handles[-1])
             self.window_stack.append(self.driver.current_window_handle)
 
-        if self.RETURN_TO_BASE:
+        if act.RETURN_TO_BASE:
             self.logger.info("Returning to Base Window.")
             if len(self.window_stack) > 1:
                 self.driver.close()
                 self.window_stack.pop()
                 self.driver.switch_to.window(self.window_stack[-1])
-        return self.__generate_packet(content) if content else self.__generate_packet([{"error_type": "NoneType", "error_message": "No content extracted from action.","error_from":"ActionExecutor.execute"}])
+        return self.__generate_packet(ctx, content) if content else self.__generate_packet(ctx, [{"error_type": "NoneType", "error_message": "No content extracted from action.","error_from":"ActionExecutor.execute"}])
 
-    def __perform_action(self,action_type = None):
+    def __perform_action(self, ctx):
         action_map = {
             "click": self.clickElem,
             "click_save":self.clickSave,
@@ -190,110 +247,116 @@ class ActionExecutor:
 
         }
 
-        if not action_type:
-            self.logger.info(f"Checked presence of element: {self.BY}={self.VALUE}")
+        act = ctx.action
+        if not act.ACTION:
+            self.logger.info(f"Checked presence of element: {act.BY}={act.VALUE}")
             return
 
-        action = action_map.get(action_type)
+        action = action_map.get(act.ACTION)
         if action:
-            result = action()
+            result = action(ctx)
             if result is not None:
                 return result
         else:
-            self.logger.warning(f"Unknown action type: {self.ACTION_TYPE}")
-        
-    def __get_by(self, by_string):
-        mapping = {
-            "css": By.CSS_SELECTOR,
-            "xpath": By.XPATH,
-            "id": By.ID,
-            "name": By.NAME,
-            "class": By.CLASS_NAME,
-            "tag": By.TAG_NAME,
-            "txt":By.LINK_TEXT,
-            "ptxt":By.PARTIAL_LINK_TEXT
-        }
-        return mapping.get(by_string.lower(), By.CSS_SELECTOR)
-
-    def __get_condition(self, wait_type, by, value):
-        cond_map = {
-            "clickable": EC.element_to_be_clickable,
-            "visible": EC.visibility_of_element_located,
-            "present": EC.presence_of_element_located,
-            "invisible": EC.invisibility_of_element_located,
-            "attached": EC.element_to_be_selected
-        }
-
-        locator = (self.__get_by(by), value)
-        condition_func = cond_map.get(wait_type)
-        if not condition_func:
-            raise ValueError(f"Unknown wait condition: {wait_type}")
-        return condition_func(locator)
-    
+            self.logger.warning(f"Unknown action type: {act.ACTION}")
+        
      #Packet Functions
      
-    def __generate_packet(self, content):
-        packet = {
-            "action": self.ACTION_TYPE,
-            "uid": Helper.generate_uid(),
-            "timestamp": datetime.now().strftime("%d%m%Y %H:%M:%S"),
-            "webpage": self.driver.current_url,
-            "data_present": not any(
-                key in entity for entity in content
-                for key in ["status", "error_type", "error_message", "error"]
-            ),
-            "log_message": self.LOG_MESSAGE,
-            "response_count": len(content),
-            "response": content if content else None
-        }
+    def __generate_packet(self, ctx, content):
+        act = ctx.action
+        packet = ActionExecutorHelper._action_packet_(act.ACTION, self.driver.current_url, act.LOG_MESSAGE, content)
 
-        if self.ACTION_TYPE == "tablist":
-            packet["tab_found"] = getattr(self, "TABS_FOUND", [])
-            packet["follow_ups"] = [step.get("action") for step in getattr(self, "FOLLOW_UP_ACTIONS", [])if "action" in step]
+        if act.ACTION == "tablist":
+            packet["tab_found"] = ctx.extras.get("tabs_found", [])
+            packet["follow_ups"] = [step.ACTION for step in act.STEPS if step.ACTION]
         
-        if self.ACTION_TYPE == "weblist":
-            packet["web_links"] = getattr(self, "WEBLINKS", [])
-            packet["follow_ups"] = [step.get("action") for step in getattr(self, "FOLLOW_UP_ACTIONS", [])if "action" in step]
+        if act.ACTION == "weblist":
+            packet["web_links"] = ctx.extras.get("web_links", act.WEBLINKS or [])
+            packet["follow_ups"] = [step.ACTION for step in act.STEPS if step.ACTION]
 
         return packet
     
     def __generate_resp_packet(self, name = "",header="",value = None,type = ""):
-        return {
-            "name":name,
-            "title":header,
-            "value":value,
-            "type":type,
-            "data_present": bool(value),
-            "hash": hashlib.sha256(value.encode("utf-8")).hexdigest() if value else None
-        }
+        return ActionExecutorHelper._resp_packet_(name=name, header=header, value=value, type=type)
     
-    def __scroll_to_bottom(self):
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+    def __generate_blob_packet(self, name = "",header="",blob = None,type = ""):
+        return ActionExecutorHelper._blob_packet_(name=name, header=header, blob=blob, type=type)
+    
+    def __probe(self, act) -> bool:
+        #cheap presence check in place of the full wait timeout; selectors with a miss streak get no grace
+        by, value = (act.WAIT_BY, act.WAIT_VALUE) if act.WAIT_UNTIL and not isinstance(act.CONDITION, PageReady) else (act.BY, act.VALUE)
+        if not value:
+            return True
+        
+        grace = 0 if self.selector_history.known_absent(by, value) else act.PROBE_GRACE
+        found = bool(self.driver.find_elements(by, value))
+        if not found and grace:
+            try:
+                found = bool(WebDriverWait(self.driver, grace, poll_frequency=0.2).until(lambda d: d.find_elements(by, value)))
+            except TimeoutException:
+                found = False
+        
+        self.selector_history.record(by, value, found)
+        if not found:
+            self.logger.notice(f"Skipping {act.ACTION}: {by}={value} not found (grace {grace}s)")
+        return found
+    
+    def __snapshot_element(self, act):
+        #capture page_source once after the wait; re-capture only if the target isn't in the current copy
+        if self.snapshot is None or not self.snapshot.find_elements(act.BY, act.VALUE):
+            self.snapshot = DomSnapshot(self.driver.page_source, url=self.driver.current_url)
+            self.logger.info(f"Captured DOM snapshot of {self.snapshot.URL}")
+        try:
+            return self.snapshot.find_element(act.BY, act.VALUE)
+        except LookupError as e:
+            raise NoSuchElementException(str(e))
+    
+    def __scroll_to_bottom(self, max_wait=1.5, idle_ms=300):
+        #scroll, then wait only as long as the page keeps growing (height change + DOM quiet), no fixed polling
+        height = lambda d: d.execute_script("return document.body.scrollHeight")
+        last_height = height(self.driver)
         while True:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
+            try:
+                WebDriverWait(self.driver, max_wait, poll_frequency=PageReady.POLL).until(lambda d: height(d) != last_height)
+            except TimeoutException:
                 break
-            last_height = new_height
+            wait_ready(self.driver, "dom_quiet", timeout=max_wait, idle_ms=idle_ms)
+            last_height = height(self.driver)
+    
+    def __settle_after_click(self, act):
+        #host tokens only pace requests; this waits for what the click started (XHR + re-render), capped at default_wait
+        with span("click_settle"):
+            waited = wait_ready(self.driver, "quiet", timeout=act.DEFAULT_WAIT, idle_ms=act.IDLE_MS)
+        self.logger.debug("Click settled in %.2fs", waited)
+    
+    def __settle_after_load(self, act):
+        #driver.get returns at the load event; XHR-filled tables land after it and host pacing no longer sleeps
+        with span("load_settle"):
+            waited = wait_ready(self.driver, "settled", timeout=act.DEFAULT_WAIT, idle_ms=act.IDLE_MS)
+        self.logger.debug("Page settled in %.2fs", waited)
     
     # ===================== ACTION =====================
     
     #DOM-Scrape Actions
-    def textScrape(self)->dict: #Have to write this better
-        self.logger.info(f"Scraping Using BY={self.BY} and VALUE={self.VALUE}")
-        elements = self.driver.find_elements(self.BY, self.VALUE)
+    def textScrape(self, ctx)->dict: #Have to write this better
+        act = ctx.action
+        self.logger.info("Scraping Using BY=%s and VALUE=%s", act.BY, act.VALUE)
+        fields = dict(act.SCRAPE_FIELDS)
+        if ctx.extras["use_snapshot"]:
+            data_container = self.snapshot.scrape(act.BY, act.VALUE, fields=fields, attribute=act.ATTRIBUTE)
+            self.logger.info("Scraped Content:\n%s", lazy_pformat(data_container))
+            return data_container
+        
+        elements = self.driver.find_elements(act.BY, act.VALUE)
 
         data_container = {}
         for elem in elements:
-            if self.SCRAPE_FIELDS:
+            if fields:
                 results = {}
-                for key, sub_selector in self.SCRAPE_FIELDS.items():
-                    
-                    if "|||" in sub_selector:
-                        sub_selector,BY = sub_selector.split("|||")
+                for key, (sub_by, sub_selector) in fields.items():
                     try:
-                        sub_elem = elem.find_element(self.get_by(BY), sub_selector)
+                        sub_elem = elem.find_element(sub_by, sub_selector)
                         if sub_elem:
                             text = sub_elem.text.strip()
                             if not text: #Hidden Text
@@ -311,53 +374,78 @@ class ActionExecutor:
                         results[key] = None
                 data_container.update(results)
 
-            elif self.ATTRIBUTE:
-                data = elem.get_attribute(self.ATTRIBUTE)
-                self.logger.info(f"Scraped attribute {self.ATTRIBUTE}: {data}")
-                data_container.update({self.ATTRIBUTE: data})
+            elif act.ATTRIBUTE:
+                data = elem.get_attribute(act.ATTRIBUTE)
+                self.logger.info(f"Scraped attribute {act.ATTRIBUTE}: {data}")
+                data_container.update({act.ATTRIBUTE: data})
 
             else:
                 data_container.update({"text": elem.text.strip()})
 
-        self.logger.info(f"Scraped Content:\n{pprint.pformat(data_container)}")
+        self.logger.info("Scraped Content:\n%s", lazy_pformat(data_container))
         return data_container
     
-    def tablScrape(self)->list:
-        self.logger.info(f"Scraping Using BY={self.BY} and VALUE={self.VALUE}")
-        elements = self.driver.find_elements(self.BY,self.VALUE) if self.MULTIPLE else [self.driver.find_element(self.BY, self.VALUE)]
-            
-        if self.BY == By.CSS_SELECTOR: #mandatory filter
-            elements = [elem for elem in elements if elem.tag_name.lower() == "table"]
-        self.logger.info(f"Total Elements Found By={self.BY} and Value={self.VALUE} are {len(elements)}")
+    def tablScrape(self, ctx)->list:
+        act = ctx.action
+        self.logger.info("Scraping Using BY=%s and VALUE=%s", act.BY, act.VALUE)
+        if ctx.extras["use_snapshot"]:
+            tables = self.snapshot.tables(act.BY, act.VALUE, act.MULTIPLE)
+        else:
+            batch = self.BATCH_EXTRACT if act.BATCH is None else act.BATCH
+            tables = self.__collect_tables_batched(act) if batch else None
+        if tables is None:
+            tables = self.__collect_tables(act)
+        self.logger.info(f"Total Elements Found By={act.BY} and Value={act.VALUE} are {len(tables)}")
         
         scrape_content,cleaned_tables = [],[]
-        for idx, elem in enumerate(elements):
-            header = ActionExecutorHelper._find_preceding_texts_(elem)
+        for idx, (raw_html, header) in enumerate(tables):
             self.logger.info(f"Table: {idx} has header:: {header}")
             
-            raw_html = elem.get_attribute("outerHTML")
-            final_html = ActionExecutorHelper._clean_raw_table_html_(raw_html) if self.CLEAN_TABLE else raw_html
+            if act.CLEAN_TABLE:
+                with span("clean_table"):
+                    final_html = ActionExecutorHelper._clean_raw_table_html_(raw_html)
+            else:
+                final_html = raw_html
             
             cleaned_tables.append(final_html)
-            scrape_content.append(self.__generate_resp_packet(name=f"{self.table_name}_{idx}",value=final_html,header=header,type="table_html"))
+            scrape_content.append(self.__generate_resp_packet(name=f"{act.TABLE_NAME}_{idx}",value=final_html,header=header,type="table_html"))
         return scrape_content
     
+    def __collect_tables(self, act)->list:
+        elements = self.driver.find_elements(act.BY,act.VALUE) if act.MULTIPLE else [self.driver.find_element(act.BY, act.VALUE)]
+            
+        if act.BY == By.CSS_SELECTOR: #mandatory filter
+            elements = [elem for elem in elements if elem.tag_name.lower() == "table"]
+        return [(elem.get_attribute("outerHTML"), ActionExecutorHelper._find_preceding_texts_(elem)) for elem in elements]
+    
+    def __collect_tables_batched(self, act):
+        #one round trip: locate + outerHTML + label walk in page. None -> locator not scriptable, use __collect_tables
+        n = 2
+        found = self.driver.execute_script(ActionExecutorHelper.BATCH_TABLE_SCRIPT, act.BY, act.VALUE, act.MULTIPLE, act.BY == By.CSS_SELECTOR, n, ActionExecutorHelper.MAX_LABEL_LENGTH)
+        if found is None:
+            return None
+        return [(item["html"], list(reversed(item["labels"])) if item["labels"] else ["No label found"]*n) for item in found]
+    
     # __find_preceding_texts moved to dump.ipynb
 
-    def htmlScrape(self)->list:
-        self.logger.info(f"Scraping Using BY={self.BY} and VALUE={self.VALUE}")
-        elements = self.driver.find_elements(self.BY, self.VALUE) if self.MULTIPLE else [self.driver.find_element(self.BY, self.VALUE)] 
+    def htmlScrape(self, ctx)->list:
+        act = ctx.action
+        self.logger.info("Scraping Using BY=%s and VALUE=%s", act.BY, act.VALUE)
+        if ctx.extras["use_snapshot"]:
+            htmls = self.snapshot.htmls(act.BY, act.VALUE, act.MULTIPLE)
+        else:
+            elements = self.driver.find_elements(act.BY, act.VALUE) if act.MULTIPLE else [self.driver.find_element(act.BY, act.VALUE)] 
+            htmls = [elem.get_attribute("outerHTML") for elem in elements]
             
         cleaned_content = []
         scrape_content = []
-        for idx, elem in enumerate(elements):
-            html_content = elem.get_attribute("outerHTML")
+        for idx, html_content in enumerate(htmls):
             if not html_content:
-                self.logger.warning(f"No HTML content found for element: {self.VALUE}")
+                self.logger.warning(f"No HTML content found for element: {act.VALUE}")
                 continue
             
             cleaned_content.append(html_content)
-            scrape_content.append(self.__generate_resp_packet(name=f"{self.html_name}_{idx}",value=html_content,header="HTML DOESNT HAVE HEADER",type="html"))
+            scrape_content.append(self.__generate_resp_packet(name=f"{act.HTML_NAME}_{idx}",value=html_content,header="HTML DOESNT HAVE HEADER",type="html"))
 
         # if self.FILE_SAVE:
         #     for idx,content in enumerate(cleaned_content):
@@ -369,39 +457,36 @@ class ActionExecutor:
 
         return scrape_content
     
-    def tabList(self) -> list:
-        self.logger.info(f"Tab List Loop Using BY={self.BY} and VALUE={self.VALUE}")
-        tabList = self.driver.find_elements(self.BY, self.VALUE)
-        self.logger.info(f"Total Elements Found By={self.BY} and Value={self.VALUE} are {len(tabList)}")
+    def tabList(self, ctx) -> list:
+        act = ctx.action
+        self.logger.info(f"Tab List Loop Using BY={act.BY} and VALUE={act.VALUE}")
+        tabList = self.driver.find_elements(act.BY, act.VALUE)
+        self.logger.info(f"Total Elements Found By={act.BY} and Value={act.VALUE} are {len(tabList)}")
         
         scrape_content = []
-        tab_names = []
-        follow_ups = self.FOLLOW_UP_ACTIONS
-        tablist_log = self.LOG_MESSAGE
-        
+        tab_names = ctx.extras["tabs_found"] = []
 
-        for idx, tab in enumerate(self.driver.find_elements(self.BY, self.VALUE)):
+        for idx, tab in enumerate(tabList):
             try:
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", tab)
                 ActionChains(self.driver).move_to_element(tab).perform()
+                self.scheduler.acquire(self.driver.current_url)
+                arm(self.driver)
                 self.driver.execute_script("arguments[0].click();", tab)
+                self.snapshot = None
+                self.__settle_after_click(act)
                 
                 tabName = tab.get_attribute("innerText").strip()
                 tab_names.append(tabName)
                 self.logger.notice(f"Clicked Tab >> {tabName}")
 
-                time.sleep(0.5)
-                for step in follow_ups:
-                    if step.get("wait_until"):
-                        condition = self.__get_condition(step["wait_until"], step["by"], step["value"])
-                        WebDriverWait(self.driver, step["timeout"]).until(condition)
-
+                for step in act.STEPS: #step waits on its own wait_until inside execute
                     result = self.execute(step)
                     if not result:
-                        self.logger.warning(f"No result returned for step {step['action']} on tab[{idx}]={tabName}")
+                        self.logger.warning(f"No result returned for step {step.ACTION} on tab[{idx}]={tabName}")
                         continue
 
-                    step_content = result.get("response", [])
+                    step_content = result.get("response") or []
                     for packet in step_content:
                         packet["tabname"] = tabName if tabName else "NOT DEFINED"
                     scrape_content.extend(step_content)
@@ -409,11 +494,6 @@ class ActionExecutor:
             except Exception as e:
                 self.logger.warning(f"Failed on tab[{idx}]: {e}")
                 
-        #reset val
-        self.TABS_FOUND = tab_names
-        self.ACTION_TYPE = "tablist"
-        self.LOG_MESSAGE = tablist_log
-        self.FOLLOW_UP_ACTIONS = follow_ups
         return scrape_content
 
         # i = 0
@@ -443,70 +523,63 @@ class ActionExecutor:
         #         self.logger.warning(f"Failed on tab[{i}]: {e}")
         #         i += 1
 
-    def webList(self)->list:
-        self.logger.info(f"Performing weblist action of {len(self.WEBLINKS)} website(s)")
+    def webList(self, ctx)->list:
+        act = ctx.action
         scrape_content = []
-        follow_ups = self.FOLLOW_UP_ACTIONS
-        tablist_log = self.LOG_MESSAGE
         
-        if not self.WEBLINKS:
+        if not act.WEBLINKS:
             self.logger.error(f"No urls attatched for weblist function to perform.")
             return scrape_content
 
-        elif isinstance(self.WEBLINKS,list):
-            weblinks = self.WEBLINKS
-        
-        elif isinstance(self.WEBLINKS,dict):
-            base_url = self.WEBLINKS["base_url"]
-            params = self.WEBLINKS["params"]
-            weblinks = ActionExecutorHelper.build_multiple_urls(base_url,params)
+        elif isinstance(act.WEBLINKS,dict):
+            weblinks = ActionExecutorHelper.build_multiple_urls(act.WEBLINKS["base_url"],act.WEBLINKS["params"])
         
+        else:
+            weblinks = list(act.WEBLINKS)
         
-        weblink_headers = []
-        if self.WEBLINKS_HEADER:
-            weblink_headers = self.WEBLINKS_HEADER.split("||")
+        ctx.extras["web_links"] = weblinks
+        self.logger.info(f"Performing weblist action of {len(weblinks)} website(s)")
+        weblink_headers = act.WEBLINKS_HEADER
         
         for idx, url in enumerate(weblinks):
             try:
-                self.driver.get(url)
+                self.scheduler.acquire(url)
+                with span("page_load", url=url):
+                    self.driver.get(url)
+                self.__settle_after_load(act)
+                self.snapshot = None
                 self.logger.notice(f"Redirecting to: {url}")
-                for step in follow_ups:
-                    if step.get("wait_until"):
-                        condition = self.__get_condition(step["wait_until"], step["by"], step["value"])
-                        WebDriverWait(self.driver, step["timeout"]).until(condition)
-                        result = self.execute(step)
+                for step in act.STEPS: #step waits on its own wait_until inside execute
+                    result = self.execute(step)
                         
                     if not result:
-                        self.logger.warning(f"No result returned for step {step['action']}")
+                        self.logger.warning(f"No result returned for step {step.ACTION}")
                         continue
                     
-                    step_content = result.get("response", [])
+                    step_content = result.get("response") or []
                     if weblink_headers:
                         web_link_header = weblink_headers[idx]
-                        for step in step_content:
-                            # pprint.pprint(step)
-                            if step.get("data_present"):
-                                titles = step.get("title",[])
+                        for packet in step_content:
+                            # pprint.pprint(packet)
+                            if packet.get("data_present"):
+                                titles = packet.get("title",[])
                                 if titles:titles.append(web_link_header)
                                 else: titles = [web_link_header]
-                                step.update({"title":titles})
+                                packet.update({"title":titles})
                     scrape_content.extend(step_content)
             
             except Exception as e:
                 self.logger.warning(f"Failed on url:{url}:: {e}")
                          
-        self.ACTION_TYPE = "tablist"
-        self.LOG_MESSAGE = tablist_log
-        self.FOLLOW_UP_ACTIONS = follow_ups
         return scrape_content
 
-    def downloadElem(self):
+    def downloadElem(self, ctx):
+        act = ctx.action
+        elements = self.driver.find_elements(act.BY, act.VALUE) if act.MULTIPLE else [self.driver.find_element(act.BY, act.VALUE)]
+        self.logger.info(f"Total Elements Found By={act.BY} and Value={act.VALUE} are {len(elements)}")
         
-        elements = self.driver.find_elements(self.BY, self.VALUE) if self.MULTIPLE else [self.driver.find_element(self.BY, self.VALUE)]
-        self.logger.info(f"Total Elements Found By={self.BY} and Value={self.VALUE} are {len(elements)}")
-        scrape_content = []
-        
-        #Helper
+        #resolve every url on the driver first (serial), then fetch concurrently
+        jobs = []
         for idx, elem in enumerate(elements):
             try:
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", elem)
@@ -521,20 +594,49 @@ class ActionExecutor:
                 self.logger.info(f"{file_url}")
 
                 if file_type:
-                    try:
-                        output_dir = Helper.create_dirs(self.OUTPUT_PATH, ["downloads"])
-                        file_content = self.__download_file(file_url, output_dir, idx, file_type)
-                        scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}_{idx}",header=os.path.basename(urlparse(file_url).path),value=file_content,type=file_type))
-                    except Exception as e:
-                        self.logger.error(f"Download failed at index {idx}: {e}")
+                    jobs.append((idx, file_url, file_type))
                 # else:
                 #     self.logger.info("Triggered click for file download.")
                 #     elem.click()
 
             except Exception as e:
                 self.logger.error(f"Error at index {idx}: {e}")
-                
-        return scrape_content
+        
+        if not jobs:
+            return []
+        
+        output_dir = Helper.create_dirs(self.OUTPUT_PATH, ["downloads"])
+        workers = max(1, min(self.PARAMS.get("download_workers", self.DOWNLOAD_WORKERS), len(jobs)))
+        if self.downloader is None: #seed on this thread, the workers only share it
+            self.__create_downloader(pool_size=max(8, workers))
+        
+        #download.aspx?id=1 / ?id=2 share a basename: concurrent jobs each need their own file
+        names = [self.__download_name(file_url, idx, file_type) for idx, file_url, file_type in jobs]
+        repeated = {name for name in names if names.count(name) > 1}
+        jobs = [(idx, file_url, file_type, f"{idx}_{name}" if name in repeated else name)
+                for (idx, file_url, file_type), name in zip(jobs, names)]
+        
+        def fetch(job):
+            idx, file_url, file_type, filename = job
+            try:
+                with span("download"):
+                    blob = self.__download_file(file_url, output_dir, idx, file_type, act.FILE_SAVE, filename)
+                return self.__generate_blob_packet(name=f"{act.PDF_NAME}_{idx}",header=os.path.basename(urlparse(file_url).path),blob=blob,type=file_type)
+            except Exception as e:
+                self.logger.error(f"Download failed at index {idx}: {e}")
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            #each job runs in a copy of this context so its span keeps the bank/action tags
+            futures = [pool.submit(copy_context().run, fetch, job) for job in jobs]
+            results = [future.result() for future in futures] #index order
+        return [packet for packet in results if packet is not None]
+    
+    def __create_downloader(self, pool_size=8):
+        self.downloader = Downloader.from_driver(self.driver, headers=self.PARAMS.get("headers", {}), pool_size=pool_size)
+        if self.archive:
+            self.downloader.session.mount("http://", self.archive.adapter())
+            self.downloader.session.mount("https://", self.archive.adapter())
+        return self.downloader
     
     def __extract_html_href(self,elem):
             url = elem.get_attribute("href")
@@ -546,76 +648,82 @@ class ActionExecutor:
                     url = None
             return url
     
-    def __download_file(self, file_url, output_dir, idx, extension):
-        cookies = {c['name']: c['value'] for c in self.driver.get_cookies()}
-        r = requests.get(file_url, cookies=cookies, verify=False) #check this out
-        self.logger.notice(f" `{extension}` GET Request Returned Status: {r.status_code}")
+    @staticmethod
+    def __download_name(file_url, idx, extension):
+        safe_filename = Helper.sanitize_Win_filename(os.path.basename(urlparse(file_url).path))
+        return safe_filename or f"file_{idx}.{extension}"
+    
+    def __download_file(self, file_url, output_dir, idx, extension, file_save=False, filename=None):
+        if self.downloader is None: #seeded once per bank from the browser session
+            self.__create_downloader()
         
+        safe_filename = filename or self.__download_name(file_url, idx, extension)
+        file_path = os.path.join(output_dir, safe_filename)
         
-        encoded_data = ""
-        if r.status_code == 200:
-
-            parsed_url = urlparse(file_url)
-            raw_filename = os.path.basename(parsed_url.path)
-            safe_filename = Helper.sanitize_Win_filename(raw_filename)
-    
-            if not safe_filename: safe_filename = f"file_{idx}.{extension}"
-
-            file_path = os.path.join(output_dir, safe_filename)
-            file_data = r.content
-            
-            if len(file_data)>=MAX_REQUEST_BYTE_SIZE:
-                self.logger.warning(f"Skipped {safe_filename} — size {len(file_data)} exceeds limit.")
-                return encoded_data
-            
-            encoded_data = base64.b64encode(file_data).decode("utf-8")
-            if self.FILE_SAVE:
-                Helper.write_binary_file(file_path, file_data)
-                self.logger.info(f"Downloaded {extension.upper()} to {file_path}")
-                
+        blob = None
+        try:
+            result = self.downloader.fetch(file_url, file_path)
+        except DownloadTooLarge as e:
+            self.logger.warning(f"Skipped {safe_filename} — {e}")
+            return blob
+        self.logger.notice(f" `{extension}` GET Request Returned Status: {result['status']}")
+        
+        if result["path"]:
+            if self.recorder:
+                self.recorder.add_file(file_url, file_path, BlobStore.mime_for(extension, safe_filename))
+            #already hashed while streaming; without file_save the download is moved into the store
+            blob = self.blobs.put_file(file_path, digest=result["sha256"], keep=file_save)
+            blob["mime"] = BlobStore.mime_for(extension, safe_filename)
+            if file_save:
+                self.logger.info(f"Downloaded {extension.upper()} to {file_path} ({result['size']} bytes, sha256 {result['sha256'][:12]})")
         else:
-            self.logger.error(f"Failed to download {extension.upper()}, returning empty str.")
+            self.logger.error(f"Failed to download {extension.upper()}, no blob stored.")
         
-        return encoded_data
+        return blob
     
-    def manualAction(self, _timeout = MAX_DOWNLOAD_TIMEOUT, _wait = MAX_DOWNLOAD_WAIT):
+    def manualAction(self, ctx, _timeout = MAX_DOWNLOAD_TIMEOUT, _wait = MAX_DOWNLOAD_WAIT):
+        act = ctx.action
         self.logger.info("Waiting for user to download PDF...")
         file_path,ext = ActionExecutorHelper._wait_for_download(self.OUTPUT_PATH, timeout=_timeout)
         time.sleep(_wait)
         scrape_content = []
         if file_path:
-            with open(file_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode("utf-8")
-                scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}",header=os.path.basename(file_path),value=encoded,type=ext))
+            blob = self.blobs.put_file(file_path)
+            blob["mime"] = BlobStore.mime_for(ext, file_path)
+            scrape_content.append(self.__generate_blob_packet(name=f"{act.PDF_NAME}",header=os.path.basename(file_path),blob=blob,type=ext))
         else:
             self.logger.warning("No valid downloaded file found within timeout.")
 
         return scrape_content
       
-    def genSst(self):
+    def genSst(self, ctx):
+        act = ctx.action
         try:
             scrape_content = []
             result = self.driver.execute_cdp_cmd("Page.captureScreenshot", {"captureBeyondViewport": True,"fromSurface": True})
             
-            encoded_data = result['data']
-            if self.FILE_SAVE:
-                file_path = Helper.create_path(self.OUTPUT_PATH, f"{self.pdf_name}-{Helper.generate_uid()}.png")
-                Helper.write_binary_file(file_path, base64.b64decode(encoded_data))
+            file_data = base64.b64decode(result.pop('data'))
+            if act.FILE_SAVE:
+                file_path = Helper.create_path(self.OUTPUT_PATH, f"{act.PDF_NAME}-{Helper.generate_uid()}.png")
+                Helper.write_binary_file(file_path, file_data)
                 self.logger.save(f"Saved screenshot to {file_path}")
             
-            scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}",header="",value=encoded_data,type=self.ACTION_TYPE))
+            blob = self.blobs.put_bytes(file_data)
+            blob["mime"] = BlobStore.mime_for(act.ACTION)
+            scrape_content.append(self.__generate_blob_packet(name=f"{act.PDF_NAME}",header="",blob=blob,type=act.ACTION))
         except Exception as e:
             self.logger.warning(f"Failed to save screenshot: {str(e)}")
         
         return scrape_content
 
-    def genPdf(self):
+    def genPdf(self, ctx):
+        act = ctx.action
         try:
-            if self.ACTION_TYPE == "redir_pdf":
+            if act.ACTION == "redir_pdf":
                 self.driver.switch_to.window(self.driver.window_handles[-1])
                 self.driver.maximize_window()
                 self.driver.execute_script("document.body.style.zoom='100%'")
-                time.sleep(2)
+                wait_ready(self.driver, "settled", timeout=act.DEFAULT_WAIT, idle_ms=act.IDLE_MS)
 
             self.__scroll_to_bottom()
             
@@ -627,39 +735,48 @@ class ActionExecutor:
             paper_width = width / dpi
             paper_height = height / dpi
 
-            #"landscape": self.LANDSCAPE
+            #"landscape": act.LANDSCAPE
             result = self.driver.execute_cdp_cmd("Page.printToPDF", {
-                "printBackground": self.PRINT_BACKGROUND,                                                     
+                "printBackground": act.PRINT_BACKGROUND,                                                     
                 "paperWidth": paper_width,
                 "paperHeight": paper_height,
             })
 
             #save + output
-            encoded_data = result['data']
-            if self.FILE_SAVE:
-                file_path = Helper.create_path(self.OUTPUT_PATH, f"{self.pdf_name}-{Helper.generate_uid()}.pdf")
-                Helper.write_binary_file(file_path, base64.b64decode(encoded_data))
+            file_data = base64.b64decode(result.pop('data'))
+            if act.FILE_SAVE:
+                file_path = Helper.create_path(self.OUTPUT_PATH, f"{act.PDF_NAME}-{Helper.generate_uid()}.pdf")
+                Helper.write_binary_file(file_path, file_data)
                 self.logger.save(f"Saved printed PDF to {file_path}")
             
-            scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}",header="",value=encoded_data,type=self.ACTION_TYPE))
+            blob = self.blobs.put_bytes(file_data)
+            blob["mime"] = BlobStore.mime_for(act.ACTION)
+            scrape_content.append(self.__generate_blob_packet(name=f"{act.PDF_NAME}",header="",blob=blob,type=act.ACTION))
 
         except Exception as e:
             self.logger.warning(f"Failed to print page to PDF: {str(e)}")
         
         return scrape_content
     
-    def webRedir(self):
+    def webRedir(self, ctx):
+        act = ctx.action
         try:
-            self.logger.info(f"Redirecting to webpage {self.URL}")
-            self.driver.get(self.URL)
+            self.logger.info(f"Redirecting to webpage {act.URL}")
+            self.scheduler.acquire(act.URL)
+            with span("page_load", url=act.URL):
+                self.driver.get(act.URL)
+            self.__settle_after_load(act)
         except Exception as e:
             self.logger.error(f"Unable to redirect: {e}")
                
-    def clickElem(self): 
+    def clickElem(self, ctx): 
         try:
-            self.ELEMENT.click()
-            # if self.NEW_WINDOW:
-            #     WebDriverWait(self.driver, self.TIMEOUT).until(lambda d: len(d.window_handles) > len(self.window_stack))
+            self.scheduler.acquire(self.driver.current_url)
+            arm(self.driver)
+            ctx.element.click()
+            self.__settle_after_click(ctx.action)
+            # if act.NEW_WINDOW:
+            #     WebDriverWait(self.driver, act.TIMEOUT).until(lambda d: len(d.window_handles) > len(self.window_stack))
             #     new_tab = [h for h in self.driver.window_handles if h not in self.window_stack][0]
             #     self.driver.switch_to.window(new_tab)
             #     self.window_stack.append(new_tab)
@@ -667,31 +784,40 @@ class ActionExecutor:
         except Exception as e:
             self.logger.error(f"Failed to Click Element: {str(e)}")
         
-    def clickSave(self):
+    def clickSave(self, ctx):
+        act = ctx.action
         try:
             scrape_content = []
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", self.ELEMENT)
-            time.sleep(0.5)
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', inline: 'center'});", ctx.element)
 
             # --- Store current tab handles before click ---
             initial_tabs = self.driver.window_handles
 
             # --- Perform a true user-like click ---
+            self.scheduler.acquire(self.driver.current_url)
             actions = ActionChains(self.driver)
-            actions.move_to_element(self.ELEMENT).pause(0.3).click().perform()
+            actions.move_to_element(ctx.element).pause(0.3).click().perform()
             self.logger.notice("Clicked element using ActionChains (real user gesture)")
-            time.sleep(2)
+            try:
+                WebDriverWait(self.driver, 2).until(lambda d: len(d.window_handles) > len(initial_tabs))
+            except TimeoutException:
+                pass
 
             # --- Detect new tab ---
             new_tabs = self.driver.window_handles
             if len(new_tabs) > len(initial_tabs):
                 new_tab = list(set(new_tabs) - set(initial_tabs))[0]
                 self.driver.switch_to.window(new_tab)
+                try: #a fresh tab reports about:blank until its navigation commits
+                    WebDriverWait(self.driver, act.DEFAULT_WAIT).until(lambda d: d.current_url != "about:blank")
+                except TimeoutException:
+                    pass
                 self.logger.notice(f"Switched to new tab: {self.driver.current_url}")
             else:
                 # --- Fallback: direct open if no new tab was created ---
-                pdf_url = self.ELEMENT.get_attribute("href")
+                pdf_url = ctx.element.get_attribute("href")
                 self.logger.warning("No new tab opened — navigating directly to href instead.")
+                self.scheduler.acquire(pdf_url)
                 self.driver.get(pdf_url)
                 self.logger.notice(f"Navigated directly to: {pdf_url}")
 
@@ -701,11 +827,11 @@ class ActionExecutor:
                 self.logger.notice(f"Navigating directly to PDF URL: {current_url}")
                 self.driver.get(current_url)
                 
-            file_path,ext = ActionExecutorHelper._wait_for_download(self.OUTPUT_PATH, timeout=self.TIMEOUT)
+            file_path,ext = ActionExecutorHelper._wait_for_download(self.OUTPUT_PATH, timeout=act.TIMEOUT)
             if file_path:
-                with open(file_path, "rb") as f:
-                    encoded = base64.b64encode(f.read()).decode("utf-8")
-                scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}",header=os.path.basename(file_path),value=encoded,type=ext))
+                blob = self.blobs.put_file(file_path)
+                blob["mime"] = BlobStore.mime_for(ext, file_path)
+                scrape_content.append(self.__generate_blob_packet(name=f"{act.PDF_NAME}",header=os.path.basename(file_path),blob=blob,type=ext))
                 self.logger.save("Saved downloaded file in cache.")
             else:
                 self.logger.warning("No valid downloaded file found within timeout. Empty cache")
@@ -715,25 +841,26 @@ class ActionExecutor:
         
         return scrape_content 
             
-    def httpRequest(self):
+    def httpRequest(self, ctx):
+        act = ctx.action
         self.logger.info("Performing GET REQUEST for attached website.")
-        file_url = self.URL
-        file_type = self.export_format or "dat"
+        file_url = act.URL
+        file_type = act.EXPORT_FORMAT or "dat"
         output_dir = Helper.create_dirs(self.OUTPUT_PATH, ["downloads"])
         scrape_content = []
         try:
-            file_content = self.__download_file(file_url, output_dir, 0, file_type)
-            scrape_content.append(self.__generate_resp_packet(name=f"{self.pdf_name}",header=os.path.basename(urlparse(file_url).path),value=file_content,type=file_type))
+            blob = self.__download_file(file_url, output_dir, 0, file_type, act.FILE_SAVE)
+            scrape_content.append(self.__generate_blob_packet(name=f"{act.PDF_NAME}",header=os.path.basename(urlparse(file_url).path),blob=blob,type=file_type))
         except Exception as e:
             self.logger.warning(f"Failed to perform http request: {str(e)}")
             
         return scrape_content
     
-    def injectScript(self):
+    def injectScript(self, ctx):
         # scrape_content = []
 
-        script_key = self.SCRIPT_KEY
-        raw_script = self.SCRIPT
+        script_key = ctx.action.SCRIPT_KEY
+        raw_script = ctx.action.SCRIPT
 
         if script_key:
             js = self.scripts.get(script_key)
@@ -764,18 +891,13 @@ class ActionExecutor:
 
     
     
-    def execute_blocks(self, block: list):  
+    def execute_blocks(self, block):  
+        #`block` is raw param_table blocks or an already compiled plan (tuple of ActionConfig)
+        plan = compile_blocks(block, GENERIC_ACTION_CONFIG)
         block_data = []
-        generic_actions = GENERIC_ACTION_CONFIG
-        self.logger.notice(f"Total Action(s) {len(block)}")
-        for _,_action_ in enumerate(block):
-            
-            if isinstance(_action_,str):
-                if _action_ not in generic_actions:
-                    self.logger.warning(f" {_action_} not part of generic_action_keys. Skipping.")
-                else:
-                    _action_ = generic_actions.get(_action_)   
-            data = self.execute(_action_)
+        self.logger.notice(f"Total Action(s) {len(plan)}")
+        for act in plan:
+            data = self.execute(act)
             if data:
                 block_data.append(data)
         return block_data
@@ -788,12 +910,106 @@ class ActionExecutorHelper:
     def __init__(self):
         pass
     
+    @staticmethod
+    def _get_by_(by_string):
+        return get_by(by_string)
+    
+    MAX_LABEL_LENGTH = 350
+    #in-page twin of __collect_tables + _find_preceding_texts_; whitespace class == python str.isspace()
+    BATCH_TABLE_SCRIPT = """
+    const [by, value, multiple, tableOnly, n, maxLen] = arguments;
+    const WS = /[\\t\\n\\v\\f\\r\\x1c-\\x1f \\x85\\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000]+/g;
+    const LABELS = new Set(["h1","h2","h3","h4","h5","h6","p","strong","a","span","div"]);
+    let els;
+    try {
+        if (by === "css selector") els = Array.from(document.querySelectorAll(value));
+        else if (by === "tag name") els = Array.from(document.getElementsByTagName(value));
+        else if (by === "id") els = Array.from(document.querySelectorAll("#" + CSS.escape(value)));
+        else if (by === "name") els = Array.from(document.getElementsByName(value));
+        else if (by === "class name") els = Array.from(document.getElementsByClassName(value));
+        else if (by === "xpath") {
+            const snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            els = [];
+            for (let i = 0; i < snap.snapshotLength; i++) if (snap.snapshotItem(i).nodeType === 1) els.push(snap.snapshotItem(i));
+        }
+        else return null;
+    } catch (e) { return null; }
+    if (!multiple) els = els.slice(0, 1);
+    if (tableOnly) els = els.filter(e => e.tagName.toLowerCase() === "table");
+
+    const labelsOf = (table) => {
+        const texts = [];
+        let current = table;
+        while (texts.length < n) {
+            const parent = current.parentElement;
+            if (!parent) break;
+            for (let sib = parent.previousElementSibling; sib; sib = sib.previousElementSibling) {
+                const tag = sib.tagName.toLowerCase();
+                if (tag === "table" || tag === "br" || tag === "hr") continue;
+                if (sib.getElementsByTagName("table").length) continue;
+                if (!LABELS.has(tag)) continue;
+                if (tag === "div" && !sib.querySelector("h1, h2, h3, p, strong, a, span")) continue;
+                const txt = (sib.innerText || "").replace(/\\t/g, "").replace(WS, " ").replace(/^ | $/g, "");
+                if (txt && Array.from(txt).length < maxLen) {
+                    texts.push(txt);
+                    if (texts.length === n) return texts;
+                }
+            }
+            current = parent;
+        }
+        return texts;
+    };
+    return els.map(e => ({html: e.outerHTML, labels: labelsOf(e)}));
+    """
+    
+    #Packet Builders (shared with HttpExecutor)
+    @staticmethod
+    def _action_packet_(action_type, webpage, log_message, content):
+        return {
+            "action": action_type,
+            "uid": Helper.generate_uid(),
+            "timestamp": datetime.now().strftime("%d%m%Y %H:%M:%S"),
+            "webpage": webpage,
+            "data_present": not any(
+                key in entity for entity in content
+                for key in ["status", "error_type", "error_message", "error"]
+            ),
+            "log_message": log_message,
+            "response_count": len(content),
+            "response": content if content else None
+        }
+    
+    @staticmethod
+    def _resp_packet_(name = "",header="",value = None,type = ""):
+        return {
+            "name":name,
+            "title":header,
+            "value":value,
+            "type":type,
+            "data_present": bool(value),
+            "hash": digest_text(value) if value else None
+        }
+    
+    @staticmethod
+    def _blob_packet_(name = "",header="",blob = None,type = ""):
+        #binary payloads live in the BlobStore; `hash` is the FINGERPRINT_ALGO digest of the raw bytes
+        return {
+            "name":name,
+            "title":header,
+            "value":BlobStore.ref(blob["hash"]) if blob else "",
+            "type":type,
+            "data_present": bool(blob),
+            "hash": capture_hash(BlobStore.ref(blob["hash"])) if blob else None,
+            "size": blob["size"] if blob else 0,
+            "mime": blob.get("mime") if blob else None
+        }
+    
     @staticmethod
     def _find_preceding_texts_(table, n=2):
         texts = []
         current = table
         label_tags = {"h1", "h2", "h3", "h4", "h5", "h6", "p", "strong", "a", "span","div"}
-        MAX_TEXT_LENGTH = 350
+        MAX_TEXT_LENGTH = ActionExecutorHelper.MAX_LABEL_LENGTH
         while len(texts) < n:
             try:
                 parent = current.find_element(By.XPATH, "..")
@@ -827,12 +1043,17 @@ class ActionExecutorHelper:
 
     @staticmethod
     def _clean_raw_table_html_(rawr):
+        return clean_table_html(rawr)
+    
+    @staticmethod
+    def _clean_raw_table_html_legacy_(rawr):
+        #reference chain kept for docs/table_clean_golden.py; _clean_raw_table_html_ must match it
         rawr = Helper.apply_sub(rawr, r'<th\b', '<td', ignore_case=True)
         rawr = Helper.apply_sub(rawr, r'</th\b', '</td', ignore_case=True)
         
         #tbody
-        rawr = re.sub(r"<thead\b",r"<tbody",rawr, re.IGNORECASE)
-        rawr = re.sub(r"</thead\b",r"</tbody",rawr, re.IGNORECASE)
+        rawr = re.sub(r"<thead\b",r"<tbody",rawr, flags=re.IGNORECASE)
+        rawr = re.sub(r"</thead\b",r"</tbody",rawr, flags=re.IGNORECASE)
         
         #other tags
         rawr = Helper.apply_sub(rawr, r"</?(?:strong|sup|b|p|br)(?:\s+[^>]*)?>",ignore_case=True)
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+import os, mmap, shutil, hashlib, threading, mimetypes, uuid
+
+from app.constants import BLOB_DIR
+
+
+class BlobStore:
+    """sha256-addressed file store (`<root>/ab/cd/<sha256>`). Packets keep `blob:<sha256>` in `value`
+    plus hash/size/mime; bytes are written once and read back through mmap only when needed."""
+
+    PREFIX = "blob:"
+    CHUNK_SIZE = 1024 * 1024
+    MIME_TYPES = {
+        "pdf": "application/pdf", "redir_pdf": "application/pdf", "screenshot": "image/png",
+        "csv": "text/csv", "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }
+
+    def __init__(self, root: str):
+        self.ROOT = root
+        os.makedirs(self.ROOT, exist_ok=True)
+
+    #Refs
+    @classmethod
+    def is_ref(cls, value) -> bool:
+        return isinstance(value, str) and value.startswith(cls.PREFIX)
+
+    @classmethod
+    def ref(cls, digest: str) -> str:
+        return f"{cls.PREFIX}{digest}"
+
+    @classmethod
+    def mime_for(cls, file_type: str, name: str = "") -> str:
+        return cls.MIME_TYPES.get(file_type) or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    def path_for(self, ref_or_digest: str) -> str:
+        digest = ref_or_digest[len(self.PREFIX):] if self.is_ref(ref_or_digest) else ref_or_digest
+        return os.path.join(self.ROOT, digest[:2], digest[2:4], digest)
+
+    #Write
+    def put_bytes(self, data: bytes) -> dict:
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path_for(digest)
+        if not os.path.exists(target):
+            tmp = self.__tmp_path(target)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        return {"hash": digest, "size": len(data)}
+
+    def put_file(self, path: str, digest: str = None, keep: bool = True) -> dict:
+        """Add a file on disk. `digest` skips re-hashing (e.g. hashed while streaming),
+        keep=False moves the file into the store instead of copying it."""
+        if digest is None:
+            digest = self.__hash_file(path)
+        size = os.path.getsize(path)
+        target = self.path_for(digest)
+
+        if os.path.exists(target):
+            if not keep:
+                os.remove(path)
+        else:
+            tmp = self.__tmp_path(target)
+            if keep:
+                shutil.copyfile(path, tmp)
+            else:
+                shutil.move(path, tmp)
+            os.replace(tmp, target)
+        return {"hash": digest, "size": size}
+
+    #Read
+    @contextmanager
+    def open(self, ref: str):
+        """Read-only mmap of a blob (file-like: read/seek/tell, sliceable)."""
+        with open(self.path_for(ref), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield f
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mm
+            finally:
+                mm.close()
+
+    def read_bytes(self, ref: str) -> bytes:
+        with self.open(ref) as mm:
+            return mm.read()
+
+    #Internal
+    def __hash_file(self, path) -> str:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def __tmp_path(target) -> str:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        return f"{target}.{uuid.uuid4().hex}.tmp"
+
+
+# --- Process-wide store ---
+_store = None
+_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore(BLOB_DIR)
+        return _store
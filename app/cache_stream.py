@@ -0,0 +1,152 @@
+import json, os, glob, threading
+
+
+class CacheStream:
+    """Append-only NDJSON cache: line 1 is {"metadata": ...}, every other line is one bank record.
+    Each write is flushed + fsync'd, so a crash/kill loses at most the bank in flight."""
+
+    SUFFIX = "_cache.ndjson"
+
+    def __init__(self, path: str):
+        self.PATH = path
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        if self._fh is None:
+            torn = False
+            if os.path.exists(self.PATH) and os.path.getsize(self.PATH):
+                with open(self.PATH, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n" #killed mid-line, start the next record on a fresh line
+            self._fh = open(self.PATH, "a", encoding="utf-8")
+            if torn:
+                self._fh.write("\n")
+        return self
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    #Write
+    def write_metadata(self, metadata: dict):
+        self.__append({"metadata": metadata})
+
+    def write_record(self, record: dict):
+        self.__append(record)
+
+    def __append(self, obj: dict):
+        line = json.dumps(obj, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.open()
+            self._fh.write(line)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    #Read (lazy)
+    @staticmethod
+    def iter_lines(path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError: #torn tail from a hard kill
+                    continue
+
+    @classmethod
+    def read_metadata(cls, path: str) -> dict:
+        for obj in cls.iter_lines(path):
+            if "metadata" in obj:
+                return obj["metadata"]
+        return {}
+
+    @classmethod
+    def iter_records(cls, path: str):
+        for obj in cls.iter_lines(path):
+            if "metadata" not in obj:
+                yield obj
+
+    @staticmethod
+    def record_key(record: dict):
+        return record.get("bank_key", record.get("bank_code"))
+
+    @classmethod
+    def iter_latest(cls, path: str, order=None):
+        """iter_records, but a bank re-run on resume only yields its last record (two lazy passes,
+        the first keeps one line number per bank). With `order` (bank codes) the records come in that
+        order instead of completion order, unlisted banks last; the second pass then seeks to each
+        record's byte offset."""
+        if order is not None:
+            yield from cls.__iter_ordered(path, order)
+            return
+        last = {}
+        for idx, record in enumerate(cls.iter_records(path)):
+            last[cls.record_key(record)] = idx
+        for idx, record in enumerate(cls.iter_records(path)):
+            key = cls.record_key(record)
+            if key is None or last[key] == idx:
+                yield record
+
+    @classmethod
+    def __iter_ordered(cls, path: str, order):
+        offsets = {} #bank key -> byte offset of its last record
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    obj = None
+                if isinstance(obj, dict) and "metadata" not in obj:
+                    key = cls.record_key(obj)
+                    offsets[key if key is not None else ("", offset)] = offset
+                offset += len(line)
+
+            rank = {code: idx for idx, code in enumerate(order)}
+            for key in sorted(offsets, key=lambda key: rank.get(key, len(rank))):
+                f.seek(offsets[key])
+                yield json.loads(f.readline())
+
+    @classmethod
+    def as_cache(cls, path: str, order=None) -> dict:
+        """Same shape as BankScraper.get_final_struct(), `records` is a generator over the stream
+        (last record per bank, in `order` when given)."""
+        return {"metadata": cls.read_metadata(path), "records": cls.iter_latest(path, order), "registry": {}}
+
+    @staticmethod
+    def is_complete(record: dict) -> bool:
+        scraped = record.get("scraped_data") or []
+        return bool(scraped) and not any(isinstance(d, dict) and ("error" in d or "error_Type" in d) for d in scraped)
+
+    @classmethod
+    def completed_codes(cls, path: str) -> set:
+        return {cls.record_key(r) for r in cls.iter_latest(path) if cls.is_complete(r)}
+
+    @classmethod
+    def latest(cls, directory: str):
+        streams = sorted(glob.glob(os.path.join(directory, f"*{cls.SUFFIX}")), key=os.path.getmtime)
+        return streams[-1] if streams else None
+
+    @classmethod
+    def export_json(cls, path: str, out_path: str, indent: int = 2, order=None):
+        """Write the classic single-file cache JSON record by record (never all in memory), last record per bank,
+        in `order` when given."""
+        pad = " " * indent
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write("{\n" + pad + '"metadata": ' + json.dumps(cls.read_metadata(path), indent=indent).replace("\n", "\n" + pad))
+            f.write(",\n" + pad + '"records": [')
+            for idx, record in enumerate(cls.iter_latest(path, order)):
+                body = json.dumps(record, indent=indent).replace("\n", "\n" + pad * 2)
+                f.write(("," if idx else "") + "\n" + pad * 2 + body)
+            f.write("\n" + pad + "],\n" + pad + '"registry": {}\n}')
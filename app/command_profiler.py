@@ -0,0 +1,35 @@
+import json
+
+from app.spans import span
+
+#Opt-in chromedriver round-trip profiler (PROFILE_WEBDRIVER). Every WebDriver.execute() call, including
+#the ones WebElement methods make through their parent driver, becomes a `webdriver` span carrying the
+#command name and request/response payload sizes, under whatever bank/action/selector tags are active.
+
+
+def _size(value) -> int:
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return -1
+
+
+def profile_driver(driver):
+    """Wrap driver.execute in place (instance attribute, so elements go through it too). Idempotent."""
+    if getattr(driver, "_unprofiled_execute", None):
+        return driver
+    execute = driver.execute
+
+    def profiled_execute(driver_command, params=None):
+        with span("webdriver", command=driver_command) as entry:
+            entry["sent"] = _size(params)
+            response = execute(driver_command, params)
+            entry["received"] = _size(response.get("value")) if response else 0
+        return response
+
+    driver._unprofiled_execute = execute
+    driver.execute = profiled_execute
+    return driver
+
@@ -0,0 +1,160 @@
+import os, copy, marshal, hashlib, uuid
+import json5
+
+from app.lean_profile import check_lean
+
+#param_table + generic_actions parsed, validated and resolved once, then kept as a marshal blob.
+#Reused while both files keep their (mtime, size); on a stat change the content hash decides
+#whether a full json5 parse is really needed.
+CACHE_VERSION = 2
+CACHE_FILE = "configs.marshal"
+RESERVED_KEYS = {"HOST_LIMITS", "POST_SCRAPE_OPS"}
+BANK_REQUIRED = ("bank_name", "bank_type", "bank_type_code")
+RUNNABLE_REQUIRED = ("base_url", "blocks")
+BANK_DEFAULTS = {"headers": {}}
+
+
+class ConfigError(ValueError):
+    """param_table / generic_actions failed validation; lists every problem found."""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__("Invalid config:\n  " + "\n  ".join(problems))
+
+
+#Validate + resolve
+def _resolve_actions(actions, generic_actions, where, problems) -> list:
+    """Generic action names -> their (copied) dicts, recursively through `steps`."""
+    resolved = []
+    for idx, _action_ in enumerate(actions or []):
+        here = f"{where}[{idx}]"
+        if isinstance(_action_, str):
+            if _action_ not in generic_actions:
+                problems.append(f"{here}: unknown generic action '{_action_}'")
+                continue
+            _action_ = copy.deepcopy(generic_actions[_action_])
+        if not isinstance(_action_, dict) or not _action_.get("action"):
+            problems.append(f"{here}: expected an action name or a dict with `action`")
+            continue
+
+        web_links = _action_.get("web_links")
+        if isinstance(web_links, dict) and (not isinstance(web_links.get("base_url"), str)
+                                            or not isinstance(web_links.get("params"), dict)):
+            problems.append(f"{here}.web_links: URL template needs `base_url` (str) and `params` (dict)")
+        if _action_.get("url") and not str(_action_["url"]).startswith(("http://", "https://")):
+            problems.append(f"{here}.url: not an http(s) URL: {_action_['url']!r}")
+
+        if _action_.get("steps"):
+            _action_["steps"] = _resolve_actions(_action_["steps"], generic_actions, f"{here}.steps", problems)
+        resolved.append(_action_)
+    return resolved
+
+
+def _check_ops(rules, problems):
+    for name, stages in (rules or {}).items():
+        for stage, operations in (stages or {}).items():
+            for idx, operation in enumerate(operations or []):
+                if not isinstance(operation, list) or len(operation) not in (3, 4):
+                    problems.append(f"POST_SCRAPE_OPS.{name}.{stage}[{idx}]: expected [func, source, target(, types)]")
+
+
+def resolve_configs(config: dict, generic_actions: dict) -> tuple:
+    """Validated copies of both configs: bank `blocks` (and `steps`) hold action dicts only,
+    bank defaults are filled in. Raises ConfigError with every problem at once."""
+    problems = []
+    generic = {}
+    for name, _action_ in generic_actions.items():
+        if name == "scripts":
+            generic[name] = _action_
+            continue
+        steps = _action_.get("steps") if isinstance(_action_, dict) else None
+        generic[name] = _action_
+        if not isinstance(_action_, dict) or not _action_.get("action"):
+            problems.append(f"generic_actions.{name}: expected a dict with `action`")
+        elif steps:
+            generic[name] = {**_action_, "steps": _resolve_actions(steps, generic_actions, f"generic_actions.{name}.steps", problems)}
+
+    resolved = {}
+    for code, bank in config.items():
+        if code in RESERVED_KEYS:
+            resolved[code] = bank
+            continue
+        if not isinstance(bank, dict):
+            problems.append(f"{code}: expected a dict")
+            continue
+
+        bank = {**BANK_DEFAULTS, **bank}
+        missing = [key for key in BANK_REQUIRED if key not in bank]
+        if "blocks" in bank: #runnable bank
+            missing += [key for key in RUNNABLE_REQUIRED if not bank.get(key)]
+            if bank.get("base_url") and not str(bank["base_url"]).startswith(("http://", "https://")):
+                problems.append(f"{code}.base_url: not an http(s) URL: {bank['base_url']!r}")
+            bank["blocks"] = _resolve_actions(bank["blocks"], generic_actions, f"{code}.blocks", problems)
+        check_lean(bank.get("lean"), f"{code}.lean", problems)
+        if missing:
+            problems.append(f"{code}: missing {', '.join(missing)}")
+        resolved[code] = bank
+
+    _check_ops(config.get("POST_SCRAPE_OPS"), problems)
+    if problems:
+        raise ConfigError(problems)
+    return resolved, generic
+
+
+#Cache
+def _stat(path) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _sha256(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            cached = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return cached if isinstance(cached, dict) and cached.get("version") == CACHE_VERSION else None
+
+
+def _write_cache(cache_path, cached):
+    tmp = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            marshal.dump(cached, f)
+        os.replace(tmp, cache_path) #atomic, parallel workers never see half a cache
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_configs(config_path: str, generic_path: str, cache_dir: str) -> tuple:
+    """(CONFIG, GENERIC_ACTION_CONFIG), from the marshal cache when both sources are unchanged."""
+    cache_path = os.path.join(cache_dir, CACHE_FILE)
+    paths = [os.path.abspath(config_path), os.path.abspath(generic_path)]
+    stats = [_stat(path) for path in paths]
+
+    cached = _read_cache(cache_path)
+    if cached and cached["paths"] == paths:
+        if cached["stats"] == stats:
+            return cached["config"], cached["generic"]
+        hashes = [_sha256(path) for path in paths]
+        if cached["hashes"] == hashes: #touched but unchanged, refresh the stat key only
+            _write_cache(cache_path, {**cached, "stats": stats})
+            return cached["config"], cached["generic"]
+    else:
+        hashes = [_sha256(path) for path in paths]
+
+    with open(paths[0], "r", encoding="utf-8") as f:
+        config = json5.load(f)
+    with open(paths[1], "r", encoding="utf-8") as f:
+        generic_actions = json5.load(f)
+    config, generic_actions = resolve_configs(config, generic_actions)
+
+    _write_cache(cache_path, {"version": CACHE_VERSION, "paths": paths, "stats": stats, "hashes": hashes,
+                              "config": config, "generic": generic_actions})
+    return config, generic_actions
@@ -1,12 +1,8 @@
 import json,json5, os
 from datetime import datetime
 
-<<<<<<< HEAD
-#configs
-CONFIG = Helper.load_json(r"configs\param_table.json5", typ="json5")
-GENERIC_ACTION_CONFIG = Helper.load_json(r"configs\generic_actions.json5", typ="json5")
-PATHS = Helper.load_json(r"paths.json5", typ="json5")
-=======
+from app.config_cache import load_configs
+
 
 root_dir = os.path.dirname(os.path.dirname(__file__))
 
@@ -28,10 +24,9 @@ PATHS = load_json5(r"paths.json5")
 conf_path = os.path.join(root_dir,PATHS["configs"])
 gen_conf_path =os.path.join(root_dir,PATHS["generic_config"])
 
-CONFIG = load_json5(conf_path)
-GENERIC_ACTION_CONFIG = load_json5(gen_conf_path)
+#validated + generic actions resolved; json5 is only re-parsed when a file actually changes
+CONFIG, GENERIC_ACTION_CONFIG = load_configs(conf_path, gen_conf_path, create_dir(PATHS["output"],"cache","config"))
 SCRIPTS = GENERIC_ACTION_CONFIG["scripts"]
->>>>>>> 2e16bafd50b517a089dffa62705f2a939822edd0
 
 TODAY = datetime.now().strftime("%Y-%m-%d")
 PROGRAM_NAME = "DepositRate Scrape"
@@ -41,6 +36,9 @@ LOG_DIR = create_dir(PATHS["output"],"logs")
 CCH_DIR = create_dir(PATHS["output"],"cache",TODAY) 
 PRS_DIR = create_dir(PATHS["output"],"process",TODAY)
 CACHE_REP_DIR = create_dir(PATHS["output"],"report")
+BLOB_DIR = create_dir(PATHS["output"],"blobs") #sha256-addressed binaries referenced by packets
+SEL_HIST_DIR = create_dir(PATHS["output"],"cache","selectors") #skip_if_not_found hit/miss history per bank
+ARCHIVE_DIR = create_dir(PATHS["output"],"archive",TODAY) #RECORD_RUNS zips, one per bank
 
 # POST_SCRAPE_OPS = CONFIG["POST_SCRAPE_OPS"]
 
@@ -48,6 +46,25 @@ CACHE_REP_DIR = create_dir(PATHS["output"],"report")
 #file size constants
 MAX_REQUEST_BYTE_SIZE = 2_000_000 #2mb file
 
+#Algorithm of every packet's capture-time `hash` (app.fingerprint): sha256 | blake2b | sha1 | md5.
+#sha256 reuses the blob store's address for binaries; the others hash blobs once more at capture
+FINGERPRINT_ALGO = "sha256"
+
+#HTTP fast path; a bank's `http_first` overrides this
+HTTP_FIRST = False
+
+#Time every chromedriver round trip as a `webdriver` span (adds a json size check per command)
+PROFILE_WEBDRIVER = False
+
+#Lean page loads (app.lean_profile): block images, fonts, media and analytics/chat hosts through CDP.
+#Bank key `lean` overrides; banks with screenshot/pdf actions load in full unless they set it
+LEAN_PAGES = True
+
+#Record/replay (app.run_archive): RECORD_RUNS zips every bank's pages, XHR/fetch bodies and downloads
+#into ARCHIVE_DIR; REPLAY_DIR (an earlier ARCHIVE_DIR) serves them back instead of the network
+RECORD_RUNS = False
+REPLAY_DIR = None
+
 #Manual
 MAX_DOWNLOAD_TIMEOUT = 45
 MAX_DOWNLOAD_WAIT = 5
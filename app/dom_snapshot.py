@@ -0,0 +1,187 @@
+from selenium.webdriver.common.by import By
+from lxml.cssselect import CSSSelector
+import lxml.html, re
+
+from app.utils import Helper
+
+
+class DomSnapshot:
+    """Parsed (lxml) copy of a page; answers the read-only extractors without touching the browser."""
+
+    LABEL_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "p", "strong", "a", "span", "div"}
+    MAX_TEXT_LENGTH = 350
+    #rendered-text rules (WebDriver .text / innerText): what starts a line, what is never rendered
+    BLOCK_TAGS = {
+        "address", "article", "aside", "blockquote", "caption", "center", "dd", "details", "dialog", "div", "dl",
+        "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+        "hr", "legend", "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tbody", "tfoot",
+        "thead", "tr", "ul",
+    }
+    CELL_TAGS = {"td", "th"}
+    PRE_TAGS = {"pre", "textarea"}
+    UNRENDERED_TAGS = {"head", "script", "style", "noscript", "template", "title"}
+    HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+    SPACES = re.compile(r"[ \t\r\n\f]+") #html whitespace; &nbsp; survives until the end, like the browser
+
+    def __init__(self, html: str, url: str = ""):
+        self.URL = url
+        self.tree = lxml.html.document_fromstring(html or "<html></html>")
+        self._selectors = {}
+
+    def find_elements(self, by, value, root=None) -> list:
+        root = self.tree if root is None else root
+        if by == By.CSS_SELECTOR:
+            return self.__css(value)(root)
+        if by == By.XPATH:
+            return [el for el in root.xpath(value) if isinstance(el, lxml.html.HtmlElement)]
+        if by == By.ID:
+            return root.xpath(".//*[@id=$v]", v=value)
+        if by == By.NAME:
+            return root.xpath(".//*[@name=$v]", v=value)
+        if by == By.CLASS_NAME:
+            return self.__css(f".{value}")(root)
+        if by == By.TAG_NAME:
+            return list(root.iter(value.lower()))
+        if by == By.LINK_TEXT:
+            return root.xpath(".//a[normalize-space(.)=$v]", v=value)
+        if by == By.PARTIAL_LINK_TEXT:
+            return root.xpath(".//a[contains(., $v)]", v=value)
+        raise ValueError(f"Unsupported locator for snapshot: {by}")
+
+    def find_element(self, by, value, root=None):
+        elements = self.find_elements(by, value, root)
+        if not elements:
+            raise LookupError(f"No element in snapshot for {by}={value}")
+        return elements[0]
+
+    #Read-only Extractors (same shapes as the live ActionExecutor paths)
+    def tables(self, by, value, multiple=True) -> list:
+        """[(outerHTML, labels)] per matched table, labels as _find_preceding_texts_."""
+        elements = self.find_elements(by, value)
+        if not multiple:
+            elements = elements[:1]
+        if by == By.CSS_SELECTOR:  # mandatory filter
+            elements = [elem for elem in elements if self.tag_name(elem) == "table"]
+        return [(self.outer_html(elem), self.preceding_texts(elem)) for elem in elements]
+
+    def htmls(self, by, value, multiple=True) -> list:
+        elements = self.find_elements(by, value)
+        return [self.outer_html(elem) for elem in (elements if multiple else elements[:1])]
+
+    def scrape(self, by, value, fields=None, attribute=None) -> dict:
+        """`fields` is {key: (by, selector)}, text falls back to textContent, then innerHTML like textScrape."""
+        data_container = {}
+        for elem in self.find_elements(by, value):
+            if fields:
+                for key, (sub_by, sub_selector) in fields.items():
+                    found = self.find_elements(sub_by, sub_selector, root=elem)
+                    data_container[key] = (self.text(found[0]) or found[0].text_content().strip()
+                                           or self.inner_html(found[0]).strip()) if found else None
+            elif attribute:
+                data_container[attribute] = elem.get(attribute)
+            else:
+                data_container["text"] = self.text(elem)
+        return data_container
+
+    #Element Reads
+    @staticmethod
+    def tag_name(elem) -> str:
+        return elem.tag.lower() if isinstance(elem.tag, str) else ""
+
+    @staticmethod
+    def outer_html(elem) -> str:
+        return lxml.html.tostring(elem, encoding="unicode", with_tail=False)
+
+    @staticmethod
+    def inner_html(elem) -> str:
+        return (elem.text or "") + "".join(lxml.html.tostring(child, encoding="unicode") for child in elem)
+
+    @classmethod
+    def text(cls, elem) -> str:
+        """Rendered text as WebDriver's element.text gives it: a line per block element and <br>, cells
+        space separated, whitespace collapsed, script/style and hidden elements left out."""
+        if any(cls.__hidden(node) for node in elem.iterancestors()):
+            return ""
+        lines = [""]
+        cls.__visible_lines(elem, lines, pre=False)
+        joined = "\n".join(line.strip(" \t\r\n\f") for line in lines)
+        return joined.strip(" \t\r\n\f").replace("\xa0", " ")
+
+    def preceding_texts(self, table, n=2) -> list:
+        """lxml port of ActionExecutorHelper._find_preceding_texts_, same walk and filters."""
+        texts = []
+        current = table
+        while len(texts) < n:
+            parent = current.getparent()
+            if parent is None:
+                break
+            for sib in parent.itersiblings(preceding=True):  # nearest first
+                tag = self.tag_name(sib)
+                if not tag or tag in ["table", "br", "hr"]:
+                    continue
+                if sib.find(".//table") is not None:
+                    continue
+                if tag not in self.LABEL_TAGS:
+                    continue
+                if tag == "div":
+                    if not sib.xpath(".//h1 | .//h2 | .//h3 | .//p | .//strong | .//a | .//span"):
+                        continue
+
+                txt = self.text(sib) #innerText in the live walk
+                txt = Helper._remove_tabspace(txt)
+                txt = Helper._normalize_whitespace(txt)
+                if txt and len(txt) < self.MAX_TEXT_LENGTH:
+                    texts.append(txt)
+                    if len(texts) == n:
+                        return list(reversed(texts))
+            current = parent
+        return list(reversed(texts)) if texts else ["No label found"] * n
+
+    #Internal
+    @classmethod
+    def __hidden(cls, elem) -> bool:
+        tag = cls.tag_name(elem)
+        return (tag in cls.UNRENDERED_TAGS or elem.get("hidden") is not None
+                or (tag == "input" and (elem.get("type") or "").lower() == "hidden")
+                or cls.HIDDEN_STYLE.search(elem.get("style") or "") is not None)
+
+    @classmethod
+    def __visible_lines(cls, elem, lines, pre):
+        tag = cls.tag_name(elem)
+        if not tag or cls.__hidden(elem): #comments, processing instructions
+            return
+        if tag == "br":
+            lines.append("")
+            return
+        pre = pre or tag in cls.PRE_TAGS
+        block = tag in cls.BLOCK_TAGS
+        if block and lines[-1]:
+            lines.append("")
+        elif tag in cls.CELL_TAGS and lines[-1] and not lines[-1].endswith(" "):
+            lines[-1] += " "
+        cls.__append_text(elem.text, lines, pre)
+        for child in elem:
+            cls.__visible_lines(child, lines, pre)
+            cls.__append_text(child.tail, lines, pre)
+        if block and lines[-1]:
+            lines.append("")
+
+    @classmethod
+    def __append_text(cls, text, lines, pre):
+        if not text:
+            return
+        if pre:
+            first, *rest = text.split("\n")
+            lines[-1] += first
+            lines.extend(rest)
+            return
+        text = cls.SPACES.sub(" ", text)
+        if text.startswith(" ") and (not lines[-1] or lines[-1].endswith(" ")):
+            text = text[1:]
+        lines[-1] += text
+
+    def __css(self, selector):
+        compiled = self._selectors.get(selector)
+        if compiled is None:
+            compiled = self._selectors[selector] = CSSSelector(selector, translator="html")
+        return compiled
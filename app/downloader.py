@@ -0,0 +1,103 @@
+from requests.adapters import HTTPAdapter
+import requests, os, time, uuid, hashlib, logging
+
+from app.host_scheduler import get_host_scheduler
+from app.logger import get_active_logger
+from app.constants import MAX_REQUEST_BYTE_SIZE
+
+
+class DownloadTooLarge(Exception):
+    """Body is (or would be) over the byte cap; nothing is kept."""
+
+
+class Downloader:
+    """Pooled, streaming file fetcher for one bank. Cookies are seeded once from the browser,
+    bodies stream to a per-call `<dest>.<uuid>.part` with a running size cap + sha256, broken transfers resume with Range."""
+
+    CHUNK_SIZE = 64 * 1024
+    REQUEST_TIMEOUT = (5, 30)
+    RETRIES = 3
+    BACKOFF = 1.0
+
+    def __init__(self, headers=None, max_bytes=MAX_REQUEST_BYTE_SIZE, pool_size=8):
+        self.logger = get_active_logger() or logging.getLogger(__name__)
+        self.MAX_BYTES = max_bytes
+        self.scheduler = get_host_scheduler()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(headers or {})
+        self.session.verify = False
+
+    @classmethod
+    def from_driver(cls, driver, headers=None, **kwargs):
+        #one-time seed: browser cookies (with domain/path) + the browser's user agent
+        downloader = cls(headers=headers, **kwargs)
+        for c in driver.get_cookies():
+            downloader.session.cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+        try:
+            downloader.session.headers.setdefault("User-Agent", driver.execute_script("return navigator.userAgent"))
+        except Exception:
+            pass
+        return downloader
+
+    def close(self):
+        self.session.close()
+
+    def fetch(self, url: str, dest_path: str) -> dict:
+        """Stream `url` to `dest_path`. Returns {"path", "size", "sha256", "status"};
+        `path` is None on a non-2xx answer. Raises DownloadTooLarge over the cap
+        and the requests error once retries are spent."""
+        part_path = f"{dest_path}.{uuid.uuid4().hex}.part" #never shared, even by two fetches of one dest
+        hasher, written, status = hashlib.sha256(), 0, None
+
+        for attempt in range(1, self.RETRIES + 1):
+            headers = {"Range": f"bytes={written}-"} if written else {}
+            self.scheduler.acquire(url)
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=self.REQUEST_TIMEOUT) as r:
+                    status = r.status_code
+                    if status not in (200, 206):
+                        break
+
+                    if written and status == 200: #server ignored Range, start over
+                        hasher, written = hashlib.sha256(), 0
+
+                    expected = r.headers.get("Content-Length")
+                    if expected and expected.isdigit() and written + int(expected) >= self.MAX_BYTES:
+                        raise DownloadTooLarge(f"Content-Length {written + int(expected)} exceeds {self.MAX_BYTES}")
+
+                    with open(part_path, "ab" if written else "wb") as f:
+                        for chunk in r.iter_content(self.CHUNK_SIZE):
+                            if not chunk:
+                                continue
+                            written += len(chunk)
+                            if written >= self.MAX_BYTES:
+                                raise DownloadTooLarge(f"Body passed {self.MAX_BYTES} bytes")
+                            f.write(chunk)
+                            hasher.update(chunk)
+
+                os.replace(part_path, dest_path)
+                return {"path": dest_path, "size": written, "sha256": hasher.hexdigest(), "status": status}
+
+            except DownloadTooLarge:
+                self.__discard(part_path)
+                raise
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                self.logger.warning(f"Download attempt {attempt}/{self.RETRIES} broke at {written} bytes: {type(e).__name__} {e}")
+                if attempt == self.RETRIES:
+                    self.__discard(part_path)
+                    raise
+                time.sleep(self.BACKOFF * attempt)
+
+        self.__discard(part_path)
+        return {"path": None, "size": 0, "sha256": None, "status": status}
+
+    @staticmethod
+    def __discard(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,99 @@
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from urllib.parse import urlparse
+import threading, logging
+
+from app.action_executor import ActionExecutor
+from app.logger import get_active_logger
+
+
+class DriverPool:
+    """Keeps pre-launched uc drivers warm and leases them to BankScraper runs."""
+
+    def __init__(self, download_dir, size=1, max_leases=10, window_size=(900, 700)):
+        self.logger = get_active_logger() or logging.getLogger(__name__)
+        self.DOWNLOAD_DIR = download_dir
+        self.SIZE = max(1, int(size))
+        self.MAX_LEASES = max_leases
+        self.WINDOW_SIZE = window_size
+
+        self._idle = []
+        self._leases = {}  # id(driver) -> times leased
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self):
+        with self._lock:
+            missing = self.SIZE - len(self._idle)
+        for _ in range(missing):
+            driver = self.__launch()
+            with self._lock:
+                self._idle.append(driver)
+        self.logger.info(f"Driver pool warmed with {self.SIZE} driver(s).")
+        return self
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("DriverPool is closed.")
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            driver = self.__launch()
+        with self._lock:
+            self._leases[id(driver)] = self._leases.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver, recycle=False):
+        if driver is None:
+            return
+        with self._lock:
+            used = self._leases.get(id(driver), 0)
+
+        if not recycle and used < self.MAX_LEASES and not self._closed:
+            try:
+                self.__reset(driver)
+                with self._lock:
+                    self._idle.append(driver)
+                return
+            except (InvalidSessionIdException, WebDriverException) as e:
+                self.logger.warning(f"Driver reset failed, recycling: [{type(e).__name__}] {e}")
+
+        self.__discard(driver)
+        self.logger.info(f"Driver recycled after {used} lease(s).")
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self.__discard(driver)
+
+    #Internal
+    def __launch(self):
+        driver = ActionExecutor.build_uc_driver(self.DOWNLOAD_DIR, self.WINDOW_SIZE)
+        with self._lock:
+            self._leases[id(driver)] = 0
+        return driver
+
+    def __discard(self, driver):
+        with self._lock:
+            self._leases.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def __reset(self, driver):
+        # back to one handle, then wipe cookies + storage of the origin it ended on
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        parsed = urlparse(driver.current_url)
+        if parsed.scheme in ("http", "https"):
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.delete_all_cookies()
+        driver.get("about:blank")
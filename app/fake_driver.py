@@ -0,0 +1,345 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.chrome.options import Options
+from selenium import webdriver
+from urllib.parse import urljoin, urlparse
+import os, re, time, base64, threading, itertools, mimetypes, urllib.request, urllib.error
+import lxml.html
+
+from app.dom_snapshot import DomSnapshot
+
+#Offline driver backend. FakeChromeBackend stands in for chromedriver behind a real selenium Remote
+#driver, so WebElement, WebDriverWait, ActionChains and the error types all behave as in production and
+#every command still goes through driver.execute (PROFILE_WEBDRIVER counts the same round trips).
+#Pages come from a FixtureServer (local HTTP stand-in) or any `fetch` callable (RunArchive.fetch replays a
+#recorded run); ActionExecutor.attach_driver takes the driver as is.
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+
+
+class FixtureServer:
+    """Serves in-memory fixtures on 127.0.0.1: {path or path?query: (body, content_type)}; also usable as a context manager."""
+
+    def __init__(self, routes: dict = None, host="127.0.0.1", port=0):
+        self.ROUTES = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = server.ROUTES.get(self.path) or server.ROUTES.get(urlparse(self.path).path) #"/x?id=1" before "/x"
+                if route is None:
+                    self.send_error(404)
+                    return
+                body, content_type = route
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.URL = f"http://{host}:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        for path, route in (routes or {}).items():
+            self.add(path, *route) if isinstance(route, tuple) else self.add(path, route)
+
+    def add(self, path: str, body, content_type: str = None) -> str:
+        content_type = content_type or mimetypes.guess_type(path)[0] or "text/html; charset=utf-8"
+        self.ROUTES[path] = (body.encode("utf-8") if isinstance(body, str) else body, content_type)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        return urljoin(self.URL, path)
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Window:
+    __slots__ = ("HANDLE", "URL", "page", "replaced")
+
+    def __init__(self, handle):
+        self.HANDLE = handle
+        self.URL = "about:blank"
+        self.page = DomSnapshot("", url=self.URL)
+        self.replaced = [] #pages swapped out by Page.setDocumentContent; their elements stay usable until navigation
+
+
+class _WebDriverError(Exception):
+    def __init__(self, error: str, message: str):
+        self.ERROR = error
+        super().__init__(message)
+
+
+class FakeChromeBackend:
+    """The command executor of a fake driver: (command, params) -> W3C style response, all in process.
+    Covers the commands ActionExecutor, DriverPool, readiness and Downloader issue; execute_script
+    only answers the scripts it knows (selenium atoms, the executor's scripts, `scripts` given here)."""
+
+    DOWNLOAD_DELAY = 0.2
+
+    def __init__(self, download_dir=None, scripts=(), latency=0.0, user_agent="Mozilla/5.0 (FakeChrome)", fetch=None):
+        self.DOWNLOAD_DIR = download_dir  # Page.setDownloadBehavior overrides, like Chrome
+        self.FETCH = fetch or self.__http_fetch  # url -> (body, content_type, final url)
+        self.SCRIPTS = set(scripts)       # extra scripts treated as no-ops (generic_actions `scripts`)
+        self.LATENCY = latency            # seconds slept per command, a stand-in for the chromedriver hop
+        self.USER_AGENT = user_agent
+        self.commands = 0
+
+        self._ids = itertools.count(1)
+        self._windows = {}
+        self._current = self.__open_window()
+        self._elements = {}  # element id -> (lxml element, DomSnapshot it came from)
+        self._element_ids = {}  # id(lxml element) -> element id, so a node keeps one id like in Chrome
+        self._pointer = None
+        self._rect = {"x": 0, "y": 0, "width": 1200, "height": 900}
+        self._lock = threading.RLock()
+        self._handlers = {
+            Command.NEW_SESSION: lambda p: {"sessionId": "fake-session", "capabilities": {"browserName": "chrome", "browserVersion": "fake"}},
+            Command.GET: lambda p: self.__navigate(self.window, p["url"]),
+            Command.GET_CURRENT_URL: lambda p: self.window.URL,
+            Command.GET_PAGE_SOURCE: lambda p: DomSnapshot.outer_html(self.window.page.tree),
+            Command.GET_TITLE: lambda p: self.window.page.tree.findtext(".//title") or "",
+            Command.FIND_ELEMENT: lambda p: self.__find(p, single=True),
+            Command.FIND_ELEMENTS: lambda p: self.__find(p, single=False),
+            Command.FIND_CHILD_ELEMENT: lambda p: self.__find(p, single=True, root=self.__element(p["id"])),
+            Command.FIND_CHILD_ELEMENTS: lambda p: self.__find(p, single=False, root=self.__element(p["id"])),
+            Command.W3C_EXECUTE_SCRIPT: self.__execute_script,
+            Command.GET_ELEMENT_TAG_NAME: lambda p: DomSnapshot.tag_name(self.__element(p["id"])),
+            Command.GET_ELEMENT_TEXT: lambda p: DomSnapshot.text(self.__element(p["id"])),
+            Command.GET_ELEMENT_ATTRIBUTE: lambda p: self.__element(p["id"]).get(p["name"]),
+            Command.GET_ELEMENT_PROPERTY: lambda p: self.__property(self.__element(p["id"]), p["name"]),
+            Command.CLICK_ELEMENT: lambda p: self.__click(self.__element(p["id"])),
+            Command.IS_ELEMENT_ENABLED: lambda p: self.__element(p["id"]).get("disabled") is None,
+            Command.IS_ELEMENT_SELECTED: lambda p: self.__element(p["id"]).get("selected") is not None or self.__element(p["id"]).get("checked") is not None,
+            Command.GET_ELEMENT_RECT: lambda p: self.__element(p["id"]) is not None and {"x": 0, "y": 0, "width": 100, "height": 20}, #fixtures have no layout
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: lambda p: self.window.HANDLE,
+            Command.W3C_GET_WINDOW_HANDLES: lambda p: list(self._windows),
+            Command.SWITCH_TO_WINDOW: self.__switch_window,
+            Command.CLOSE: self.__close_window,
+            Command.QUIT: lambda p: None,
+            Command.GET_ALL_COOKIES: lambda p: [],
+            Command.DELETE_ALL_COOKIES: lambda p: None,
+            Command.SET_TIMEOUTS: lambda p: None,
+            Command.SET_WINDOW_RECT: lambda p: self._rect.update({k: v for k, v in p.items() if k in self._rect and v is not None}),
+            Command.GET_WINDOW_RECT: lambda p: dict(self._rect),
+            Command.W3C_MAXIMIZE_WINDOW: lambda p: dict(self._rect),
+            Command.W3C_ACTIONS: self.__actions,
+            Command.W3C_CLEAR_ACTIONS: lambda p: None,
+            "executeCdpCommand": self.__cdp,
+        }
+
+    @property
+    def window(self) -> _Window:
+        if self._current not in self._windows:
+            raise _WebDriverError("no such window", "no such window: target window already closed")
+        return self._windows[self._current]
+
+    def execute(self, command, params=None):
+        params = {k: v for k, v in (params or {}).items() if k != "sessionId"}
+        if self.LATENCY:
+            time.sleep(self.LATENCY)
+        with self._lock:
+            self.commands += 1
+            handler = self._handlers.get(command)
+            try:
+                if handler is None:
+                    raise _WebDriverError("unknown command", f"FakeChromeBackend does not implement {command}")
+                return {"value": handler(params)}
+            except _WebDriverError as e: #selenium's ErrorHandler maps the W3C error name to the exception
+                return {"status": e.ERROR, "value": {"error": e.ERROR, "message": str(e), "stacktrace": ""}}
+
+    def close(self):
+        pass
+
+    #Navigation
+    def __open_window(self) -> str:
+        handle = f"fake-window-{next(self._ids)}"
+        self._windows[handle] = _Window(handle)
+        return handle
+
+    def __navigate(self, window, url):
+        url = urljoin(window.URL, url) if window.URL.startswith("http") else url
+        try:
+            body, content_type, final_url = self.FETCH(url)
+        except (urllib.error.URLError, ValueError, LookupError) as e:
+            raise _WebDriverError("unknown error", f"net::ERR_FAILED loading {url}: {e}")
+
+        if "html" not in content_type.lower():
+            self.__download(final_url, body) #pdf/csv/... go to the download folder, the page stays
+            if window.URL == "about:blank": #a fresh tab opened on the file shows its url
+                window.URL = final_url
+            return None
+        window.URL = final_url
+        window.replaced = []
+        charset = re.search(r"charset=([\w-]+)", content_type)
+        window.page = DomSnapshot(body.decode(charset.group(1) if charset else "utf-8", "replace"), url=final_url)
+        return None
+
+    def __http_fetch(self, url):
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"User-Agent": self.USER_AGENT}), timeout=30) as r:
+            return r.read(), r.headers.get("Content-Type", "text/html"), r.geturl()
+
+    def __download(self, url, body):
+        #lands DOWNLOAD_DELAY after the navigation returns, as Chrome's does; _wait_for_download relies on that
+        if self.DOWNLOAD_DIR:
+            timer = threading.Timer(self.DOWNLOAD_DELAY, self.__save_download, (self.DOWNLOAD_DIR, url, body))
+            timer.daemon = True
+            timer.start()
+
+    @staticmethod
+    def __save_download(download_dir, url, body):
+        name = os.path.basename(urlparse(url).path) or "download"
+        stem, ext = os.path.splitext(name)
+        path = os.path.join(download_dir, name)
+        for copy in itertools.count(1):
+            if not os.path.exists(path):
+                break
+            path = os.path.join(download_dir, f"{stem} ({copy}){ext}")
+        with open(path, "wb") as f:
+            f.write(body)
+
+    def __click(self, elem):
+        href = elem.get("href") if DomSnapshot.tag_name(elem) == "a" else None
+        if not href or href.startswith(("#", "javascript:")):
+            return None #in-page widgets (tabs, toggles) keep the current document
+        href = urljoin(self.window.URL, href)
+        if elem.get("target") == "_blank":
+            return self.__navigate(self._windows[self.__open_window()], href)
+        return self.__navigate(self.window, href)
+
+    def __switch_window(self, params):
+        if params["handle"] not in self._windows:
+            raise _WebDriverError("no such window", f"no such window: {params['handle']}")
+        self._current = params["handle"]
+
+    def __close_window(self, params):
+        self._windows.pop(self.window.HANDLE)
+        return list(self._windows)
+
+    #Elements
+    def __wrap(self, elem, page) -> dict:
+        element_id = self._element_ids.get(id(elem))
+        if element_id is None or self._elements[element_id][0] is not elem:
+            element_id = f"fake-element-{next(self._ids)}"
+            self._element_ids[id(elem)] = element_id
+            self._elements[element_id] = (elem, page)
+        return {ELEMENT_KEY: element_id}
+
+    def __element(self, element_id):
+        if isinstance(element_id, dict):
+            element_id = element_id[ELEMENT_KEY]
+        if element_id not in self._elements:
+            raise _WebDriverError("no such element", f"no such element: unknown id {element_id}")
+        elem, page = self._elements[element_id]
+        if all(window.page is not page and page not in window.replaced for window in self._windows.values()):
+            raise _WebDriverError("stale element reference", "stale element reference: element is not attached to the page document")
+        return elem
+
+    def __find(self, params, single, root=None):
+        page = self.window.page
+        try:
+            found = page.find_elements(params["using"], params["value"], root=root)
+        except Exception as e: #bad selector syntax, like chromedriver's invalid selector
+            raise _WebDriverError("invalid selector", f"invalid selector: {params['value']}: {e}")
+        if root is not None:
+            found = [elem for elem in found if elem is not root] #child lookups never match the element itself
+        if single:
+            if not found:
+                raise _WebDriverError("no such element", f"no such element: Unable to locate element: {params}")
+            return self.__wrap(found[0], page)
+        return [self.__wrap(elem, page) for elem in found]
+
+    def __property(self, elem, name):
+        if name == "outerHTML":
+            return DomSnapshot.outer_html(elem)
+        if name == "innerHTML":
+            return DomSnapshot.inner_html(elem)
+        if name == "innerText":
+            return DomSnapshot.text(elem)
+        if name == "textContent":
+            return elem.text_content()
+        if name in ("href", "src") and elem.get(name):
+            return urljoin(self.window.URL, elem.get(name))
+        if name == "tagName":
+            return DomSnapshot.tag_name(elem).upper()
+        return elem.get(name)
+
+    #Scripts
+    def __execute_script(self, params):
+        script, args = params["script"], params.get("args") or []
+        if script.startswith("/* getAttribute */"):
+            elem, name = self.__element(args[0]), args[1]
+            value = elem.get(name)
+            return self.__property(elem, name) if value is None or name in ("href", "src") else value
+        if script.startswith("/* isDisplayed */"):
+            return self.__element(args[0]).get("hidden") is None
+        if "const [by, value, multiple, tableOnly, n, maxLen] = arguments;" in script: #BATCH_TABLE_SCRIPT
+            by, value, multiple, table_only, n = args[:5]
+            page = self.window.page
+            elements = page.find_elements(by, value)
+            elements = elements if multiple else elements[:1]
+            if table_only:
+                elements = [elem for elem in elements if DomSnapshot.tag_name(elem) == "table"]
+            out = []
+            for elem in elements:
+                labels = page.preceding_texts(elem, n)
+                out.append({"html": DomSnapshot.outer_html(elem), "labels": [] if labels == ["No label found"] * n else labels[::-1]})
+            return out
+        if "window.__scrapeReady" in script: #readiness OBSERVER_SCRIPT: a fixture page is settled at once
+            return {"netIdle": 1e9, "domIdle": 1e9, "assets": True}
+        if script == "return document.readyState":
+            return "complete"
+        if script in ("return document.body.scrollHeight", "return document.body.scrollWidth"):
+            return 1000
+        if script == "return navigator.userAgent":
+            return self.USER_AGENT
+        if script == "arguments[0].click();":
+            return self.__click(self.__element(args[0]))
+        if "scrollIntoView" in script or script.startswith("window.scrollTo") or "style.zoom" in script:
+            return None
+        if script in self.SCRIPTS:
+            return None
+        raise _WebDriverError("javascript error", f"FakeChromeBackend has no stand-in for script: {script[:80]!r}")
+
+    def __actions(self, params):
+        #pointer sequences only: a pointerUp clicks whatever the last pointerMove targeted
+        for source in params.get("actions", []):
+            for action in source.get("actions", []):
+                origin = action.get("origin")
+                if action.get("type") == "pointerMove" and isinstance(origin, dict) and ELEMENT_KEY in origin:
+                    self._pointer = origin[ELEMENT_KEY]
+                elif action.get("type") == "pointerUp" and self._pointer:
+                    self.__click(self.__element(self._pointer))
+
+    def __cdp(self, params):
+        cmd, args = params["cmd"], params.get("params") or {}
+        if cmd == "Page.setDownloadBehavior":
+            self.DOWNLOAD_DIR = args.get("downloadPath", self.DOWNLOAD_DIR)
+        elif cmd == "Page.setDocumentContent": #replay: the DOM page scripts had rendered, swapped in place
+            self.window.replaced.append(self.window.page)
+            self.window.page = DomSnapshot(args["html"], url=self.window.URL)
+        elif cmd == "Page.captureScreenshot":
+            return {"data": base64.b64encode(lxml.html.tostring(self.window.page.tree)).decode()}
+        elif cmd == "Page.printToPDF":
+            return {"data": base64.b64encode(MINIMAL_PDF).decode()}
+        return {}
+
+
+def create_fake_driver(download_dir=None, scripts=(), latency=0.0, fetch=None) -> webdriver.Remote:
+    """Selenium Remote driver over a FakeChromeBackend; quit() works like on a real one."""
+    backend = FakeChromeBackend(download_dir=download_dir, scripts=scripts, latency=latency, fetch=fetch)
+    return webdriver.Remote(command_executor=backend, options=Options())
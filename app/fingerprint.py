@@ -0,0 +1,67 @@
+import hashlib
+
+from app.blob_store import BlobStore, get_blob_store
+from app.constants import FINGERPRINT_ALGO
+
+#packet["hash"] is the CAPTURE_ALGO digest of the raw payload (computed once at capture);
+#any other algorithm is computed on first use and memoized here, keyed by that capture hash,
+#so packets keep their exported shape
+CAPTURE_ALGO = FINGERPRINT_ALGO
+MEMO_SIZE = 65536
+_MEMO = {} #(capture hash, algo) -> digest
+ALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "sha1": hashlib.sha1,
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+    "md5": hashlib.md5,
+}
+
+
+def new_hasher(algo: str = CAPTURE_ALGO):
+    if algo not in ALGORITHMS:
+        raise ValueError(f"Unknown fingerprint algorithm: {algo}")
+    return ALGORITHMS[algo]()
+
+
+def digest_text(text: str, algo: str = CAPTURE_ALGO) -> str:
+    hasher = new_hasher(algo)
+    hasher.update(text.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def digest_value(value, algo: str = CAPTURE_ALGO) -> str:
+    """Raw-payload digest: blob refs hash the stored bytes (mmap, no copy), text hashes its utf-8."""
+    if BlobStore.is_ref(value):
+        hasher = new_hasher(algo)
+        with get_blob_store().open(value) as mm:
+            hasher.update(mm if hasattr(mm, "size") else mm.read())
+        return hasher.hexdigest()
+    return digest_text(value, algo)
+
+
+def capture_hash(value):
+    """packet["hash"] at capture; blobs are already sha256-addressed."""
+    if CAPTURE_ALGO == "sha256" and BlobStore.is_ref(value):
+        return value[len(BlobStore.PREFIX):]
+    return digest_value(value)
+
+
+def fingerprint(packet: dict, algo: str = CAPTURE_ALGO):
+    """Digest of packet["value"], computed at most once per payload and algorithm (copies of a
+    packet share it through the capture hash)."""
+    value = packet.get("value")
+    if not value:
+        return None
+    captured = packet.get("hash")
+    if not captured:
+        return digest_value(value, algo)
+    if algo == CAPTURE_ALGO:
+        return captured
+
+    key = (captured, algo)
+    digest = _MEMO.get(key)
+    if digest is None:
+        if len(_MEMO) >= MEMO_SIZE:
+            _MEMO.clear()
+        digest = _MEMO[key] = digest_value(value, algo)
+    return digest
@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+import traceback, logging
+import undetected_chromedriver as uc
+
+from app.BankScraper import BankScraper
+from app.action_executor import ActionExecutor
+from app.driver_pool import DriverPool
+from app.utils import Helper
+from app.logger import setup_logger, set_active_logger, get_active_logger, start_process_log_listener, stop_process_log_listener
+from app.constants import LOG_DIR
+from app.spans import span, span_tags, get_span_recorder
+
+
+_WORKER_POOL = None
+_LOG_QUEUE = None #fleet workers forward records to the parent's listener
+_SHIP_SPANS = False #fleet workers return their timing spans with each bank result
+
+
+def _make_driver_pool(paths, max_leases):
+    download_dir = Helper.create_dir(paths["output"], paths["folders"]["data"])
+    return DriverPool(download_dir, size=1, max_leases=max_leases)
+
+
+def _init_worker(paths=None, max_leases=0, log_queue=None):
+    global _WORKER_POOL, _LOG_QUEUE, _SHIP_SPANS
+    _LOG_QUEUE = log_queue
+    _SHIP_SPANS = True
+    # uc patches the chromedriver binary on launch, workers share the pre-patched copy
+    ActionExecutor.USER_MULTI_PROCS = True
+    if paths and max_leases:
+        _WORKER_POOL = _make_driver_pool(paths, max_leases)
+        Finalize(_WORKER_POOL, _WORKER_POOL.close, exitpriority=10)
+
+
+def _scrape_bank(code, bank_params, paths, log_dir=LOG_DIR, driver_pool=None):
+    logger = setup_logger(name=f"scraper_{code}", log_dir=log_dir, queue=_LOG_QUEUE)
+    previous = get_active_logger() #serial mode runs in the caller's process, hand its logger back after
+    set_active_logger(logger)
+    try:
+        with span_tags(bank=code), span("bank"):
+            try:
+                scraper = BankScraper(bank_params, paths, driver_pool=driver_pool or _WORKER_POOL)
+                result = scraper.run()
+            except Exception as e:
+                logger.error(f"Failed scraping {code}: {e}")
+                logger.debug(f"Traceback:\n{traceback.format_exc()}")
+                result = {"bank_code": code, "scraped_data": [{"error": str(e)}]}
+    finally:
+        set_active_logger(previous)
+    result["bank_key"] = code #param_table key; bank_code (bank_type_code) isn't unique across banks
+    result = BankScraper.dedupe_responses(result)
+    if _SHIP_SPANS:
+        result["_spans"] = get_span_recorder().drain() #parent pops these back into its own recorder
+    return result
+
+
+class FleetRunner:
+    """Spreads BankScraper.run() over worker processes, each with its own Chrome/logger."""
+
+    def __init__(self, config, paths, workers=1, log_dir=LOG_DIR, driver_leases=10):
+        self.CONFIG = config
+        self.PATHS = paths
+        self.WORKERS = max(1, int(workers))
+        self.DRIVER_LEASES = driver_leases # 0 -> fresh Chrome per bank, no warm pool
+        self.LOG_DIR = log_dir
+        self.logger = get_active_logger() or logging.getLogger(__name__)
+
+    def run(self, bank_codes: list) -> list:
+        results = {result["bank_key"]: result for result in self.stream(bank_codes)}
+        return [results[code] for code in bank_codes if code in results]
+
+    def stream(self, bank_codes: list):
+        """Yield each bank's result as soon as it finishes (completion order in fleet mode)."""
+        codes = [code for code in bank_codes if code in self.CONFIG]
+        skipped = [code for code in bank_codes if code not in self.CONFIG]
+        if skipped:
+            self.logger.warning(f"Bank code(s) not in config, skipping: {skipped}")
+        if not codes:
+            return
+
+        if self.WORKERS == 1 or len(codes) == 1:
+            yield from self.__run_serial(codes)
+        else:
+            yield from self.__run_pool(codes)
+
+    def __run_serial(self, codes):
+        pool = _make_driver_pool(self.PATHS, self.DRIVER_LEASES) if self.DRIVER_LEASES else None
+        try:
+            # no cooldown between banks, same-host hits are spaced by the HostScheduler
+            for code in codes:
+                yield _scrape_bank(code, self.CONFIG[code], self.PATHS, self.LOG_DIR, driver_pool=pool)
+        finally:
+            if pool:
+                pool.close()
+
+    def __run_pool(self, codes):
+        workers = min(self.WORKERS, len(codes))
+        self.logger.notice(f"Fleet mode: {len(codes)} bank(s) over {workers} worker(s).")
+        uc.Patcher().auto()
+
+        log_queue = start_process_log_listener(self.LOG_DIR) #one writer for every worker's log files + console
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.PATHS, self.DRIVER_LEASES, log_queue)) as pool:
+                futures = {pool.submit(_scrape_bank, code, self.CONFIG[code], self.PATHS, self.LOG_DIR): code for code in codes}
+                for future in as_completed(futures):
+                    code = futures[future]
+                    try:
+                        result = future.result()
+                        get_span_recorder().extend(result.pop("_spans", None))
+                        self.logger.save(f"Fleet: {code} finished.")
+                    except Exception as e:
+                        self.logger.error(f"Fleet worker crashed on {code}: [{type(e).__name__}] {e}")
+                        result = {"bank_code": code, "bank_key": code, "scraped_data": [{"error": str(e)}]}
+                    yield result
+        finally:
+            stop_process_log_listener()
@@ -0,0 +1,72 @@
+from urllib.parse import urlparse
+import threading, time
+
+from app.constants import CONFIG
+
+
+class HostScheduler:
+    """Token bucket per host. Hits to different hosts never wait on each other,
+    repeat hits to the same host are spaced out by that host's `rate` (hits/sec) and `burst`."""
+
+    DEFAULT_LIMIT = {"rate": 0.5, "burst": 2}
+
+    def __init__(self, limits: dict = None):
+        limits = dict(limits or {})
+        self.DEFAULT = {**self.DEFAULT_LIMIT, **limits.pop("default", {})}
+        self.LIMITS = {self.__host_key(host): limit for host, limit in limits.items()}
+        self._buckets = {}  # host -> [tokens, last_refill, rate, burst]
+        self._lock = threading.Lock()
+
+    def configure(self, url_or_host: str, rate=None, burst=None):
+        host = self.__host_key(url_or_host)
+        if not host:
+            return
+        limit = {**self.DEFAULT, **self.LIMITS.get(host, {})}
+        if rate is not None: limit["rate"] = rate
+        if burst is not None: limit["burst"] = burst
+        with self._lock:
+            self.LIMITS[host] = limit
+            self._buckets.pop(host, None)
+
+    def acquire(self, url: str, cost: float = 1) -> float:
+        """Block until `url`'s host has a token, returns seconds waited."""
+        host = self.__host_key(url)
+        if not host:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                limit = {**self.DEFAULT, **self.LIMITS.get(host, {})}
+                bucket = self._buckets[host] = [float(limit["burst"]), now, float(limit["rate"]), float(limit["burst"])]
+
+            tokens, last, rate, burst = bucket
+            tokens = min(burst, tokens + (now - last) * rate) - cost  # reserve now, may go negative (queued)
+            bucket[0], bucket[1] = tokens, now
+            wait = -tokens / rate if tokens < 0 and rate > 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    @staticmethod
+    def __host_key(url_or_host: str) -> str:
+        if not url_or_host:
+            return ""
+        if "//" not in url_or_host:
+            return url_or_host.lower()
+        parsed = urlparse(url_or_host)
+        return (parsed.hostname or "").lower() if parsed.scheme in ("http", "https") else ""
+
+
+# --- Process-wide scheduler ---
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_host_scheduler() -> HostScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = HostScheduler(CONFIG.get("HOST_LIMITS"))
+        return _scheduler
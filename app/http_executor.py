@@ -0,0 +1,156 @@
+from requests.adapters import HTTPAdapter
+import requests, logging, pprint, re
+
+from app.action_executor import ActionExecutorHelper
+from app.dom_snapshot import DomSnapshot
+from app.host_scheduler import get_host_scheduler
+from app.logger import get_active_logger, lazy_pformat
+from app.action_config import ActionConfig, compile_blocks
+from app.constants import GENERIC_ACTION_CONFIG
+from app.spans import span, span_tags
+from app.readiness import PageReady
+
+
+class BrowserFallback(Exception):
+    """Raised when a page can't be served over plain HTTP and needs the Selenium path."""
+
+
+class HttpExecutor:
+    """HTTP-first fast path: fetches server-rendered pages with a pooled session and runs
+    the read-only extractors (table/html/scrape) on the parsed HTML."""
+
+    STATIC_ACTIONS = {"website", "table", "html", "scrape"}
+    CHALLENGE_MARKERS = (
+        "cf-chl", "challenge-platform", "just a moment", "attention required",
+        "captcha", "_incapsula_resource", "access denied", "request unsuccessful",
+        "please enable javascript", "enable javascript and cookies",
+    )
+    CHALLENGE_STATUS = {401, 403, 429, 503}
+    REQUEST_TIMEOUT = (5, 20)
+    META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+
+    def __init__(self, params=None, recorder=None, archive=None):
+        self.logger = get_active_logger() or logging.getLogger(__name__)
+        self.PARAMS = params or {}
+        self.scheduler = get_host_scheduler()
+        self.snapshot = None
+        self.recorder = recorder #RunRecorder, every fetched page goes in
+
+        self.session = requests.Session()
+        adapter = archive.adapter() if archive else HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.PARAMS.get("headers", {}))
+
+    @staticmethod
+    def resolve_blocks(block) -> tuple:
+        return compile_blocks(block, GENERIC_ACTION_CONFIG)
+
+    @classmethod
+    def is_eligible(cls, block) -> bool:
+        """Auto-detect: only pages driven purely by navigation + read-only extractors qualify."""
+        plan = cls.resolve_blocks(block)
+        return bool(plan) and all(act.ACTION in cls.STATIC_ACTIONS for act in plan)
+
+    def close(self):
+        self.session.close()
+
+    def fetch(self, url: str) -> DomSnapshot:
+        self.scheduler.acquire(url)
+        try:
+            with span("page_load", url=url, via="http"):
+                r = self.session.get(url, timeout=self.REQUEST_TIMEOUT, verify=False)
+        except requests.RequestException as e:
+            raise BrowserFallback(f"GET {url} failed: {type(e).__name__} {e}")
+
+        if r.status_code in self.CHALLENGE_STATUS or r.status_code >= 400:
+            raise BrowserFallback(f"GET {url} returned {r.status_code}")
+        if "html" not in r.headers.get("Content-Type", "text/html").lower():
+            raise BrowserFallback(f"GET {url} is not html: {r.headers.get('Content-Type')}")
+
+        if "charset" not in r.headers.get("Content-Type", "").lower():
+            #requests falls back to ISO-8859-1 for text/html (the rupee sign turns to mojibake); the browser
+            #goes by <meta charset>, then sniffs
+            declared = self.META_CHARSET.search(r.content[:4096])
+            r.encoding = declared.group(1).decode("ascii") if declared else r.apparent_encoding
+        head = r.text[:20000].lower()
+        marker = next((m for m in self.CHALLENGE_MARKERS if m in head), None)
+        if marker:
+            raise BrowserFallback(f"Bot challenge suspected on {url} ({marker!r})")
+
+        self.logger.notice(f"[HTTP] Fetched {r.url} ({len(r.content)} bytes)")
+        if self.recorder:
+            self.recorder.add(r.url, r.content, r.headers.get("Content-Type", "text/html"), r.status_code, kind="http")
+        self.snapshot = DomSnapshot(r.text, url=r.url)
+        return self.snapshot
+
+    def execute_blocks(self, block, base_url: str) -> list:
+        block_data = []
+        self.fetch(base_url)
+        for act in self.resolve_blocks(block):
+            data = self.execute(act)
+            if data:
+                block_data.append(data)
+        return block_data
+
+    def execute(self, _action_):
+        act = _action_ if isinstance(_action_, ActionConfig) else ActionConfig.from_dict(_action_, GENERIC_ACTION_CONFIG)
+        with span_tags(action=act.ACTION, selector=act.VALUE), span("action", via="http"):
+            return self.__execute(act)
+
+    def __execute(self, act):
+        if act.ACTION == "website":
+            self.logger.info(f"[HTTP] Redirecting to webpage {act.URL}")
+            self.fetch(act.URL)
+            return ActionExecutorHelper._action_packet_(act.ACTION, self.snapshot.URL, act.LOG_MESSAGE,
+                [{"error_type": "NoneType", "error_message": "No content extracted from action.", "error_from": "ActionExecutor.execute"}])
+
+        if act.SKIP_IF_NOT_FOUND and not self.__probe(act): #optional block, skipped like the browser path does
+            return ActionExecutorHelper._action_packet_(act.ACTION, self.snapshot.URL, act.LOG_MESSAGE,
+                [{"status": "skipped", "error_message": f"Not found, skipped: {act.VALUE}", "error_from": "ActionExecutor.execute"}])
+
+        if act.WAIT_UNTIL and not isinstance(act.CONDITION, PageReady):
+            if not self.snapshot.find_elements(act.WAIT_BY, act.WAIT_VALUE):
+                raise BrowserFallback(f"Wait target missing in static html: {act.WAIT_VALUE}")
+
+        if not self.snapshot.find_elements(act.BY, act.VALUE):
+            raise BrowserFallback(f"Selector missing in static html: {act.BY}={act.VALUE}")
+
+        self.logger.notice(f"[HTTP] Performing _action_: {act.ACTION} on {act.VALUE}")
+        if act.ACTION == "table":
+            content = self.__table(act)
+        elif act.ACTION == "html":
+            content = self.__html(act)
+        else:
+            content = self.__scrape(act)
+
+        if not content:
+            content = [{"error_type": "NoneType", "error_message": "No content extracted from action.", "error_from": "ActionExecutor.execute"}]
+        return ActionExecutorHelper._action_packet_(act.ACTION, self.snapshot.URL, act.LOG_MESSAGE, content)
+
+    def __probe(self, act) -> bool:
+        #same target as ActionExecutor.__probe: the wait target when there is one, else the selector
+        by, value = (act.WAIT_BY, act.WAIT_VALUE) if act.WAIT_UNTIL and not isinstance(act.CONDITION, PageReady) else (act.BY, act.VALUE)
+        return not value or bool(self.snapshot.find_elements(by, value))
+
+    #Extractors
+    def __table(self, act):
+        scrape_content = []
+        for idx, (raw_html, header) in enumerate(self.snapshot.tables(act.BY, act.VALUE, act.MULTIPLE)):
+            if act.CLEAN_TABLE:
+                with span("clean_table"):
+                    final_html = ActionExecutorHelper._clean_raw_table_html_(raw_html)
+            else:
+                final_html = raw_html
+            scrape_content.append(ActionExecutorHelper._resp_packet_(name=f"{act.TABLE_NAME}_{idx}", value=final_html, header=header, type="table_html"))
+        return scrape_content
+
+    def __html(self, act):
+        htmls = self.snapshot.htmls(act.BY, act.VALUE, act.MULTIPLE)
+        return [ActionExecutorHelper._resp_packet_(name=f"{act.HTML_NAME}_{idx}", value=html_content, header="HTML DOESNT HAVE HEADER", type="html")
+                for idx, html_content in enumerate(htmls) if html_content]
+
+    def __scrape(self, act):
+        data_container = self.snapshot.scrape(act.BY, act.VALUE, fields=dict(act.SCRAPE_FIELDS), attribute=act.ATTRIBUTE)
+        self.logger.info("[HTTP] Scraped Content:\n%s", lazy_pformat(data_container))
+        return data_container
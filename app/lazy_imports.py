@@ -0,0 +1,85 @@
+import importlib, threading
+
+#Heavy optional stacks (PDF / OCR / Office / DataFrames). Modules bind these proxies at import time,
+#the real import happens on first attribute access or call, once per process.
+HEAVY_MODULES = {
+    "pandas": "pandas",
+    "pdfplumber": "pdfplumber",
+    "ocrmypdf": "ocrmypdf",
+    "tabula": "tabula",
+    "camelot": "camelot",
+    "pdf2docx": "pdf2docx",
+    "docx": "docx",
+    "openpyxl.styles": "openpyxl.styles",
+    "openpyxl.formatting.rule": "openpyxl.formatting.rule",
+    "openpyxl.utils.dataframe": "openpyxl.utils.dataframe",
+}
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load(name: str):
+    """Import a registered module (or return it if already loaded)."""
+    module = _loaded.get(name)
+    if module is None:
+        if name not in HEAVY_MODULES:
+            raise KeyError(f"{name} is not a registered lazy module")
+        with _lock:
+            module = _loaded.get(name)
+            if module is None:
+                module = _loaded[name] = importlib.import_module(HEAVY_MODULES[name])
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    return name in _loaded
+
+
+class LazyModule:
+    """Stand-in for `import x`; `x.attr` imports x on first use."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(load(self._name), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name}{'' if is_loaded(self._name) else ' (not loaded)'}>"
+
+
+class LazyAttr:
+    """Stand-in for `from x import Name`; resolved on first call or attribute access."""
+
+    __slots__ = ("_module", "_attr")
+
+    def __init__(self, module: str, attr: str):
+        self._module = module
+        self._attr = attr
+
+    def resolve(self):
+        return getattr(load(self._module), self._attr)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._module}.{self._attr}>"
+
+
+def lazy(name: str) -> LazyModule:
+    if name not in HEAVY_MODULES:
+        raise KeyError(f"{name} is not a registered lazy module")
+    return LazyModule(name)
+
+
+def lazy_attr(module: str, attr: str) -> LazyAttr:
+    if module not in HEAVY_MODULES:
+        raise KeyError(f"{module} is not a registered lazy module")
+    return LazyAttr(module, attr)
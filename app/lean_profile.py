@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+
+#Lean page profile: Network.setBlockedURLs patterns so a bank's pages load without images, fonts, media
+#and third-party analytics/chat widgets. Table and PDF scraping never needs them; screenshot/pdf actions
+#do, so a bank whose plan renders pages loads in full unless it sets `lean` itself.
+#CDP blocking is per tab: windows opened by a click load in full.
+
+RESOURCE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "m4a", "mov"),
+    "stylesheet": ("css",), #opt-in only: visibility waits and tablists depend on css
+}
+DEFAULT_TYPES = ("image", "font", "media")
+TRACKER_URLS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*connect.facebook.net*",
+    "*hotjar.com*", "*clarity.ms*", "*adobedtm.com*", "*omtrdc.net*", "*webengage.com*", "*moengage.com*",
+    "*tawk.to*", "*livechatinc.com*", "*yellowmessenger.com*", "*haptikapi.com*", "*youtube.com/embed*",
+    "*player.vimeo.com*",
+)
+RENDER_ACTIONS = {"screenshot", "pdf", "redir_pdf"}
+
+
+def renders(plan) -> bool:
+    """True when a compiled plan (steps included) screenshots or prints a page."""
+    return any(act.ACTION in RENDER_ACTIONS or renders(act.STEPS) for act in plan)
+
+
+@dataclass(frozen=True, slots=True)
+class LeanProfile:
+    """Blocked url patterns for one bank; empty means full page loads."""
+    BLOCKED_URLS: tuple = ()
+
+    @classmethod
+    def from_params(cls, params: dict, plan=(), default: bool = False) -> "LeanProfile":
+        """Bank key `lean`: true (defaults) | false | {types, urls, trackers}. Unset: `default`, except for
+        banks whose plan renders pages."""
+        lean = params.get("lean")
+        if lean is None:
+            lean = default and not renders(plan)
+        if not lean:
+            return cls()
+
+        spec = lean if isinstance(lean, dict) else {}
+        urls = [f"*.{ext}{tail}" for kind in spec.get("types", DEFAULT_TYPES)
+                for ext in RESOURCE_EXTENSIONS[kind] for tail in ("", "?*")]
+        if spec.get("trackers", True):
+            urls += TRACKER_URLS
+        urls += spec.get("urls", [])
+        return cls(BLOCKED_URLS=tuple(dict.fromkeys(urls)))
+
+    def apply(self, driver):
+        """Set (or with an empty profile, clear) the driver's blocked urls; pooled drivers need the clear."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(self.BLOCKED_URLS)})
+
+
+def check_lean(lean, where: str, problems: list):
+    """config_cache validation of a bank's `lean` key."""
+    if lean is None or isinstance(lean, bool):
+        return
+    if not isinstance(lean, dict):
+        problems.append(f"{where}: expected true, false or {{types, urls, trackers}}")
+        return
+    unknown = [kind for kind in lean.get("types", []) if kind not in RESOURCE_EXTENSIONS]
+    if unknown:
+        problems.append(f"{where}.types: unknown {', '.join(map(str, unknown))} (known: {', '.join(RESOURCE_EXTENSIONS)})")
+    if not isinstance(lean.get("urls", []), list):
+        problems.append(f"{where}.urls: expected a list of url patterns")
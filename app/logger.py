@@ -1,8 +1,13 @@
 import logging
 import os
 import sys
+import atexit
+import pprint
+import queue as _queue
+import threading
+import multiprocessing
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # --- Optional ColorLog Support ---
 try:
@@ -59,11 +64,115 @@ def _get_formatter(use_color=False):
         )
     return logging.Formatter(DEFAULT_FORMAT, datefmt=DATE_FORMAT)
 
-def _add_console_handler(logger, level, use_color=True):
-    handler = colorlog.StreamHandler(sys.stdout) if use_color and COLORLOG_AVAILABLE else logging.StreamHandler(sys.stdout)
-    handler.setFormatter(_get_formatter(use_color))
-    handler.setLevel(level)
-    logger.addHandler(handler)
+# --- Lazy Payloads ---
+class LazyFormat:
+    """Log arg rendered only if a handler accepts the record: logger.info("Data:\n%s", lazy_pformat(data))."""
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+def lazy_pformat(obj):
+    return LazyFormat(pprint.pformat, obj)
+
+# --- Handlers ---
+def _build_handlers(name, log_dir, log_level, to_console=True, to_file=True, use_color=True):
+    handlers = []
+    if to_file:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+        file_path = os.path.join(log_dir, f"{name}_{timestamp}.log")
+        file_handler = logging.FileHandler(file_path, encoding='utf-8')
+        file_handler.setFormatter(_get_formatter(use_color=False))
+        file_handler.setLevel(TRACE_LEVEL_NUM)
+        handlers.append(file_handler)
+
+    if to_console:
+        handler = colorlog.StreamHandler(sys.stdout) if use_color and COLORLOG_AVAILABLE else logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_get_formatter(use_color))
+        handler.setLevel(log_level)
+        handlers.append(handler)
+    return handlers
+
+# --- Queued Logging (file/console I/O on a listener thread) ---
+QUEUED_LOGGING = True
+
+class _RouteHandler(logging.Handler):
+    """Listener-side sink: each record goes to the file/console handlers of its logger name.
+    Names first seen from child processes get handlers built from `defaults`."""
+
+    def __init__(self):
+        super().__init__()
+        self.routes = {}
+        self.defaults = None #(log_dir, log_level, use_color)
+        self._routes_lock = threading.Lock()
+
+    def add_route(self, name, handlers):
+        with self._routes_lock:
+            self.routes[name] = handlers
+
+    def emit(self, record):
+        handlers = self.routes.get(record.name)
+        if handlers is None:
+            if not self.defaults:
+                return
+            with self._routes_lock:
+                handlers = self.routes.get(record.name)
+                if handlers is None:
+                    log_dir, log_level, use_color = self.defaults
+                    handlers = self.routes[record.name] = _build_handlers(record.name, log_dir, log_level, use_color=use_color)
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self):
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.close()
+        super().close()
+
+class _LocalQueueHandler(QueueHandler):
+    """In-process queue: the record is handed over unformatted, so %-merging and LazyFormat payloads
+    render on the listener thread instead of the caller's (stock prepare() formats before enqueueing).
+    Args are rendered after the call returns: log copies, not objects you go on mutating."""
+
+    def prepare(self, record):
+        return record
+
+_router = _RouteHandler()
+_listeners = {} #"local" -> (queue, listener) for this process, "fleet" -> child-process queue
+_listener_lock = threading.Lock()
+
+def _start_listener(key, log_queue):
+    with _listener_lock:
+        if key not in _listeners:
+            listener = QueueListener(log_queue, _router)
+            listener.start()
+            _listeners[key] = (log_queue, listener)
+            if len(_listeners) == 1:
+                atexit.register(stop_log_listeners)
+        return _listeners[key][0]
+
+def start_process_log_listener(log_dir="logs", log_level=logging.DEBUG, use_color=True):
+    """Parent side of fleet logging: returns a queue for setup_logger(queue=...) in worker processes;
+    their records are written here, one writer per log file."""
+    os.makedirs(log_dir, exist_ok=True)
+    _router.defaults = (log_dir, log_level, use_color)
+    return _start_listener("fleet", multiprocessing.Queue())
+
+def stop_process_log_listener():
+    """Flush and stop the fleet listener once the worker processes are done."""
+    stop_log_listeners("fleet")
+
+def stop_log_listeners(*keys):
+    """Drain and stop the given listeners (all by default), flushing pending records."""
+    with _listener_lock:
+        listeners = [_listeners.pop(key) for key in (keys or list(_listeners)) if key in _listeners]
+    for _, listener in listeners:
+        listener.stop()
 
 # --- Generic Logger Setup ---
 def setup_logger(
@@ -72,8 +181,12 @@ def setup_logger(
     log_level=logging.DEBUG,
     to_console=True,
     to_file=True,
-    use_color=True
+    use_color=True,
+    queued=None,
+    queue=None
 ):
+    """queued: hand records to a listener thread instead of writing inline (default QUEUED_LOGGING).
+    queue: a start_process_log_listener() queue; the logger only forwards records to the parent."""
     os.makedirs(log_dir, exist_ok=True)
     logger = logging.getLogger(name)
     if logger.hasHandlers():
@@ -81,16 +194,19 @@ def setup_logger(
     logger.setLevel(log_level)
     logger.propagate = False
 
-    if to_file:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        file_path = os.path.join(log_dir, f"{name}_{timestamp}.log")
-        file_handler = logging.FileHandler(file_path, encoding='utf-8')
-        file_handler.setFormatter(_get_formatter(use_color=False))
-        file_handler.setLevel(TRACE_LEVEL_NUM)
-        logger.addHandler(file_handler)
+    if queue is not None: #crosses a process boundary: QueueHandler pickles a formatted copy
+        logger.addHandler(QueueHandler(queue))
+        return logger
 
-    if to_console:
-        _add_console_handler(logger, log_level, use_color)
+    handlers = _build_handlers(name, log_dir, log_level, to_console, to_file, use_color)
+    if handlers: #records no handler would write are dropped by isEnabledFor, before any formatting
+        logger.setLevel(min(handler.level for handler in handlers))
+    if QUEUED_LOGGING if queued is None else queued:
+        _router.add_route(name, handlers)
+        logger.addHandler(_LocalQueueHandler(_start_listener("local", _queue.SimpleQueue())))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     return logger
 
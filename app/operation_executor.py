@@ -1,32 +1,51 @@
-import time ,re,os, hmac, hashlib, inspect, dateutil, base64, pdfplumber, ocrmypdf, tempfile,shutil, tabula
-import pandas as pd
+import time ,re,os, hmac, hashlib, inspect, dateutil, base64, tempfile,shutil
 from bs4 import BeautifulSoup
 from dateutil.parser import parse
 from io import StringIO, BytesIO
-from docx import Document
-from pdf2docx import Converter
-from docx import Document as DocxReader
 
-
-from openpyxl.styles import PatternFill
-from openpyxl.formatting.rule import FormulaRule
-from openpyxl.utils.dataframe import dataframe_to_rows  
-from openpyxl.formatting.rule import CellIsRule
+#PDF / OCR / Office stacks load on first use (see app.lazy_imports)
+from app.lazy_imports import lazy, lazy_attr
+pd = lazy("pandas")
+pdfplumber = lazy("pdfplumber")
+ocrmypdf = lazy("ocrmypdf")
+tabula = lazy("tabula")
+Document = lazy_attr("docx", "Document")
+DocxReader = lazy_attr("docx", "Document")
+Converter = lazy_attr("pdf2docx", "Converter")
+
+PatternFill = lazy_attr("openpyxl.styles", "PatternFill")
+FormulaRule = lazy_attr("openpyxl.formatting.rule", "FormulaRule")
+CellIsRule = lazy_attr("openpyxl.formatting.rule", "CellIsRule")
+dataframe_to_rows = lazy_attr("openpyxl.utils.dataframe", "dataframe_to_rows")
 
 from app.logger import get_active_logger
+from app.blob_store import BlobStore, get_blob_store
+from contextlib import contextmanager, nullcontext
+from app.fingerprint import fingerprint, digest_text
+from app.table_normalizer import normalize_table
+from app.ops_plan import OpsPlan, merge_timings
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 
 class OperationExecutor:
     
     
     cache_doc_name = ""
+    HASH_PROCEDURES = {"sha256", "sha1", "blake2b"} #on `value` these reuse the capture hash / memoized fingerprints
+    PARALLEL_PROCEDURES = {"normalize_df", "sha256", "sha1", "blake2b"} #CPU-bound, worth a process pool
+    OPS_WORKERS = min(4, os.cpu_count() or 1)
+    OPS_CHUNK_SIZE = 16
+    PARALLEL_MIN_PACKETS = 512 #below this, worker start-up (spawn + imports) costs more than it saves
     
     def __init__(self, ):
         
         self.logger = get_active_logger()
+        self.op_timings = {}
         self.procedures = {
             "ext_date": self.extract_date,
             "sha256": self._generate_hash_sha256,
             "sha1": self._generate_hash_sha1,
+            "blake2b": self._generate_hash_blake2b,
             "normalize_df": self._generalize_table_df,
             "original":self._boomerang
         }
@@ -35,6 +54,7 @@ class OperationExecutor:
             "normalize_df": ["table_html"],
             "sha1": ["table_html", "html", "pdf"],
             "sha256": ["table_html", "html", "pdf"],
+            "blake2b": ["table_html", "html", "pdf"],
             "ext_date": ["html"],
             "original": ["pdf", "html", "table_html"]
         }
@@ -75,31 +95,14 @@ class OperationExecutor:
         if not isinstance(text,str):
             return f"{inspect.currentframe().f_code.co_name}: input non str"
         return hashlib.sha1(text.encode()).hexdigest()
+
+    def _generate_hash_blake2b(self,text:str)->str:
+        if not isinstance(text,str):
+            return f"{inspect.currentframe().f_code.co_name}: input non str"
+        return digest_text(text, "blake2b")
     
     def _generalize_table_df(self,html_str)->str:
-        MAX_COLUMN=15
-        cols = [f"column_{i}" for i in range(1, MAX_COLUMN + 1)]
-        dfs = pd.read_html(StringIO(html_str), flavor='html5lib')
-        if not dfs:
-            return pd.DataFrame(columns=cols)
-        
-        all_dfs = []
-        for df in dfs:
-            if df.empty:
-                continue
-
-            df = df.iloc[:, :MAX_COLUMN].copy()  # truncate if too many columns
-            df.columns = cols[:df.shape[1]]      # rename existing columns
-            for i in range(df.shape[1], MAX_COLUMN):
-                df[cols[i]] = ""                 # fill missing columns with empty strings
-
-            df = df.reindex(columns=cols)        # ensure consistent column order
-            all_dfs.append(df)
-
-        final_df = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame(columns=cols)
-        
-        norm_df = final_df.to_csv(index=False,header=False, sep='|', lineterminator='\n')
-        return norm_df
+        return normalize_table(html_str) #lxml row walk, byte-identical to the old read_html/concat/to_csv chain
 
 
     
@@ -158,68 +161,64 @@ class OperationExecutor:
                     f.write("</body></html>")
   
     #Core Functionality
-    def runner(self, data, function_to_execute):
-        p_dict = data.copy()
-        records = p_dict.get("records", [])
-
-        for record in records:
-            # self.logger.info(f"Processing : {record['bank_name']}")
-            print(f">>Processing {record['bank_name']}")
+    def compile_plan(self, function_to_execute) -> OpsPlan:
+        return OpsPlan.compile(function_to_execute, self.procedures,
+                               self.HASH_PROCEDURES, self.PARALLEL_PROCEDURES)
+
+    def runner(self, data, function_to_execute, workers=None):
+        """Apply the POST_SCRAPE_OPS stages to every packet. Returns a new {..., "records"} dict,
+        `data` is not modified; per-op timings land in self.op_timings."""
+        plan = self.compile_plan(function_to_execute)
+        workers = self.OPS_WORKERS if workers is None else max(1, int(workers))
+        self.op_timings = {}
+
+        records, jobs = [], []
+        for record in data.get("records", []):
+            self.logger.debug(">>Processing %s", record['bank_name'])
             response_data = record.get("scraped_data", [])
             if not response_data:
+                records.append(dict(record))
                 continue
 
-            new_scraped_data = []
-
-            for action in response_data:
-                if not action.get("data_present"):
-                    continue
-
-                response = action.get("response")
-                if not response:
-                    continue
-
-                for _packet_ in response:
-                    check_packet = _packet_.copy()
-
-                    for stage_name, operations in function_to_execute.items():
-                        for operation in operations:
-                            # Unpack operation with optional expected_type
-                            if len(operation) == 4:
-                                func_name, source_key, target_key, expected_type = operation
-                            else:
-                                func_name, source_key, target_key = operation
-                                expected_type = None
-
-                            if target_key in check_packet:
-                                raise ValueError(
-                                    f"`target_key` cannot be similar to any of these keys: {list(check_packet.keys())}"
-                                )
-
-                            func = self.procedures.get(func_name)
-                            if not func:
-                                raise ValueError(f"Function '{func_name}' not found in procedures.")
-
-                            input_value = _packet_.get(source_key)
-                            if input_value is None:
-                                continue
-
-                            # Apply type check only in primary stage
-                            if stage_name == "primary" and expected_type:
-                                packet_type = _packet_.get("type", "").lower()
-                                if isinstance(expected_type, list):
-                                    if packet_type not in [t.lower() for t in expected_type]:
-                                        continue
-                                elif packet_type != expected_type.lower():
-                                    continue
-
-                            _packet_[target_key] = func(input_value)
-
-                    new_scraped_data.append(_packet_)
-
-            record["scraped_data"] = new_scraped_data
-
-        return p_dict
+            packets = [_packet_ for action in response_data
+                       if action.get("data_present") and action.get("response")
+                       for _packet_ in action["response"]]
+            records.append(dict(record))
+            jobs.append((records[-1], packets))
+
+        processed = self.__stream(plan, [p for _, packets in jobs for p in packets], function_to_execute, workers)
+        for record, packets in jobs:
+            record["scraped_data"] = [next(processed) for _ in packets]
+        processed.close()
+
+        return {**data, "records": records}
+
+    def __stream(self, plan, packets, function_to_execute, workers):
+        """Processed packets in input order; CPU-heavy plans over enough packets run on a process pool
+        (chunks in flight are bounded, results are yielded as they complete in order)."""
+        chunks = [packets[i:i + self.OPS_CHUNK_SIZE] for i in range(0, len(packets), self.OPS_CHUNK_SIZE)]
+
+        if workers == 1 or not plan.PARALLEL or len(packets) < self.PARALLEL_MIN_PACKETS:
+            for chunk in chunks:
+                out, timings = plan.run_chunk(chunk)
+                merge_timings(self.op_timings, timings)
+                yield from out
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_ops_worker,
+                                 initargs=(function_to_execute,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_run_ops_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    yield from self.__collect(pending.popleft())
+            while pending:
+                yield from self.__collect(pending.popleft())
+
+    def __collect(self, future):
+        out, timings = future.result()
+        merge_timings(self.op_timings, timings)
+        return out
         
     def process_comparison(self, old_json: dict, new_json: dict, key: str = "hash256") -> dict:
     
@@ -273,6 +272,30 @@ class OperationExecutor:
 
         return new_json
     
+    #Binary Payloads (blob refs, legacy inline base64 still readable)
+    @staticmethod
+    def _open_binary_(entry):
+        """File-like for a binary packet: read-only mmap of its blob, BytesIO for inline base64."""
+        raw_content = entry.get("value", "")
+        if BlobStore.is_ref(raw_content):
+            return get_blob_store().open(raw_content)
+        return nullcontext(BytesIO(base64.b64decode(raw_content)))
+
+    @staticmethod
+    @contextmanager
+    def _binary_path_(entry, suffix=""):
+        """Path for tools that only take files: the blob itself, or a temp copy of inline base64."""
+        raw_content = entry.get("value", "")
+        if BlobStore.is_ref(raw_content):
+            yield get_blob_store().path_for(raw_content)
+            return
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(base64.b64decode(raw_content))
+        try:
+            yield tmp.name
+        finally:
+            os.remove(tmp.name)
+
     def _parse_table(self, entry):
         
         content_type = entry.get("type", "str")
@@ -289,11 +312,9 @@ class OperationExecutor:
                 return pd.DataFrame({"text": text_lines})
 
             elif content_type == "pdf":
-                pdf_bytes = base64.b64decode(raw_content)
-                pdf_file = BytesIO(pdf_bytes)
                 all_rows = []
                 try:
-                    with pdfplumber.open(pdf_file) as pdf:
+                    with self._open_binary_(entry) as pdf_file, pdfplumber.open(pdf_file) as pdf:
                         for page_num, page in enumerate(pdf.pages, start=1):
                             tables = page.extract_tables()
                             for table in tables:
@@ -304,11 +325,9 @@ class OperationExecutor:
                 return pd.DataFrame(all_rows) if all_rows else pd.DataFrame([["No table found in PDF"]])
 
             elif content_type == "redir_pdf":
-                pdf_bytes = base64.b64decode(raw_content)
-                pdf_file = BytesIO(pdf_bytes)
                 all_rows = []
-                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_output:
-                    ocrmypdf.ocr(pdf_file, temp_output.name)
+                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_output, self._binary_path_(entry, ".pdf") as pdf_path:
+                    ocrmypdf.ocr(pdf_path, temp_output.name)
                 try:
                     with pdfplumber.open(temp_output.name) as pdf:
                         for page_num, page in enumerate(pdf.pages, start=1):
@@ -496,20 +515,16 @@ class OperationExecutor:
         try:
             if content_type == "pdf":
                 try:
-                    pdf_bytes = base64.b64decode(raw_content)
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-                        tmp_pdf.write(pdf_bytes)
-                        tmp_pdf_path = tmp_pdf.name
-
-                    tmp_docx_path = tmp_pdf_path.replace(".pdf", ".docx")
-                    converter = Converter(tmp_pdf_path)
-                    converter.convert(tmp_docx_path, start=0, end=None)
-                    converter.close()
+                    with OperationExecutor._binary_path_(entry, ".pdf") as pdf_path:
+                        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_docx:
+                            tmp_docx_path = tmp_docx.name
+                        converter = Converter(pdf_path)
+                        converter.convert(tmp_docx_path, start=0, end=None)
+                        converter.close()
 
                     with open(tmp_docx_path, "rb") as f:
                         docx_bytes = f.read()
 
-                    os.remove(tmp_pdf_path)
                     os.remove(tmp_docx_path)
 
                     result["content"].append({"type": "docx","docx_bytes": docx_bytes})
@@ -530,11 +545,9 @@ class OperationExecutor:
                 result["tables"].append(df)
             
             elif content_type == "xlsx":
-                xlsx_bytes = base64.b64decode(raw_content)
-                xlsx_stream = BytesIO(xlsx_bytes)
-
                 # Read all sheets
-                sheets = pd.read_excel(xlsx_stream, sheet_name=None)
+                with OperationExecutor._open_binary_(entry) as xlsx_stream:
+                    sheets = pd.read_excel(xlsx_stream, sheet_name=None)
 
                 for sheet_name, df in sheets.items():
                     result["content"].append({
@@ -668,4 +681,16 @@ class OperationExecutor:
 
         document.save(output_path)
         return output_path
-    
\ No newline at end of file
+    
+
+
+# --- Ops pool workers: each process compiles the plan once ---
+_OPS_PLAN = None
+
+def _init_ops_worker(function_to_execute):
+    global _OPS_PLAN
+    _OPS_PLAN = OperationExecutor().compile_plan(function_to_execute)
+
+
+def _run_ops_chunk(packets):
+    return _OPS_PLAN.run_chunk(packets)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+import time
+
+from app.fingerprint import fingerprint
+
+
+@dataclass(frozen=True, slots=True)
+class OpStep:
+    # One POST_SCRAPE_OPS entry, resolved once
+    NAME: str                 # procedure name (normalize_df, sha1, ...)
+    SOURCE: str               # packet key read
+    TARGET: str               # packet key written
+    STAGE: str                # stage it came from (primary, secondary, ...)
+    TYPES: frozenset = None   # lowered packet types it applies to, None -> any
+    FUNC: object = None       # bound procedure
+    FINGERPRINT: bool = False # hash of the raw payload -> memoized fingerprint (app.fingerprint)
+
+    @property
+    def KEY(self) -> str:
+        return f"{self.STAGE}:{self.NAME}:{self.SOURCE}->{self.TARGET}"
+
+    def applies(self, packet: dict) -> bool:
+        return self.TYPES is None or packet.get("type", "").lower() in self.TYPES
+
+
+@dataclass(frozen=True, slots=True)
+class OpsPlan:
+    STEPS: tuple = ()          # OpStep, in execution order
+    TARGETS: frozenset = frozenset()
+    PARALLEL: bool = False     # has CPU-heavy steps worth a process pool
+
+    @classmethod
+    def compile(cls, rules: dict, procedures: dict, hash_procedures=(), parallel_procedures=()) -> "OpsPlan":
+        """{stage: [[name, source, target(, types)], ...]} -> OpsPlan. Unknown procedures raise here,
+        before any packet is touched; type filters only apply in the primary stage (as runner always did)."""
+        steps = []
+        for stage_name, operations in (rules or {}).items():
+            for operation in operations:
+                if len(operation) == 4:
+                    func_name, source_key, target_key, expected_type = operation
+                else:
+                    func_name, source_key, target_key = operation
+                    expected_type = None
+
+                func = procedures.get(func_name)
+                if not func:
+                    raise ValueError(f"Function '{func_name}' not found in procedures.")
+
+                types = None
+                if stage_name == "primary" and expected_type:
+                    expected = expected_type if isinstance(expected_type, list) else [expected_type]
+                    types = frozenset(t.lower() for t in expected)
+
+                steps.append(OpStep(NAME=func_name, SOURCE=source_key, TARGET=target_key, STAGE=stage_name,
+                                    TYPES=types, FUNC=func,
+                                    FINGERPRINT=func_name in hash_procedures and source_key == "value"))
+
+        return cls(STEPS=tuple(steps), TARGETS=frozenset(step.TARGET for step in steps),
+                   PARALLEL=any(step.NAME in parallel_procedures for step in steps))
+
+    def run_packet(self, packet: dict, timings: dict = None) -> dict:
+        """New packet with every step applied; `packet` itself is left untouched.
+        `timings` collects {step KEY: [calls, seconds]}."""
+        clash = self.TARGETS & packet.keys()
+        if clash:
+            raise ValueError(f"`target_key` cannot be similar to any of these keys: {list(packet.keys())}")
+
+        out = dict(packet)
+
+        for step in self.STEPS:
+            input_value = out.get(step.SOURCE)
+            if input_value is None or not step.applies(out):
+                continue
+
+            start = time.perf_counter()
+            out[step.TARGET] = fingerprint(out, step.NAME) if step.FINGERPRINT else step.FUNC(input_value)
+            if timings is not None:
+                stat = timings.setdefault(step.KEY, [0, 0.0])
+                stat[0] += 1
+                stat[1] += time.perf_counter() - start
+        return out
+
+    def run_chunk(self, packets: list) -> tuple:
+        timings = {}
+        return [self.run_packet(packet, timings) for packet in packets], timings
+
+
+def merge_timings(total: dict, part: dict) -> dict:
+    for key, (calls, seconds) in part.items():
+        stat = total.setdefault(key, [0, 0.0])
+        stat[0] += calls
+        stat[1] += seconds
+    return total
+
+
+def format_timings(timings: dict) -> str:
+    lines = [f"{key}: {calls} calls, {seconds * 1000:.1f} ms" for key, (calls, seconds)
+             in sorted(timings.items(), key=lambda kv: kv[1][1], reverse=True)]
+    return "\n".join(lines) or "no ops ran"
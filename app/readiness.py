@@ -0,0 +1,88 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, JavascriptException
+import time
+
+#in-page observer, installed once per document: in-flight fetch/XHR count, last network + DOM activity (ms)
+OBSERVER_SCRIPT = """
+if (!window.__scrapeReady) {
+    const st = window.__scrapeReady = {inflight: 0, lastNet: 0, lastDom: performance.now()};
+    for (const e of performance.getEntriesByType("resource")) st.lastNet = Math.max(st.lastNet, e.responseEnd);
+    const tick = () => { st.lastNet = performance.now(); };
+
+    const _fetch = window.fetch;
+    if (_fetch) window.fetch = function () {
+        st.inflight++; tick();
+        return _fetch.apply(this, arguments).finally(() => { st.inflight--; tick(); });
+    };
+    const _send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        st.inflight++; tick();
+        this.addEventListener("loadend", () => { st.inflight--; tick(); }, {once: true});
+        return _send.apply(this, arguments);
+    };
+    try { new PerformanceObserver(tick).observe({type: "resource", buffered: false}); } catch (e) {}
+    new MutationObserver(() => { st.lastDom = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+const st = window.__scrapeReady, now = performance.now();
+const imgs = Array.from(document.images).every(img => img.complete);
+return {
+    netIdle: st.inflight <= 0 ? now - st.lastNet : 0,
+    domIdle: now - st.lastDom,
+    assets: document.readyState === "complete" && imgs && (!document.fonts || document.fonts.status === "loaded")
+};
+"""
+
+
+class PageReady:
+    """WebDriverWait predicate fed by the injected observer, no fixed sleeps.
+    `network_idle`: no fetch/XHR/resource activity for idle_ms, `dom_quiet`: no mutations for idle_ms,
+    `assets_loaded`: readyState complete + images + fonts, `settled`: all three, `quiet`: network idle +
+    DOM quiet (after in-page clicks: a tab's XHR and re-render, assets don't matter)."""
+
+    CHECKS = {
+        "network_idle": ("net",),
+        "dom_quiet": ("dom",),
+        "quiet": ("net", "dom"),
+        "assets_loaded": ("assets",),
+        "settled": ("net", "dom", "assets"),
+    }
+    POLL = 0.1
+
+    def __init__(self, kind="settled", idle_ms=500):
+        if kind not in self.CHECKS:
+            raise ValueError(f"Unknown readiness condition: {kind}")
+        self.KIND = kind
+        self.IDLE_MS = idle_ms
+
+    def __call__(self, driver):
+        state = driver.execute_script(OBSERVER_SCRIPT)
+        checks = self.CHECKS[self.KIND]
+        if "net" in checks and state["netIdle"] < self.IDLE_MS:
+            return False
+        if "dom" in checks and state["domIdle"] < self.IDLE_MS:
+            return False
+        if "assets" in checks and not state["assets"]:
+            return False
+        return True
+
+    def __repr__(self):
+        return f"PageReady({self.KIND!r}, idle_ms={self.IDLE_MS})"
+
+
+def arm(driver):
+    """Install the observer before a click, so the fetch/XHR the click starts is counted as in flight."""
+    try:
+        driver.execute_script(OBSERVER_SCRIPT)
+    except JavascriptException:
+        pass
+
+
+def wait_ready(driver, kind="settled", timeout=10, idle_ms=500) -> float:
+    """Block until the page is `kind` or `timeout` passes (never raises), returns seconds spent."""
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=PageReady.POLL).until(PageReady(kind, idle_ms))
+    except (TimeoutException, JavascriptException):
+        pass
+    return time.monotonic() - start
@@ -0,0 +1,226 @@
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from selenium.common.exceptions import WebDriverException
+from urllib.parse import urldefrag
+from datetime import datetime
+import requests, os, io, json, base64, hashlib, logging, threading, zipfile
+
+from app.logger import get_active_logger
+from app.utils import Helper
+
+#Record/replay of a bank run. One zip per bank: bodies stored once under their sha256, index.json maps
+#each url to the responses seen for it, in order (an XHR polled twice replays both answers), plus the
+#bank meta and the run's result for regression checks. RECORD_RUNS writes them, REPLAY_DIR serves them.
+#
+#The replay driver (app.fake_driver) runs no page JavaScript, so raw documents alone would miss tables
+#rendered by scripts or tabs filled by XHR. Every ActionExecutor.execute() call therefore also records
+#the rendered DOM it ended on (`rendered`, in call start order); the replay puts that DOM in place when
+#the same call starts, and serves it when the call navigates to its url. Limits: an action that reads
+#several DOM states by itself (no steps), or reads a page it then navigates away from, replays against
+#the raw document for those reads. Archives recorded without `rendered` replay only when they hold no
+#XHR/fetch responses.
+
+INDEX_FILE = "index.json"
+RENDERED_KEY = "rendered"
+RESULT_FILE = "result.json"
+RECORDED_TYPES = {"Document", "XHR", "Fetch"}  # CDP resource types worth keeping (no images/fonts/css)
+
+
+def archive_name(bank_params: dict) -> str:
+    #bank_type_code alone isn't unique across banks
+    return Helper.sanitize_Win_filename(f"{bank_params['bank_type_code']}_{bank_params['bank_name']}") + ".zip"
+
+
+class RunRecorder:
+    """Collects one bank run into a zip: documents + XHR/fetch bodies from the browser (CDP performance
+    log), pages fetched by the HTTP fast path, files fetched by the Downloader."""
+
+    def __init__(self, path: str, meta: dict = None):
+        self.logger = get_active_logger() or logging.getLogger(__name__)
+        self.PATH = path
+        self.index = {}  # url -> [{"body", "content_type", "status", "kind"}]
+        self.rendered = []  # per execute() call, in start order: {"url", "body"} of the DOM it ended on
+        self.meta = {**(meta or {}), "recorded": datetime.now().isoformat(timespec="seconds")}
+        self._stored = set()
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+
+    def __store(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        if digest not in self._stored:
+            self._zip.writestr(f"bodies/{digest}", body)
+            self._stored.add(digest)
+        return digest
+
+    def add(self, url: str, body: bytes, content_type: str = "text/html", status: int = 200, kind: str = "document"):
+        with self._lock:
+            digest = self.__store(body)
+            self.index.setdefault(urldefrag(url)[0], []).append(
+                {"body": digest, "content_type": content_type, "status": status, "kind": kind})
+
+    def forget(self, kind: str):
+        """Drop `kind` responses from the index (an HTTP fast path attempt the browser took over from)."""
+        with self._lock:
+            for url in list(self.index):
+                self.index[url] = [entry for entry in self.index[url] if entry["kind"] != kind]
+                if not self.index[url]:
+                    del self.index[url]
+
+    def add_file(self, url: str, file_path: str, content_type: str = "application/octet-stream"):
+        with open(file_path, "rb") as f:
+            self.add(url, f.read(), content_type, kind="download")
+
+    def harvest(self, driver) -> int:
+        """Pull bodies of the responses the browser got since the last call. Needs a driver built with
+        goog:loggingPrefs performance (ActionExecutor does when RECORD_RUNS is on); returns responses kept."""
+        try:
+            entries = driver.execute("getLog", {"type": "performance"})["value"]
+        except WebDriverException as e:
+            self.logger.debug("No performance log to record from: %s", e)
+            return 0
+
+        kept = 0
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            if message["method"] != "Network.responseReceived" or message["params"].get("type") not in RECORDED_TYPES:
+                continue
+            params, response = message["params"], message["params"]["response"]
+            try:
+                found = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            except WebDriverException: #evicted, redirected or still streaming
+                continue
+            body = base64.b64decode(found["body"]) if found.get("base64Encoded") else found["body"].encode("utf-8")
+            self.add(response["url"], body, response.get("mimeType", "text/html"), response.get("status", 200), params["type"].lower())
+            kept += 1
+        return kept
+
+    def begin(self) -> int:
+        """Reserve the `rendered` slot of an execute() call as it starts (steps start after their parent)."""
+        with self._lock:
+            self.rendered.append(None)
+            return len(self.rendered) - 1
+
+    def render(self, driver, slot: int):
+        """Store the rendered DOM the call ended on into its slot."""
+        try:
+            url, source = driver.current_url, driver.page_source
+        except WebDriverException as e:
+            self.logger.debug("No rendered DOM to record: %s", e)
+            return
+        with self._lock:
+            self.rendered[slot] = {"url": urldefrag(url)[0], "body": self.__store(source.encode("utf-8"))}
+
+    def close(self, result: dict = None):
+        with self._lock:
+            if self._zip is None:
+                return
+            self._zip.writestr(INDEX_FILE, json.dumps(
+                {"meta": self.meta, "urls": self.index, RENDERED_KEY: self.rendered}, ensure_ascii=False))
+            if result is not None:
+                self._zip.writestr(RESULT_FILE, json.dumps(result, ensure_ascii=False, default=str))
+            self._zip.close()
+            self._zip = None
+        self.logger.save(f"Recorded {sum(len(v) for v in self.index.values())} response(s) to {self.PATH}")
+
+
+class RunArchive:
+    """Read side: answers urls with the recorded responses, in recorded order (the last one repeats)."""
+
+    def __init__(self, path: str):
+        self.PATH = path
+        self._zip = zipfile.ZipFile(path, "r")
+        index = json.loads(self._zip.read(INDEX_FILE))
+        self.META = index["meta"]
+        self.URLS = index["urls"]
+        self.RENDERED = index.get(RENDERED_KEY) or []
+        self._cursor = {}
+        self._calls = 0 #execute() calls started, indexes RENDERED
+        self._active = [] #RENDERED entries of the calls running now, innermost last
+        self._lock = threading.Lock()
+
+    @classmethod
+    def find(cls, directory: str, bank_params: dict):
+        path = os.path.join(directory, archive_name(bank_params))
+        return cls(path) if os.path.exists(path) else None
+
+    @property
+    def result(self):
+        try:
+            return json.loads(self._zip.read(RESULT_FILE))
+        except KeyError:
+            return None
+
+    @property
+    def replayable(self) -> bool:
+        """Without rendered DOMs only pages that need no script replay faithfully."""
+        return bool(self.RENDERED) or self.META.get("via") == "http" or not any(
+            entry["kind"] in ("xhr", "fetch") for responses in self.URLS.values() for entry in responses)
+
+    def enter(self, driver):
+        """An execute() call starts: put its recorded DOM in place when the driver is on that url."""
+        with self._lock:
+            idx, self._calls = self._calls, self._calls + 1
+            entry = self.RENDERED[idx] if idx < len(self.RENDERED) else None
+            self._active.append(entry)
+            html = self._zip.read(f"bodies/{entry['body']}").decode("utf-8") if entry else None
+        if entry and urldefrag(driver.current_url)[0] == entry["url"]:
+            driver.execute_cdp_cmd("Page.setDocumentContent", {"html": html})
+
+    def exit(self):
+        with self._lock:
+            self._active.pop()
+
+    def lookup(self, url: str):
+        """(body, content_type, status) or None when the url was never recorded."""
+        url = urldefrag(url)[0]
+        responses = self.URLS.get(url)
+        if not responses:
+            return None
+        with self._lock:
+            idx = self._cursor.get(url, 0)
+            self._cursor[url] = idx + 1
+            entry = responses[min(idx, len(responses) - 1)]
+            body = self._zip.read(f"bodies/{entry['body']}")
+        return body, entry["content_type"], entry["status"]
+
+    def fetch(self, url: str) -> tuple:
+        """FakeChromeBackend `fetch`: (body, content_type, final url); unknown urls raise LookupError.
+        A navigation to the url the running call ended on gets that call's rendered DOM."""
+        with self._lock:
+            entry = self._active[-1] if self._active else None
+            if entry and entry["url"] == urldefrag(url)[0]:
+                return self._zip.read(f"bodies/{entry['body']}"), "text/html; charset=utf-8", url
+        found = self.lookup(url)
+        if found is None:
+            raise LookupError(f"{url} is not in {os.path.basename(self.PATH)}")
+        return found[0], found[1], url
+
+    def adapter(self) -> "ArchiveAdapter":
+        return ArchiveAdapter(self)
+
+    def close(self):
+        self._zip.close()
+
+
+class ArchiveAdapter(BaseAdapter):
+    """requests transport over a RunArchive; mount it on a Session to take it offline."""
+
+    def __init__(self, archive: RunArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        found = self.archive.lookup(request.url)
+        body, content_type, status = found if found else (b"", "text/plain", 404)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(body))})
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if found else "Not Recorded"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        pass
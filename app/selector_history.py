@@ -0,0 +1,91 @@
+import json, os, time, threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class SelectorHistory:
+    """Per-bank (bank_type_code is a category, so `<code>_<bank name>`) hit/miss record of `skip_if_not_found` selectors, persisted across runs.
+    A selector that missed MISS_STREAK probes in a row is `known_absent`: it only gets a single
+    instant probe (no grace window) until it shows up again."""
+
+    MISS_STREAK = 3
+    LOCK_TIMEOUT = 10 #s; a lock file older than this is a crashed writer's
+
+    def __init__(self, bank_key: str, directory: str):
+        self.BANK_KEY = bank_key
+        self.PATH = os.path.join(directory, f"{bank_key}.json")
+        self.records = self.__load()
+        self._pending = [] #(key, found, day) since the last save, replayed onto the file's latest state
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(by, value) -> str:
+        return f"{by}|{value}"
+
+    def known_absent(self, by, value) -> bool:
+        rec = self.records.get(self.key(by, value))
+        return bool(rec) and rec["streak"] >= self.MISS_STREAK
+
+    @staticmethod
+    def __apply(records, key, found, day):
+        rec = records.setdefault(key, {"hits": 0, "misses": 0, "streak": 0, "last_seen": None})
+        if found:
+            rec["hits"] += 1
+            rec["streak"] = 0
+            rec["last_seen"] = day
+        else:
+            rec["misses"] += 1
+            rec["streak"] += 1
+
+    def record(self, by, value, found: bool):
+        event = (self.key(by, value), found, datetime.now().strftime("%Y-%m-%d"))
+        with self._lock:
+            self.__apply(self.records, *event)
+            self._pending.append(event)
+
+    def save(self):
+        """Merge on write: reload the file under a lock file and replay this run's probes onto it, so two
+        processes saving the same bank both keep their counts."""
+        with self._lock:
+            if not self._pending:
+                return
+            with self.__file_lock():
+                records = self.__load()
+                for event in self._pending:
+                    self.__apply(records, *event)
+                tmp = f"{self.PATH}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(records, f, indent=2)
+                os.replace(tmp, self.PATH)
+            self.records, self._pending = records, []
+
+    @contextmanager
+    def __file_lock(self):
+        lock_path = f"{self.PATH}.lock"
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.LOCK_TIMEOUT:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{lock_path} held for over {self.LOCK_TIMEOUT} s")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def __load(self) -> dict:
+        try:
+            with open(self.PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
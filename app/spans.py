@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json, os, time, threading
+
+#Timing spans: one dict per phase {name, start, seconds, pid, bank, action, selector, parent, ...}.
+#Tags set with span_tags() apply to every span opened inside (per thread/context); `parent` is the
+#name of the enclosing span.
+_tags = ContextVar("span_tags", default={})
+
+
+class SpanRecorder:
+    """Spans finished in this process. Fleet workers drain() theirs into the bank result,
+    the parent extend()s them back, so one recorder ends up with the whole run."""
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def add(self, entry: dict):
+        with self._lock:
+            self._spans.append(entry)
+
+    def extend(self, entries):
+        with self._lock:
+            self._spans.extend(entries or [])
+
+    def drain(self) -> list:
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return list(self._spans)
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=1)
+
+
+@contextmanager
+def span_tags(**tags):
+    token = _tags.set({**_tags.get(), **{k: v for k, v in tags.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+@contextmanager
+def span(name: str, **tags):
+    """Time the block; exceptions are tagged on the span and re-raised."""
+    outer = _tags.get()
+    entry = {"name": name, "start": time.time(), **outer, **{k: v for k, v in tags.items() if v is not None}}
+    token = _tags.set({**outer, "parent": name})
+    start = time.perf_counter()
+    try:
+        yield entry
+    except BaseException as e:
+        entry["error"] = type(e).__name__
+        raise
+    finally:
+        entry["seconds"] = round(time.perf_counter() - start, 6)
+        _tags.reset(token)
+        entry["pid"] = os.getpid()
+        get_span_recorder().add(entry)
+
+
+#Report
+def _rank(spans, key, top):
+    totals = {}
+    for entry in spans:
+        group = key(entry)
+        if group is None:
+            continue
+        stat = totals.setdefault(group, [0, 0.0, 0.0])
+        stat[0] += 1
+        stat[1] += entry["seconds"]
+        stat[2] = max(stat[2], entry["seconds"])
+    return sorted(totals.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+
+
+def _table(title, rows) -> list:
+    lines = [title, f"  {'':60s} {'count':>6s} {'total s':>9s} {'mean s':>8s} {'max s':>8s}"]
+    for group, (count, total, worst) in rows:
+        label = group if isinstance(group, str) else " / ".join(str(g) for g in group)
+        lines.append(f"  {label[:60]:60s} {count:6d} {total:9.2f} {total / count:8.2f} {worst:8.2f}")
+    return lines
+
+
+def summarize(spans: list, top: int = 15) -> str:
+    """Ranked wall-clock tables: by phase, by bank (bank spans), by action kind. Phases nest
+    (bank > action > wait/extract/...), so compare rows within a table, not across them."""
+    if not spans:
+        return "no spans recorded"
+    lines = _table("By phase:", _rank(spans, lambda s: s["name"], top))
+    lines += _table("By bank:", _rank(spans, lambda s: s.get("bank") if s["name"] == "bank" else None, top))
+    lines += _table("By action kind:", _rank(spans, lambda s: s.get("action") if s["name"] == "action" else None, top))
+    lines += _table("Slowest action/selector:", _rank(
+        spans, lambda s: (s.get("bank"), s.get("action"), s.get("selector")) if s["name"] == "action" else None, top))
+    commands = [s for s in spans if s["name"] == "webdriver"] #PROFILE_WEBDRIVER runs
+    if commands:
+        lines.append(f"WebDriver: {len(commands)} round trips, {sum(s['seconds'] for s in commands):.2f} s, "
+                     f"{sum(max(s.get('sent', 0), 0) for s in commands) / 1024:.0f} KB sent, "
+                     f"{sum(max(s.get('received', 0), 0) for s in commands) / 1024:.0f} KB received")
+        lines += _table("WebDriver commands (command / inside):", _rank(
+            commands, lambda s: (s.get("command"), s.get("parent")), top))
+        lines += _table("WebDriver round trips by action:", _rank(
+            commands, lambda s: (s.get("bank"), s.get("action"), s.get("selector")), top))
+    return "\n".join(lines)
+
+
+# --- Process-wide recorder ---
+_recorder = None
+_recorder_lock = threading.Lock()
+
+def get_span_recorder() -> SpanRecorder:
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = SpanRecorder()
+        return _recorder
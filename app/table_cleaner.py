@@ -0,0 +1,145 @@
+from lxml import etree
+from bs4 import BeautifulSoup
+import re, html
+import lxml.html
+
+#Text passes of the old chain, compiled once. One scan does th->td, thead->tbody,
+#unwraps strong/sup/b/p/br and drops [*@\n\t]; the empty-row and whitespace passes need its output.
+_TAG_PASS = re.compile(r"<(/?)(th(?:ead)?)\b|</?(?:strong|sup|b|p|br)(?:\s+[^>]*)?>|[*@\n\t]+", re.IGNORECASE)
+_EMPTY_ROW = re.compile(r"<tr[^>]*>\s*(?:&nbsp;|\u00A0|\s)*</tr>", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+#balance scan: comments, raw text blocks, then start/end tags with their attribute text
+_MARKUP = re.compile(r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>"
+                     r"|<(/?)([a-zA-Z][^\s/>]*)((?:\s+[^\s=/>]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s>]*))?)*)\s*(/?)>",
+                     re.IGNORECASE | re.DOTALL)
+_TAG_START = re.compile(r"<[a-zA-Z!/]")
+_ATTR_NAME = re.compile(r"\s([^\s=/>]+)(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s>]*))?")
+
+ALLOWED_ATTRS = ("rowspan", "colspan")
+#serialized like BeautifulSoup(html.parser): attributes sorted, void tags as <br/>, raw text inside script/style
+VOID_TAGS = {"area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+             "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+             "spacer", "track", "wbr"}
+RAW_TEXT_TAGS = {"script", "style"}
+
+
+def _rename(match):
+    slash, name = match.group(1), match.group(2)
+    if name is None:
+        return ""
+    return f"<{slash}{'td' if len(name) == 2 else 'tbody'}"
+
+
+def normalize_text(rawr: str) -> str:
+    rawr = _TAG_PASS.sub(_rename, rawr)
+    rawr = _EMPTY_ROW.sub("", rawr)
+    return _WHITESPACE.sub(" ", rawr).strip()
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _quote(value: str) -> str:
+    value = _escape(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', "&quot;") + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _serialize(node, out: list, raw=False):
+    tag = node.tag
+    if tag is etree.Comment:
+        out.append(f"<!--{node.text or ''}-->")
+    elif isinstance(tag, str):
+        name = tag.lower()
+        attrs = "".join(f" {key}={_quote(node.get(key))}" for key in sorted(node.keys()) if key in ALLOWED_ATTRS)
+        if name in VOID_TAGS and not len(node) and not node.text:
+            out.append(f"<{name}{attrs}/>")
+        else:
+            out.append(f"<{name}{attrs}>")
+            inner_raw = name in RAW_TEXT_TAGS
+            if node.text:
+                out.append(node.text if inner_raw else _escape(node.text))
+            for child in node:
+                _serialize(child, out, inner_raw)
+            out.append(f"</{name}>")
+    # processing instructions / entities: dropped, html.parser never yields them from outerHTML
+
+    if node.tail:
+        out.append(node.tail if raw else _escape(node.tail))
+
+
+def _source_shape(rawr: str):
+    """(depth, tag) of every element as written, or None when tags don't close in order, a non-void tag
+    self-closes or an attribute repeats (lxml keeps the first, bs4 the last)."""
+    shape, stack = [], []
+    for match in _MARKUP.finditer(rawr):
+        name = match.group(3)
+        if name is None: #comment / script / style
+            continue
+        name, attrs = name.lower(), match.group(4)
+        if match.group(2):
+            if name in VOID_TAGS or not stack or stack.pop() != name:
+                return None
+            continue
+        if attrs:
+            names = [attr.lower() for attr in _ATTR_NAME.findall(attrs)]
+            if len(names) != len(set(names)):
+                return None
+        shape.append((len(stack), name))
+        if name not in VOID_TAGS:
+            if match.group(5):
+                return None
+            stack.append(name)
+    return shape if not stack else None
+
+
+def _tree_shape(nodes) -> list:
+    shape = []
+    def walk(node, depth):
+        if isinstance(node.tag, str):
+            shape.append((depth, node.tag.lower()))
+            for child in node:
+                walk(child, depth + 1)
+    for node in nodes:
+        if not isinstance(node, str):
+            walk(node, 0)
+    return shape
+
+
+def _clean_with_bs4(rawr: str) -> str:
+    soup = BeautifulSoup(rawr, "html.parser")
+    for tag in soup.find_all(True):
+        for attr in list(tag.attrs):
+            if attr not in ALLOWED_ATTRS:
+                del tag.attrs[attr]
+    return str(soup)
+
+
+def clean_table_html(rawr: str) -> str:
+    """Single-pass replacement of the regex + BeautifulSoup chain: same text passes,
+    lxml parse, one tree walk that keeps only rowspan/colspan and serializes like bs4.
+    When lxml's tree isn't the markup as written (unclosed <td>a<td>b, <td> inside <th>, nested <a>, ...)
+    html.parser would nest it differently, so BeautifulSoup itself cleans it and every hash of it is kept."""
+    rawr = normalize_text(rawr)
+    if not rawr:
+        return ""
+    shape = _source_shape(rawr)
+    if shape is None:
+        return _clean_with_bs4(rawr)
+    nodes = lxml.html.fragments_fromstring(rawr)
+    if _tree_shape(nodes) != shape:
+        return _clean_with_bs4(rawr)
+    out = []
+    if not nodes or not isinstance(nodes[0], str): #lxml drops leading text that str.strip() empties (&nbsp;)
+        first = _TAG_START.search(rawr)
+        out.append(_escape(html.unescape(rawr[:first.start() if first else len(rawr)])))
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(_escape(node))
+        else:
+            _serialize(node, out)
+    return "".join(out)
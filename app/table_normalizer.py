@@ -0,0 +1,276 @@
+from io import StringIO
+import re
+from lxml import etree
+
+#`norm_table` text: every <table> flattened to MAX_COLUMN pipe-separated fields per row, exactly what
+#pd.read_html(flavor="html5lib") -> pad/truncate -> concat -> to_csv(sep="|") produced, without the DataFrames.
+#Anything the fast walk can't vouch for byte-for-byte falls back to that pandas chain.
+MAX_COLUMN = 15
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}") #pandas.io.html._remove_whitespace
+_RE_THOUSANDS = re.compile(r"^[\-\+]?([0-9]+,|[0-9])*(\.[0-9]*)?([0-9]?(E|e)\-?[0-9]+)?$") #PythonParser.num, thousands=","
+_RE_INT = re.compile(r"^[\-\+]?[0-9]+$")
+_RE_FLOAT = re.compile(r"^[\-\+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][\-\+]?[0-9]+)?$")
+_INT64 = 2 ** 63
+
+#pandas default na_values
+NA_VALUES = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+             "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+#literals pandas would read as bool/inf, left to the pandas path
+_AMBIGUOUS = {"true", "false", "inf", "+inf", "-inf", "infinity", "+infinity", "-infinity", "nan", "+nan", "-nan"}
+#content html5lib/bs4 treats differently from a plain lxml text walk
+_UNSAFE_TAGS = {"table", "script", "style", "template", "noscript", "textarea", "select", "svg", "math"}
+_TABLE_CHILDREN = {"caption", "colgroup", "thead", "tbody", "tfoot", "tr"}
+_SECTIONS = {"thead", "tbody", "tfoot"}
+
+_NA = None #cell read as NaN, written as ""
+
+
+class _Fallback(Exception):
+    """Input outside what the fast walk reproduces exactly."""
+
+
+#Parse
+def _cell_text(td) -> str:
+    return _RE_WHITESPACE.sub(" ", "".join(td.itertext()).strip())
+
+
+def _span(td, name) -> int:
+    try:
+        return int(td.get(name) or 1)
+    except ValueError:
+        raise _Fallback(f"{name}={td.get(name)!r}")
+
+
+def _check_structure(table):
+    for node in table.iter():
+        if node is table or not isinstance(node.tag, str):
+            continue
+        if node.tag in _UNSAFE_TAGS or "display" in (node.get("style") or ""):
+            raise _Fallback(f"<{node.tag}> inside table")
+
+    for child in table:
+        if isinstance(child.tag, str) and child.tag not in _TABLE_CHILDREN:
+            raise _Fallback(f"<{child.tag}> directly under table")  #foster-parented by html5lib
+        if child.tag in _SECTIONS and any(isinstance(c.tag, str) and c.tag != "tr" for c in child):
+            raise _Fallback(f"non-row inside <{child.tag}>")
+
+    for text in table.xpath("text() | */text() | tr/text() | */tr/text()"):
+        if text.strip():
+            raise _Fallback("bare text between table rows")
+
+
+def _sections(table):
+    """(head, body, foot) <tr> lists the way pandas' bs4 parser collects them."""
+    head, body, foot = [], [], []
+    for child in table:
+        if child.tag == "tr":
+            body.append(child)
+        elif child.tag in _SECTIONS:
+            rows = [tr for tr in child if tr.tag == "tr"]
+            {"thead": head, "tbody": body, "tfoot": foot}[child.tag].extend(rows)
+
+    if not head: #leading all-<th> rows act as the header
+        while body and all(td.tag == "th" for td in _cells(body[0])):
+            head.append(body.pop(0))
+    return head, body, foot
+
+
+def _cells(tr):
+    cells = []
+    for td in tr:
+        if td.tag in ("td", "th"):
+            cells.append(td)
+        elif isinstance(td.tag, str):
+            raise _Fallback(f"<{td.tag}> directly under tr")
+    return cells
+
+
+def _expand(rows, remainder, overflow):
+    """pandas _expand_colspan_rowspan: copy rowspan/colspan cells into the rows/columns they cover."""
+    out = []
+    for tr in rows:
+        texts, next_remainder, index = [], [], 0
+        for td in _cells(tr):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            text = _cell_text(td)
+            rowspan, colspan = _span(td, "rowspan"), _span(td, "colspan")
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        out.append(texts)
+        remainder = next_remainder
+
+    if not overflow:
+        while remainder:
+            texts, next_remainder = [], []
+            for prev_i, prev_text, prev_rowspan in remainder:
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+            out.append(texts)
+            remainder = next_remainder
+    return out, remainder
+
+
+def _table_rows(table):
+    """Data rows (strings, ragged rows padded) of one table, header row dropped; None if pandas skips it."""
+    _check_structure(table)
+    head, body, foot = _sections(table)
+
+    head_rows, rem = _expand(head, [], True)
+    body_rows, rem = _expand(body, rem, bool(foot))
+    foot_rows, _ = _expand(foot, rem, False)
+    if len(head_rows) > 1:
+        raise _Fallback("multi-row header")
+
+    rows = head_rows + body_rows + foot_rows
+    if not rows:
+        return None
+    width = max(len(row) for row in rows)
+    if not any(text for row in rows for text in row):
+        raise _Fallback("table without text") #pandas' match=".+" may or may not keep it
+    rows = [row + [""] * (width - len(row)) for row in rows]
+
+    if width == 1:
+        if head_rows:
+            raise _Fallback("single-column table with header")
+        rows = [row for row in rows if row[0].strip()]
+    return rows[len(head_rows):]
+
+
+#Types (PythonParser: thousands pass, then per-column numeric inference)
+def _column(values):
+    """(kind, cells) for one column: kind is int/float/str, cells hold int/float/str or _NA."""
+    texts = [raw.replace(",", "") if "," in raw and _RE_THOUSANDS.search(raw.strip()) else raw for raw in values]
+    parsed, kind = [], "int"
+    for raw in texts:
+        if raw in NA_VALUES:
+            parsed.append(_NA)
+            continue
+        if raw.lower() in _AMBIGUOUS:
+            raise _Fallback(f"ambiguous literal {raw!r}")
+
+        if _RE_INT.match(raw):
+            number = int(raw)
+            if not -_INT64 <= number < _INT64:
+                raise _Fallback(f"integer out of int64 range {raw!r}")
+            parsed.append(number)
+        elif _RE_FLOAT.match(raw):
+            parsed.append(float(raw))
+            kind = "float" if kind == "int" else kind
+        else:
+            parsed.append(raw)
+            kind = "str"
+
+    if kind == "str": #object column: numbers stay the text pandas saw
+        return kind, [_NA if raw in NA_VALUES else raw for raw in texts]
+    if kind == "int" and _NA in parsed: #NaN forces float64
+        kind = "float"
+    if kind == "float": #parsed from the text, "-0" is -0.0
+        parsed = [cell if cell is _NA else float(raw) for cell, raw in zip(parsed, texts)]
+    return kind, parsed
+
+
+def _frame(rows):
+    """One table as MAX_COLUMN (kind, cells) columns, "" padded like the old df[col] = ""."""
+    width = min(len(rows[0]), MAX_COLUMN)
+    columns = [_column([row[i] for row in rows]) for i in range(width)]
+    columns += [("pad", [""] * len(rows))] * (MAX_COLUMN - width)
+    return columns
+
+
+#Render (concat dtype rules + to_csv)
+def _quote(field: str) -> str:
+    if "|" in field or '"' in field or "\n" in field or "\r" in field:
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+
+def _render(kind, cells, as_float) -> list:
+    if kind == "pad":
+        return cells
+    if kind == "str":
+        return ["" if cell is _NA else _quote(cell) for cell in cells]
+    if kind == "float" or as_float:
+        return ["" if cell is _NA else repr(float(cell)) for cell in cells]
+    return [str(cell) for cell in cells] #int column inside an object concat
+
+
+def _to_csv(frames) -> str:
+    if not frames:
+        return ""
+    as_float = [] #int+float across tables concat to float64, anything with text stays per-value
+    for col in range(MAX_COLUMN):
+        kinds = {frame[col][0] for frame in frames}
+        as_float.append("float" in kinds and not kinds & {"str", "pad"})
+
+    lines = []
+    for frame in frames:
+        columns = [_render(kind, cells, as_float[i]) for i, (kind, cells) in enumerate(frame)]
+        lines.extend("|".join(row) for row in zip(*columns))
+    return "\n".join(lines) + "\n"
+
+
+def _normalize_fast(html_str: str) -> str:
+    doc = etree.HTML(html_str) #thread-local default parser, plain (un-looked-up) elements
+    if doc is None:
+        raise _Fallback("empty document")
+    frames = []
+    for table in doc.iter("table"):
+        rows = _table_rows(table)
+        if rows:
+            frames.append(_frame(rows))
+    if not frames:
+        raise _Fallback("no table with data") #pandas raises or returns "", let it decide
+    return _to_csv(frames)
+
+
+def normalize_with_pandas(html_str: str) -> str:
+    """Reference DataFrame implementation (the original `_generalize_table_df`)."""
+    import pandas as pd
+    cols = [f"column_{i}" for i in range(1, MAX_COLUMN + 1)]
+    dfs = pd.read_html(StringIO(html_str), flavor='html5lib')
+    if not dfs:
+        return pd.DataFrame(columns=cols)
+
+    all_dfs = []
+    for df in dfs:
+        if df.empty:
+            continue
+
+        df = df.iloc[:, :MAX_COLUMN].copy()  # truncate if too many columns
+        df.columns = cols[:df.shape[1]]      # rename existing columns
+        for i in range(df.shape[1], MAX_COLUMN):
+            df[cols[i]] = ""                 # fill missing columns with empty strings
+
+        df = df.reindex(columns=cols)        # ensure consistent column order
+        all_dfs.append(df)
+
+    final_df = pd.concat(all_dfs, ignore_index=True) if all_dfs else pd.DataFrame(columns=cols)
+    return final_df.to_csv(index=False, header=False, sep='|', lineterminator='\n')
+
+
+def normalize_table(html_str: str) -> str:
+    try:
+        return _normalize_fast(html_str)
+    except _Fallback:
+        return normalize_with_pandas(html_str)
+
+
+def normalize_tables(html_strs) -> list:
+    """Batch form of normalize_table, one `norm_table` string per input."""
+    return [normalize_table(html_str) for html_str in html_strs]
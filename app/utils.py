@@ -1,6 +1,8 @@
-import os, re, json, json5, string, shutil, inspect, camelot, random
+import os, re, json, json5, string, shutil, inspect, random
 from datetime import datetime
-import pandas as pd #type:ignore
+from app.lazy_imports import lazy
+pd = lazy("pandas") #type:ignore
+camelot = lazy("camelot")
 from typing import List
 import unicodedata
 
@@ -403,7 +405,7 @@ class TableParser:
 
         return matched_cols if matched_cols else [0]
 
-    def _concat_padding_vertical(self,*dfs, padding_rows=1)->pd.DataFrame:
+    def _concat_padding_vertical(self,*dfs, padding_rows=1)->"pd.DataFrame":
         result = pd.DataFrame()
         padding = pd.DataFrame([[""] * dfs[0].shape[1]] * padding_rows, columns=dfs[0].columns)
         for i, df in enumerate(dfs):
@@ -412,7 +414,7 @@ class TableParser:
                 result = pd.concat([result, padding], ignore_index=True)
         return result
 
-    def _concat_padding_horizontal(self,*dfs, padding_cols=1)->pd.DataFrame:
+    def _concat_padding_horizontal(self,*dfs, padding_cols=1)->"pd.DataFrame":
         result = pd.DataFrame()
         num_rows = dfs[0].shape[0]
         padding = pd.DataFrame([[""] * padding_cols] * num_rows)
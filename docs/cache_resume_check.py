@@ -0,0 +1,67 @@
+"""Resume check for the NDJSON cache stream (main.py RESUME).
+
+    python docs/cache_resume_check.py
+
+A run caches one good and one failed bank, the resumed run skips the good one, re-runs the failed
+one and appends its new record. completed_codes, as_cache and export_json must then see exactly one
+record per bank, the re-run's for the failed one, and with an `order` the records follow it rather
+than the (fleet) completion order. Exit code 1 on any mismatch."""
+import os, sys, json, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.cache_stream import CacheStream
+
+
+def record(key, ok):
+    scraped = [{"action": "table", "response": [{"name": "table_0"}]}] if ok else [{"error_Type": "TimeoutException"}]
+    return {"bank_key": key, "bank_code": key, "scraped_data": scraped}
+
+
+def main():
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run" + CacheStream.SUFFIX)
+        with CacheStream(path) as cache: #first run: PSB_1 fails
+            cache.write_metadata({"program": "check"})
+            cache.write_record(record("PSB_6", ok=True))
+            cache.write_record(record("PSB_1", ok=False))
+
+        done = CacheStream.completed_codes(path)
+        todo = [code for code in ("PSB_6", "PSB_1") if code not in done]
+        if todo != ["PSB_1"]:
+            problems.append(f"resume would run {todo}, expected ['PSB_1']")
+        with CacheStream(path) as cache: #resumed run
+            for code in todo:
+                cache.write_record(record(code, ok=True))
+
+        if CacheStream.completed_codes(path) != {"PSB_6", "PSB_1"}:
+            problems.append(f"completed after resume: {sorted(CacheStream.completed_codes(path))}")
+        records = list(CacheStream.as_cache(path)["records"])
+        if [r["bank_key"] for r in records] != ["PSB_6", "PSB_1"] or not all(map(CacheStream.is_complete, records)):
+            problems.append(f"as_cache records: {records}")
+
+        out_path = os.path.join(tmp, "run_cache.json")
+        CacheStream.export_json(path, out_path)
+        with open(out_path, "r", encoding="utf-8") as f:
+            exported = json.load(f)["records"]
+        if exported != records:
+            problems.append(f"export_json records: {exported}")
+
+        order = ["PSB_1", "PSB_6"] #config order; the stream holds completion order PSB_6, PSB_1(failed), PSB_1
+        ordered = list(CacheStream.as_cache(path, order)["records"])
+        if [r["bank_key"] for r in ordered] != order or not all(map(CacheStream.is_complete, ordered)):
+            problems.append(f"as_cache records in order {order}: {ordered}")
+        CacheStream.export_json(path, out_path, order=order)
+        with open(out_path, "r", encoding="utf-8") as f:
+            exported = json.load(f)["records"]
+        if exported != ordered:
+            problems.append(f"export_json records in order {order}: {exported}")
+
+    for problem in problems:
+        print("FAIL", problem)
+    print("resume: OK" if not problems else f"resume: {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
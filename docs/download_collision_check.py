@@ -0,0 +1,69 @@
+"""Concurrent download check: links sharing a basename (download.aspx?id=1 / ?id=2).
+
+    python docs/download_collision_check.py [rounds]
+
+A fixture page links several 1.5 MB files that differ only in their query string. downloadElem
+fetches them in parallel; every packet's blob must hash to the body of its own url, with and
+without file_save, and the saved files must all be distinct. Exit code 1 on any mismatch."""
+import os, sys, hashlib, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.action_executor import ActionExecutor
+from app.action_config import ActionConfig
+from app.constants import GENERIC_ACTION_CONFIG, SCRIPTS
+from app.host_scheduler import get_host_scheduler
+from app.blob_store import get_blob_store
+from app.fake_driver import FixtureServer, create_fake_driver
+
+FILES = 4
+SIZE = 1536 * 1024 #under MAX_REQUEST_BYTE_SIZE, big enough for the fetches to overlap
+
+
+def main(rounds=3):
+    bodies = {f"/files/download.pdf?id={i}": b"%PDF-1.4\n" + bytes([65 + i]) * SIZE for i in range(FILES)}
+    page = "<html><body>" + "".join(f'<a class="doc" href="{path}">doc {i}</a>' for i, path in enumerate(bodies)) + "</body></html>"
+    expected = {f"doc_{i}": hashlib.sha256(body).hexdigest() for i, body in enumerate(bodies.values())}
+    problems = []
+
+    with FixtureServer({"/index.html": page, **{path: (body, "application/pdf") for path, body in bodies.items()}}) as server, \
+            tempfile.TemporaryDirectory() as output:
+        get_host_scheduler().configure(server.URL, rate=1e9, burst=1e9)
+        params = {"bank_name": "CHECK", "bank_type_code": "CHECK", "intial_window_size": [1200, 900], "headers": {}, "download_workers": FILES}
+        executor = ActionExecutor(params, {"output": output, "folders": {"data": "data"}})
+        driver = create_fake_driver(scripts=SCRIPTS.values())
+        executor.attach_driver(driver)
+        driver.get(server.url("/index.html"))
+        blobs = get_blob_store()
+        try:
+            for round_ in range(int(rounds)):
+                for file_save in (False, True):
+                    act = ActionConfig.from_dict({"action": "download", "by": "css", "value": "a.doc", "multiple": True,
+                                                  "file_save": file_save, "pdf_name": "doc"}, GENERIC_ACTION_CONFIG)
+                    packets = (executor.execute(act) or {}).get("response") or []
+                    got = {p["name"]: p["hash"] for p in packets}
+                    if got != expected:
+                        problems.append(f"round {round_} file_save={file_save}: packet hashes {got}")
+                    for p in packets:
+                        if not p["data_present"]:
+                            continue
+                        with blobs.open(p["value"]) as blob:
+                            if hashlib.sha256(blob[:]).hexdigest() != expected.get(p["name"]):
+                                problems.append(f"round {round_} file_save={file_save}: blob of {p['name']} holds another file")
+                    downloads = os.path.join(executor.OUTPUT_PATH, "downloads")
+                    if file_save and len([n for n in os.listdir(downloads) if not n.endswith(".part")]) < FILES:
+                        problems.append(f"round {round_}: saved files collided: {sorted(os.listdir(downloads))}")
+                    if any(n.endswith(".part") for n in os.listdir(downloads)):
+                        problems.append(f"round {round_}: leftover part files")
+        finally:
+            if executor.downloader:
+                executor.downloader.close()
+            driver.quit()
+
+    for problem in problems:
+        print("FAIL", problem)
+    print("downloads: OK" if not problems else f"downloads: {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,145 @@
+"""Offline ActionExecutor benchmark: every action shape in param_table, replayed on the fake driver.
+
+    python docs/executor_bench.py [repeats] [latency_ms]
+
+A shape is an action's kind + locator strategy + the flags that change its code path (multiple,
+clean_table, skip_if_not_found, wait_until, snapshot, steps, ...). One representative per shape is
+moved onto local fixtures (a selector of the same `by`, fixture urls) and run `repeats` times through
+ActionExecutor.execute against app.fake_driver, no Chrome and no network. `latency_ms` is slept per
+WebDriver command to stand in for the chromedriver hop. Per shape: banks using it, ms per run,
+WebDriver round trips per run, packets returned and error packets."""
+import os, sys, time, tempfile, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.action_executor import ActionExecutor
+from app.action_config import ActionConfig
+from app.constants import CONFIG, GENERIC_ACTION_CONFIG, SCRIPTS
+from app.host_scheduler import get_host_scheduler
+from app.fake_driver import FixtureServer, create_fake_driver, MINIMAL_PDF
+
+SHAPE_KEYS = ("action", "by", "multiple", "clean_table", "skip_if_not_found", "wait_until", "snapshot",
+              "batch_extract", "file_save", "new_window", "return_to_base", "script_key")
+
+#fixture locator per action kind and `by`
+SELECTORS = {
+    "table": {"css": "table.rates", "tag": "table", "xpath": "//table[contains(@class, 'rates')]"},
+    "html": {"css": "div.notes", "tag": "section", "xpath": "//div[@class='notes']"},
+    "scrape": {"css": "div.notes", "tag": "section", "xpath": "//div[@class='notes']"},
+    "download": {"css": "a.doc", "tag": "a", "xpath": "//a[@class='doc']"},
+    "tablist": {"css": "ul.tabs li", "tag": "li", "xpath": "//ul[@class='tabs']/li"},
+    "click": {"css": "#more", "tag": "button", "xpath": "//a[@id='more']"},
+    "click_save": {"css": "a.open-pdf", "tag": "a", "xpath": "//a[@class='open-pdf']"},
+}
+BODY = {"css": "body", "tag": "body", "xpath": "//body"}
+
+
+def make_page(rnd, tables=4, rows=30):
+    parts = ["<html><head><title>Deposit Rates</title></head><body>",
+             '<ul class="tabs"><li>Domestic</li><li>NRE</li><li>NRO</li></ul>',
+             '<section><div class="notes"><p>Rates w.e.f. <strong>01-01-2025</strong></p></div></section>']
+    for t in range(tables):
+        body = "".join(f"<tr><td>{rnd.randint(7, 999)} days</td><td>{rnd.random() * 9:.2f}</td><td>{rnd.random() * 9 + 0.5:.2f}</td></tr>"
+                       for _ in range(rows))
+        parts.append(f'<div class="block"><h3>Fixed Deposits {t}</h3><p>Below 3 Cr</p><div class="wrap">'
+                     f'<table class="rates" border="1"><thead><tr><th>Tenor</th><th>General</th><th>Senior</th></tr></thead>'
+                     f"<tbody>{body}</tbody></table></div></div>")
+    parts += ['<a class="doc" href="/files/rates_0.pdf">Rates</a>', '<a class="doc" href="/files/rates_1.pdf">NRI</a>',
+              '<a class="doc" href="/files/rates.csv">CSV</a>', '<a class="open-pdf" target="_blank" href="/files/circular.pdf">Circular</a>',
+              '<a id="more" href="#">More</a><button id="more-btn">More</button>', "</body></html>"]
+    return "".join(parts)
+
+
+def shape_of(action: dict) -> tuple:
+    shape = tuple((key, action.get(key) if key != "script_key" else bool(action.get(key))) for key in SHAPE_KEYS if key in action)
+    steps = action.get("steps")
+    return shape + ((("steps", tuple(shape_of(step) for step in steps)),) if steps else ())
+
+
+def collect_shapes(config) -> dict:
+    """{shape: (representative action, {bank codes})}, nested steps included through the parent's shape."""
+    shapes = {}
+    for code, bank in config.items():
+        if not isinstance(bank, dict):
+            continue
+        for action in bank.get("blocks") or []:
+            if not isinstance(action, dict):
+                continue
+            entry = shapes.setdefault(shape_of(action), (action, set()))
+            entry[1].add(code)
+    return shapes
+
+
+def to_fixture(action: dict, server) -> dict:
+    kind = action.get("action")
+    by = (action.get("by") or "css").lower()
+    fixture = {key: value for key, value in action.items() if key not in ("wait_by", "wait_value", "web_links", "web_link_headers")}
+    fixture["value"] = SELECTORS.get(kind, BODY).get(by, BODY["css"])
+    if kind == "website":
+        fixture["url"] = server.url("/page2.html")
+    elif kind == "http":
+        fixture["url"] = server.url("/files/rates.csv")
+    elif kind == "weblist":
+        fixture["web_links"] = [server.url(f"/list/{i}.html") for i in range(3)]
+    if action.get("steps"):
+        fixture["steps"] = [to_fixture(step, server) for step in action["steps"]]
+    return fixture
+
+
+def label(shape) -> str:
+    flags = [key if value is True else f"{key}={value}" for key, value in shape if key not in ("action", "by", "steps")]
+    steps = dict(shape).get("steps")
+    text = f"{dict(shape).get('action')}[{dict(shape).get('by', 'css')}] {' '.join(flags)}"
+    return text + (f" +{len(steps)} step(s)" if steps else "")
+
+
+def main(repeats=5, latency_ms=0.0):
+    repeats, latency = int(repeats), float(latency_ms) / 1000
+    rnd = random.Random(7)
+    page = make_page(rnd)
+    routes = {"/index.html": page, "/page2.html": page, "/files/rates.csv": (b"tenor,rate\n7,3.5\n", "text/csv"),
+              **{f"/list/{i}.html": page for i in range(3)},
+              **{f"/files/{name}.pdf": (MINIMAL_PDF, "application/pdf") for name in ("rates_0", "rates_1", "circular")}}
+
+    shapes = collect_shapes(CONFIG)
+    print(f"{len(shapes)} action shape(s) across {sum(1 for b in CONFIG.values() if isinstance(b, dict) and 'blocks' in b)} bank(s), "
+          f"{repeats} run(s) each, {latency_ms} ms per WebDriver command\n")
+    print(f"{'shape':70s} {'banks':>5s} {'ms/run':>9s} {'trips/run':>9s} {'packets':>7s} {'errors':>6s}")
+
+    with FixtureServer(routes) as server, tempfile.TemporaryDirectory() as output:
+        get_host_scheduler().configure(server.URL, rate=1e9, burst=1e9) #no pacing against the local stand-in
+        params = {"bank_name": "BENCH", "bank_type_code": "BENCH", "intial_window_size": [1200, 900], "headers": {}}
+        executor = ActionExecutor(params, {"output": output, "folders": {"data": "data"}})
+        driver = create_fake_driver(scripts=SCRIPTS.values(), latency=latency)
+        executor.attach_driver(driver)
+        backend = driver.command_executor
+
+        total_seconds = total_trips = 0
+        try:
+            for shape, (action, banks) in sorted(shapes.items(), key=lambda kv: -len(kv[1][1])):
+                act = ActionConfig.from_dict(to_fixture(action, server), GENERIC_ACTION_CONFIG)
+                seconds = trips = packets = errors = 0
+                for _ in range(repeats):
+                    driver.switch_to.window(driver.window_handles[0])
+                    driver.get(server.url("/index.html")) #BankScraper lands on base_url first
+                    executor.snapshot = None
+                    executor.window_stack = [driver.current_window_handle]
+                    before, start = backend.commands, time.perf_counter()
+                    packet = executor.execute(act)
+                    seconds += time.perf_counter() - start
+                    trips += backend.commands - before
+                    responses = (packet or {}).get("response") or []
+                    packets += len(responses)
+                    errors += sum(1 for resp in responses if resp.get("error_type") not in (None, "NoneType")) #NoneType: action returns nothing by design
+                total_seconds += seconds
+                total_trips += trips
+                print(f"{label(shape)[:70]:70s} {len(banks):5d} {seconds / repeats * 1000:9.1f} {trips / repeats:9.1f} "
+                      f"{packets / repeats:7.1f} {errors:6d}")
+        finally:
+            if executor.downloader:
+                executor.downloader.close()
+            driver.quit()
+    print(f"\ntotal: {total_seconds:.2f} s, {total_trips} WebDriver round trips")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,50 @@
+"""Import-time budget for the scraper's startup path.
+
+    python docs/import_budget.py [budget_seconds]
+
+Each module is imported in a fresh interpreter (what a fleet worker or a one-bank debug run pays).
+Fails if an import fails, exceeds the budget or drags in any stack registered in app.lazy_imports."""
+import os, subprocess, sys, json
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.lazy_imports import HEAVY_MODULES
+
+STARTUP_MODULES = ["app.utils", "app.operation_executor", "app.BankScraper", "app.fleet_runner", "main"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def probe(module):
+    code = PROBE.format(module=module, heavy=sorted(set(HEAVY_MODULES.values())))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        return None, proc.stderr.strip().splitlines()[-1:]
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+def main(budget=1.0):
+    budget, failures = float(budget), 0
+    for module in STARTUP_MODULES:
+        result, error = probe(module)
+        if error: #a broken import tree is not within budget
+            failures += 1
+            print(f"{module:28s} FAIL  import failed: {error}")
+            continue
+        over = result["seconds"] > budget
+        failures += over or bool(result["heavy"])
+        flags = ("  OVER BUDGET" if over else "") + (f"  loaded eagerly: {result['heavy']}" if result["heavy"] else "")
+        print(f"{module:28s} {result['seconds'] * 1000:7.0f} ms{flags}")
+    print(f"{len(STARTUP_MODULES) - failures}/{len(STARTUP_MODULES)} module(s) within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
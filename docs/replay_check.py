@@ -0,0 +1,62 @@
+"""Regression + timing check over recorded runs (RECORD_RUNS archives).
+
+    python docs/replay_check.py <archive_dir> [bank_code ...]
+
+Each archive is replayed offline through BankScraper (fake driver + archive-backed sessions) and the
+packets it extracts are compared with the ones the live run stored in the archive: same actions, same
+response names/types/hashes. Run it before and after touching an extractor; exit code 1 on any diff
+or on an archive that can't be replayed (see app.run_archive for what replay reproduces)."""
+import os, sys, glob, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.BankScraper import BankScraper
+from app.constants import CONFIG, PATHS
+from app.run_archive import RunArchive, archive_name
+
+
+def packets(result) -> list:
+    """[(action, [(name, type, hash), ...]), ...], the parts of a result an extractor change must keep."""
+    out = []
+    for action in (result or {}).get("scraped_data") or []:
+        if not isinstance(action, dict):
+            continue
+        responses = action.get("response") or []
+        out.append((action.get("action"), [(r.get("name"), r.get("type"), r.get("hash")) for r in responses if isinstance(r, dict)]))
+    return out
+
+
+def main(archive_dir, *codes):
+    banks = {archive_name(bank): (code, bank) for code, bank in CONFIG.items() if isinstance(bank, dict) and "blocks" in bank}
+    failures = 0
+    for path in sorted(glob.glob(os.path.join(archive_dir, "*.zip"))):
+        name = os.path.basename(path)
+        if name not in banks or (codes and banks[name][0] not in codes):
+            continue
+        code, bank = banks[name]
+        archive = RunArchive(path)
+        recorded = archive.result
+        archive.close()
+
+        start = time.perf_counter()
+        try:
+            replayed = BankScraper(bank, PATHS, replay_dir=archive_dir).run()
+        except ValueError as e:
+            failures += 1
+            print(f"{code:8s} {name[:40]:40s} {'':8s}  NOT REPLAYABLE: {e}")
+            continue
+        seconds = time.perf_counter() - start
+
+        diffs = [(idx, old, new) for idx, (old, new) in enumerate(zip(packets(recorded), packets(replayed))) if old != new]
+        if len(packets(recorded)) != len(packets(replayed)):
+            diffs.append(("count", len(packets(recorded)), len(packets(replayed))))
+        failures += bool(diffs)
+        print(f"{code:8s} {name[:40]:40s} {seconds:7.2f}s  {'OK' if not diffs else f'{len(diffs)} diff(s)'}")
+        for idx, old, new in diffs[:5]:
+            print(f"    action {idx}: recorded {old}\n    {'':9s}replayed {new}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(*sys.argv[1:])
@@ -0,0 +1,152 @@
+"""Golden check + benchmark for the single-pass table cleaner.
+
+    python docs/table_clean_golden.py [cache_dir]
+
+Every `table_html` found in the caches (json or ndjson), every captured table saved as
+docs/golden_tables/*.html, a synthetic corpus and seeded random markup (well formed and not)
+is run through the legacy regex+BeautifulSoup chain and app.table_cleaner; any difference is
+printed and the script exits 1. A missing or empty docs/golden_tables also exits 1, so the
+captured corpus can't silently drop out of the check. Then both are timed on generated 1-5 MB tables."""
+import glob, json, os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.action_executor import ActionExecutorHelper
+from app.table_cleaner import clean_table_html
+
+legacy = ActionExecutorHelper._clean_raw_table_html_legacy_
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_tables")
+
+SYNTHETIC = [
+    '<table class="t"><thead><tr><th scope="col">Tenor</th><th>Rate*</th></tr></thead>'
+    '<tbody><tr><td rowspan="2" style="x">1 Year</td><td><strong>3.25</strong>%<sup>@</sup></td></tr>'
+    '<tr><td colspan=\'2\'>&nbsp;</td></tr><tr>  &nbsp; </tr><tr> </tr></tbody></table>',
+    '<TABLE><TR><TH>A</TH><TD><B>b</B><BR>c<P>d</P></TD></TR></TABLE>',
+    '<table><tr><td>a &amp; b &lt; c &gt; d</td><td title="say &quot;hi&quot;">x</td></tr></table>',
+    '<table><tr><td>it\'s "quoted"</td></tr><!-- footnote --></table>',
+    '<table>\n\t<tr>\n\t\t<td>nested<table><tr><td>inner</td></tr></table></td>\n\t</tr>\n</table>',
+    '<table><caption>Rates</caption><colgroup><col span="2"></colgroup><tr><td><img src="a.png" alt="x"></td></tr></table>',
+    '<table><tr><td><a href="/x?a=1&b=2" onclick="go()">link</a></td><td><span class="c">1.5</span></td></tr></table>',
+    '<div><table><tr><td>outer text</td></tr></table>trailing</div>',
+    'leading <table><tr><td>1</td></tr></table>',
+    '<table><tr><td>x</td></tr></table></td></tr>',
+    '<table><tr><td><script>var a = 1 < 2;</script>s</td></tr></table>',
+    '<table><tr><td>  5.00 %</td><td>₹ 1,00,000</td></tr></table>',
+    '<table><thead><tr><th rowspan="2">Period</th><th colspan="2">Rate</th></tr>'
+    '<tr><th>General</th><th>Senior</th></tr></thead><tbody><tr><td>7 days</td><td>3.00</td><td>3.50</td></tr></tbody></table>',
+    #both span attributes, in either order and case: bs4 writes them sorted
+    '<table><tr><td rowspan="2" colspan="3">x</td><td COLSPAN=2 ROWSPAN=4 class="c">y</td></tr></table>',
+    '<table><tr><td colspan="2" rowspan="2" colspan="5">duplicate</td></tr></table>',
+    #unclosed / misnested markup: html.parser nests as written, lxml closes implicitly
+    '<table><tr><td>a<td>b<td>c</tr></table>',
+    '<ul><li>one<li>two<li>three</ul>',
+    '<table><tr><th>Tenor<td>Rate</tr><tr><td>7 days<td>3.00</table>',
+    '<table><tr><td>open row</td>',
+    '<table><thead><tr><th>A</th></tr><tbody><tr><td>1</td></tr></tbody></table>',
+    '<table><tr><td/>x<td>y</td></tr></table>',
+    '&nbsp;<table><tr><td>leading nbsp</td></tr></table>',
+    #bank layouts: grouped headers, footnote rows, links to circulars, rupee amounts
+    '<table class="table table-bordered"><thead><tr><th rowspan="2" style="width:40%">Tenors</th>'
+    '<th colspan="2">Below Rs. 3 Crore</th><th colspan="2">Rs. 3 Crore to Rs. 10 Crore</th></tr>'
+    '<tr><th>General</th><th>Senior Citizens*</th><th>General</th><th>Senior Citizens*</th></tr></thead>'
+    '<tbody><tr><td>7 days to 45 days</td><td>3.50</td><td>4.00</td><td>3.50</td><td>4.00</td></tr>'
+    '<tr><td>444 days (Special)<sup>@</sup></td><td><strong>7.25</strong></td><td><strong>7.75</strong></td><td>6.80</td><td>7.30</td></tr>'
+    '<tr><td colspan="5"><p>* Additional 0.50% for senior citizens. <a href="/circular.pdf" target="_blank">Circular</a></p></td></tr></tbody></table>',
+    '<table width="100%" cellpadding="0" border="1"><tbody><tr bgcolor="#ccc"><td><b>Period</b></td><td><b>ROI (% p.a.)</b></td></tr>'
+    '<tr><td>1 year</td><td>6.80</td></tr><tr><td>above 1 year &amp; up to 2 years</td><td>7.00</td></tr>'
+    '<tr><td>&nbsp;</td><td>&nbsp;</td></tr><tr><td colspan="2" align="center">w.e.f. 15.01.2025</td></tr></tbody></table>',
+    '<div class="table-responsive"><table><tbody><tr><td rowspan="3">Savings Bank</td><td>Up to ₹ 1 lakh</td><td>2.70%</td></tr>'
+    '<tr><td>Above ₹ 1 lakh to ₹ 10 crore</td><td>2.75%</td></tr><tr><td>Above ₹ 10 crore</td><td>3.00%</td></tr></tbody></table></div>',
+    '',
+]
+
+
+def random_markup(rnd, depth=4, well_formed=True):
+    tags = ["table", "tbody", "thead", "tr", "td", "th", "ul", "li", "div", "span", "a", "caption", "p", "b"]
+    attrs = ["", ' rowspan="2"', " colspan=3 rowspan=2", ' class="a" colspan="2"', " style='x' ROWSPAN='1'", ' title="q&quot;"']
+    text = ["a", "b &amp; c", " ₹ 5 ", "<br>", "<!--c-->", '<img src="x">', "x &lt; y", "*@\n", "&nbsp;"]
+    if not well_formed:
+        text += ["<td>open", "<li>open", "</td>", "</tr>"]
+    out = []
+    for _ in range(rnd.randint(1, 4)):
+        if depth and rnd.random() < 0.6:
+            tag = rnd.choice(tags)
+            out.append(f"<{tag}{rnd.choice(attrs)}>{random_markup(rnd, depth - 1, well_formed)}</{tag}>")
+        else:
+            out.append(rnd.choice(text))
+    return "".join(out)
+
+
+def iter_cache_tables(cache_dir):
+    paths = glob.glob(os.path.join(cache_dir, "**", "*_cache.json"), recursive=True)
+    paths += glob.glob(os.path.join(cache_dir, "**", "*_cache.ndjson"), recursive=True)
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if path.endswith(".ndjson"):
+                    records = [json.loads(line) for line in f if line.strip()]
+                else:
+                    records = json.load(f).get("records", [])
+        except ValueError:
+            continue
+        for record in records:
+            for action in record.get("scraped_data") or []:
+                for resp in (action.get("response") or []) if isinstance(action, dict) else []:
+                    if resp.get("type") == "table_html" and isinstance(resp.get("value"), str):
+                        yield resp["value"]
+
+
+def make_table(target_bytes, seed=0):
+    rnd = random.Random(seed)
+    rows, size = ['<table class="rates" id="t1"><thead><tr><th scope="col">Tenor</th><th>General</th><th>Senior*</th></tr></thead><tbody>'], 0
+    while size < target_bytes:
+        row = (f'<tr class="r{rnd.randint(0, 9)}"><td style="text-align:left" rowspan="{rnd.randint(1, 2)}">'
+               f'<strong>{rnd.randint(1, 999)} days</strong></td>\n\t<td data-x="{rnd.random():.4f}">{rnd.random() * 9:.2f}<sup>@</sup></td>'
+               f'<td colspan="1"><p>{rnd.random() * 9:.2f}&nbsp;%</p><br></td></tr>')
+        if rnd.random() < 0.05:
+            row += "<tr> &nbsp; </tr>"
+        rows.append(row)
+        size += len(row)
+    rows.append("</tbody></table>")
+    return "".join(rows)
+
+
+def timed(fn, value, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def iter_captured_tables(tables_dir=TABLES_DIR):
+    for path in sorted(glob.glob(os.path.join(tables_dir, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            yield f.read()
+
+
+def main(cache_dir="output/cache", fuzz=500):
+    captured = list(iter_captured_tables())
+    if not captured:
+        print(f"golden: no captured tables in {TABLES_DIR}")
+        return 1
+    rnd = random.Random(15)
+    fuzzed = [random_markup(rnd, well_formed=idx % 2 == 0) for idx in range(int(fuzz))]
+    corpus = SYNTHETIC + captured + list(iter_cache_tables(cache_dir)) + fuzzed
+    failures = 0
+    for idx, html in enumerate(corpus):
+        old, new = legacy(html), clean_table_html(html)
+        if old != new:
+            failures += 1
+            print(f"[{idx}] MISMATCH\n  legacy: {old[:300]}\n  fast:   {new[:300]}")
+    print(f"golden: {len(corpus) - failures}/{len(corpus)} identical")
+
+    for mb in (1, 2, 5):
+        html = make_table(mb * 1024 * 1024, seed=mb)
+        old, new = timed(legacy, html), timed(clean_table_html, html)
+        print(f"{mb} MB: legacy {old * 1000:.0f} ms  fast {new * 1000:.0f} ms  x{old / new:.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,74 @@
+"""Golden check + benchmark for the `normalize_df` op.
+
+    python docs/table_normalize_golden.py [cache_dir]
+
+Every `table_html` in the caches plus generated bank-style tables is normalized by the lxml walk
+(app.table_normalizer) and by the old pandas read_html chain; outputs must be byte-identical.
+Then a batch of a few hundred tables is timed through both."""
+import glob, json, os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.table_cleaner import clean_table_html
+from app.table_normalizer import _normalize_fast, _Fallback, normalize_tables, normalize_with_pandas
+
+
+def iter_cache_tables(cache_dir):
+    paths = glob.glob(os.path.join(cache_dir, "**", "*_cache.json"), recursive=True)
+    paths += glob.glob(os.path.join(cache_dir, "**", "*_cache.ndjson"), recursive=True)
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()] if path.endswith(".ndjson") else json.load(f).get("records", [])
+        except ValueError:
+            continue
+        for record in records:
+            for action in record.get("scraped_data") or []:
+                for resp in (action.get("response") or []) if isinstance(action, dict) else []:
+                    if resp.get("type") == "table_html" and isinstance(resp.get("value"), str):
+                        yield resp["value"]
+
+
+def make_table(rnd, rows=30):
+    head = '<table><thead><tr><th rowspan="2">Tenor</th><th colspan="2">Rate (% p.a.)</th></tr><tr><th>General</th><th>Senior*</th></tr></thead><tbody>'
+    body = []
+    for _ in range(rows):
+        rate = rnd.random() * 9
+        body.append(f'<tr><td>{rnd.randint(7, 999)} days</td><td><strong>{rate:.2f}</strong></td>'
+                    f'<td>{rate + 0.5:.2f}%</td></tr>' if rnd.random() < 0.9 else
+                    f'<tr><td colspan="3">Min. deposit &#8377; {rnd.randint(1, 99)},000</td></tr>')
+    return clean_table_html(head + "".join(body) + "</tbody></table>") #as stored in table_html packets
+
+
+def main(cache_dir="output/cache"):
+    rnd = random.Random(0)
+    corpus = [make_table(rnd, rnd.randint(1, 60)) for _ in range(50)] + list(iter_cache_tables(cache_dir))
+
+    failures = fallbacks = 0
+    for idx, html in enumerate(corpus):
+        try:
+            fast = _normalize_fast(html)
+        except _Fallback:
+            fallbacks += 1
+            continue
+        try:
+            ref = normalize_with_pandas(html)
+        except ValueError as e: #read_html: no tables
+            ref = e
+        if fast != ref:
+            failures += 1
+            print(f"[{idx}] MISMATCH\n  pandas: {str(ref)[:300]!r}\n  fast:   {fast[:300]!r}")
+    print(f"golden: {len(corpus) - failures - fallbacks}/{len(corpus)} identical, {fallbacks} left to pandas")
+
+    batch = [make_table(rnd) for _ in range(300)]
+    start = time.perf_counter()
+    [normalize_with_pandas(html) for html in batch]
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    normalize_tables(batch)
+    new = time.perf_counter() - start
+    print(f"{len(batch)} tables: pandas {old * 1000:.0f} ms  fast {new * 1000:.0f} ms  x{old / new:.0f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,85 @@
+"""Text parity check: the HTTP fast path vs the browser path on one fixture page.
+
+    python docs/text_parity_check.py
+
+The fixture mixes what text_content() gets wrong against a browser: <br> and block boundaries,
+script/style, hidden elements, runs of whitespace and &nbsp;, and a hidden scrape field that
+textScrape reads through its textContent fallback. Table labels and scrape results from
+HttpExecutor, from ActionExecutor on a snapshot and from ActionExecutor on the (fake) live page must
+all equal what Chrome's element.text / innerText gives for the same markup. Exit code 1 on any mismatch."""
+import os, sys, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.action_executor import ActionExecutor
+from app.http_executor import HttpExecutor
+from app.action_config import ActionConfig
+from app.constants import GENERIC_ACTION_CONFIG, SCRIPTS
+from app.host_scheduler import get_host_scheduler
+from app.fake_driver import FixtureServer, create_fake_driver
+
+PAGE = """<html><head><title>Deposit Rates</title><style>.rates td { padding: 2px }</style></head><body>
+<div class="block"><h3>Fixed<br>Deposits</h3>
+  <p>Below   3 Cr<script>track("fd")</script><span hidden>internal</span></p>
+  <div class="wrap"><table class="rates"><tr><th>Tenor</th><th>Rate</th></tr><tr><td>1&nbsp;year</td><td>6.50</td></tr></table></div>
+</div>
+<div class="notes"><p>Rates w.e.f.<br>01-10-2024</p>
+  <ul><li>Senior citizens: +0.50%</li><li style="display: none">Withdrawn scheme</li></ul>
+  <div>Subject   to
+  change</div><noscript>Enable javascript</noscript><span class="code" style="display: none"><b>FD-01</b></span></div>
+</body></html>"""
+
+ACTIONS = [
+    {"action": "table", "by": "css", "value": "table.rates", "multiple": True, "clean_table": False},
+    {"action": "scrape", "by": "css", "value": "div.notes"},
+    {"action": "scrape", "by": "css", "value": "div.notes", "scrape_fields": {"effective": "p", "note": "li", "code": "span.code"}},
+]
+EXPECTED = [
+    [("Fixed Deposits", "Below 3 Cr")],
+    {"text": "Rates w.e.f.\n01-10-2024\nSenior citizens: +0.50%\nSubject to change"},
+    {"effective": "Rates w.e.f.\n01-10-2024", "note": "Senior citizens: +0.50%", "code": "FD-01"}, #hidden field: textContent
+]
+
+
+def extracted(packet):
+    content = packet["response"]
+    if packet["action"] == "table":
+        return [tuple(p["title"]) if isinstance(p["title"], list) else p["title"] for p in content]
+    return content
+
+
+def main():
+    problems = []
+    with FixtureServer({"/index.html": PAGE}) as server, tempfile.TemporaryDirectory() as output:
+        get_host_scheduler().configure(server.URL, rate=1e9, burst=1e9)
+        params = {"bank_name": "CHECK", "bank_type_code": "CHECK", "intial_window_size": [1200, 900], "headers": {}}
+        http = HttpExecutor(params)
+        executor = ActionExecutor(params, {"output": output, "folders": {"data": "data"}})
+        driver = create_fake_driver(scripts=SCRIPTS.values())
+        executor.attach_driver(driver)
+        try:
+            http.fetch(server.url("/index.html"))
+            driver.get(server.url("/index.html"))
+            paths = {
+                "http": lambda action: http.execute(action),
+                "browser snapshot": lambda action: executor.execute({**action, "snapshot": True}),
+                "browser live": lambda action: executor.execute({**action, "snapshot": False, "batch_extract": False}),
+                "browser batched": lambda action: executor.execute({**action, "snapshot": False, "batch_extract": True}),
+            }
+            for action, expected in zip(ACTIONS, EXPECTED):
+                for where, run in paths.items():
+                    got = extracted(run(ActionConfig.from_dict(action, GENERIC_ACTION_CONFIG)) if where == "http"
+                                    else run(action))
+                    if got != expected:
+                        problems.append(f"{where} {action['action']} {action.get('scrape_fields', '')}: {got!r} != {expected!r}")
+        finally:
+            http.close()
+            driver.quit()
+
+    for problem in problems:
+        print("FAIL", problem)
+    print("text parity: OK" if not problems else f"text parity: {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,50 +5,62 @@ warnings.filterwarnings('ignore')
 ssl._create_default_https_context = ssl._create_stdlib_context
 
 from app.utils import Helper
-from app.logger import setup_logger
+from app.logger import setup_logger, set_active_logger, LazyFormat
+from app.spans import span, get_span_recorder, summarize
 from app.BankScraper import BankScraper
+from app.fleet_runner import FleetRunner
+from app.cache_stream import CacheStream
 from app.constants import CONFIG, PATHS
 from app.constants import CACHE_REP_DIR,LOG_DIR, CCH_DIR
 from app.constants import ALL_BANK_CODES,PUB_BANK_CODES,PVT_BANK_CODES
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-logger = setup_logger(name="scraper", log_dir=LOG_DIR)
 bank_codes = ["PSB_6"]#PVT_BANK_CODES #PUB_BANK_CODES #ALL_BANK_CODES
+FLEET_WORKERS = 1 # >1 scrapes banks in parallel processes, one Chrome each
+RESUME = False # True: append to today's latest cache stream, skip banks already completed in it
 
-try:
-    logger.notice("Starting Program.")
+if __name__ == "__main__": # guard needed, fleet workers re-import this module on spawn
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    logger = setup_logger(name="scraper", log_dir=LOG_DIR)
+    set_active_logger(logger)
     final_dict = BankScraper.get_final_struct()
-    for code in bank_codes:
-        if code not in CONFIG:
-            continue
-        try:
-            bank_params = CONFIG[code]
-            scraper = BankScraper(bank_params, PATHS)
-            result = scraper.run()
-        except Exception as e:
-            logger.error(f"Failed scraping {code}: {e}")
-            result = {"bank_code": code, "scraped_data": [{"error": str(e)}]}
-        
-        clean_result = BankScraper.dedupe_responses(result)
-        final_dict["records"].append(clean_result)
-        time.sleep(3)
-    
-
-    #doc report
-    doc_path = os.path.join(CACHE_REP_DIR,f"cache_{timestamp}_DATA.docx")
-    # IbbiHelper.cache_to_excel_report(final_dict,format_="data",excel_out=doc_path)
-    BankScraper.generate_cache_report(final_dict, doc_path)
-    logger.save("Initial Cache Report Saved.")
-    
-    
-except KeyboardInterrupt:
-    logger.warning("Process Interrupted by User!")
-    logger.debug(f"Traceback:\n{traceback.format_exc()}")
-    
-except Exception as e:
-    logger.error(f"Error in Main.py :[{type(e).__name__}] {e}")
-    logger.debug(f"Traceback:\n{traceback.format_exc()}")
-
-finally:
-    Helper.save_json(final_dict, os.path.join(CCH_DIR, final_dict["metadata"]["cfname"]),typ="json")
-    logger.save("Saved Cached Data.")
-    logger.notice("Ending Program.")
\ No newline at end of file
+    report_order = list(bank_codes) #fleet mode caches in completion order, the final artifacts follow the config order
+    stream_path = CacheStream.latest(CCH_DIR) if RESUME else None
+    if stream_path:
+        final_dict["metadata"] = CacheStream.read_metadata(stream_path) or final_dict["metadata"]
+        done = CacheStream.completed_codes(stream_path)
+        logger.notice(f"Resuming {os.path.basename(stream_path)}, skipping {len(done)} completed bank(s).")
+        bank_codes = [code for code in bank_codes if code not in done]
+    cache = CacheStream(stream_path or os.path.join(CCH_DIR, final_dict["metadata"]["sfname"]))
+    if not stream_path:
+        cache.write_metadata(final_dict["metadata"])
+
+    try:
+        logger.notice("Starting Program.")
+        fleet = FleetRunner(CONFIG, PATHS, workers=FLEET_WORKERS)
+        for record in fleet.stream(bank_codes): #checkpoint each bank as soon as it finishes
+            cache.write_record(record)
+            logger.save(f"Cached {record.get('bank_key')}.")
+
+        #doc report (reads the stream lazily)
+        doc_path = os.path.join(CACHE_REP_DIR,f"cache_{timestamp}_DATA.docx")
+        # IbbiHelper.cache_to_excel_report(final_dict,format_="data",excel_out=doc_path)
+        with span("report"):
+            BankScraper.generate_cache_report(CacheStream.as_cache(cache.PATH, report_order), doc_path)
+        logger.save("Initial Cache Report Saved.")
+
+
+    except KeyboardInterrupt:
+        logger.warning("Process Interrupted by User!")
+        logger.debug(f"Traceback:\n{traceback.format_exc()}")
+
+    except Exception as e:
+        logger.error(f"Error in Main.py :[{type(e).__name__}] {e}")
+        logger.debug(f"Traceback:\n{traceback.format_exc()}")
+
+    finally:
+        cache.close()
+        CacheStream.export_json(cache.PATH, os.path.join(CCH_DIR, final_dict["metadata"]["cfname"]), order=report_order)
+        logger.save("Saved Cached Data.")
+        spans = get_span_recorder()
+        spans.dump(cache.PATH.replace(CacheStream.SUFFIX, "_spans.json")) #raw spans of this run
+        logger.notice("Run timing:\n%s", LazyFormat(summarize, spans.snapshot()))
+        logger.notice("Ending Program.")